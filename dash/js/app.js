@@ -5,26 +5,117 @@
  * Features:
  * - Product list with status
  * - Run details (status, evidence, economy)
+ * - Run history (last MAX_HISTORY runs from runs/<product>/history.jsonl)
  * - Nexus queue (pending requests + decisions)
  * - Error handling (no silent failures)
+ *
+ * Under `codemonkeys dash serve` each section loads from one aggregated
+ * endpoint (/api/fleet, /api/nexus, /api/science). Under a plain static
+ * server those return 404 and the per-file fetches below are used instead.
+ *
+ * When the aggregated API is available the page also subscribes to
+ * /api/events and patches product cards, work order rows and the Nexus
+ * queue in place as files change - no reload or polling needed.
  */
 document.addEventListener('DOMContentLoaded', async () => {
     const app = {
         MAX_HISTORY: 5,
-        
+        products: {},    // product_id -> product (from products.json)
+        cards: {},       // product_id -> rendered card element
+        workOrders: {},  // product_id -> latest work_order event
+
         init: async () => {
             try {
-                const products = await app.fetchProducts();
-                await app.renderProducts(products);
-                await app.renderNexusQueue();
-                await app.renderScienceLane();
+                const live = await app.load();
                 document.getElementById('loading').classList.add('hidden');
                 document.getElementById('dashboard').classList.remove('hidden');
+                if (live) app.subscribe();
             } catch (err) {
                 app.showError(err.message);
             }
         },
 
+        load: async () => {
+            // Returns true when served by `codemonkeys dash serve` (live updates available)
+            const [fleet, nexus, science] = await Promise.all([
+                app.fetchApi('fleet'),
+                app.fetchApi('nexus'),
+                app.fetchApi('science'),
+            ]);
+            if (fleet) {
+                app.renderFleet(fleet.products);
+            } else {
+                await app.renderProducts(await app.fetchProducts());
+            }
+            await app.renderNexusQueue(nexus);
+            await app.renderScienceLane(science);
+            return Boolean(fleet);
+        },
+
+        subscribe: () => {
+            if (!window.EventSource) return;
+            const source = new EventSource('/api/events');
+            let connected = false;
+            source.addEventListener('open', () => {
+                // Reload after a reconnect: deltas sent while disconnected are lost
+                if (connected) app.load().catch(err => app.showError(err.message));
+                connected = true;
+            });
+            source.addEventListener('product', (e) => app.patchProduct(JSON.parse(e.data)));
+            source.addEventListener('work_order', (e) => app.patchWorkOrder(JSON.parse(e.data)));
+            source.addEventListener('nexus', (e) => app.renderNexusQueue(JSON.parse(e.data)));
+        },
+
+        patchProduct: (delta) => {
+            const product = app.products[delta.product_id];
+            if (!product) return;
+            const history = (delta.history || []).slice(-app.MAX_HISTORY).reverse();
+            app.placeCard(product, app.createProductCard(product, delta.last_run, history), true);
+        },
+
+        patchWorkOrder: (delta) => {
+            if (delta.removed || !delta.product_id) return;
+            app.workOrders[delta.product_id] = delta;
+            const card = app.cards[delta.product_id];
+            if (!card) return;
+            const row = card.querySelector('.work-order-row');
+            if (row) row.outerHTML = app.workOrderRow(delta);
+            app.flash(card);
+        },
+
+        placeCard: (product, card, live = false) => {
+            // Replace the product's existing card in place, or append a new one
+            const existing = app.cards[product.product_id];
+            if (existing && existing.isConnected) {
+                existing.replaceWith(card);
+            } else {
+                document.getElementById('products-list').appendChild(card);
+            }
+            app.products[product.product_id] = product;
+            app.cards[product.product_id] = card;
+            if (live) app.flash(card);
+        },
+
+        flash: (card) => {
+            card.classList.remove('updated');
+            void card.offsetWidth;  // Restart the animation
+            card.classList.add('updated');
+        },
+
+        workOrderRow: (wo) => wo
+            ? `<div class="row work-order-row"><span class="label">Last Order:</span> <span>${wo.intent} <span class="status-indicator status-${wo.status}">${wo.status}</span></span></div>`
+            : '<div class="row work-order-row hidden"></div>',
+
+        fetchApi: async (name) => {
+            try {
+                const response = await fetch(`/api/${name}`);
+                if (!response.ok) return null;
+                return await response.json();
+            } catch (e) {
+                return null;
+            }
+        },
+
         fetchScienceIndex: async () => {
             try {
                 const response = await fetch('science_index.json');
@@ -35,11 +126,11 @@ document.addEventListener('DOMContentLoaded', async () => {
             }
         },
 
-        renderScienceLane: async () => {
+        renderScienceLane: async (science = null) => {
             const summaryEl = document.getElementById('science-summary');
             const listEl = document.getElementById('science-list');
 
-            const index = await app.fetchScienceIndex();
+            const index = science || await app.fetchScienceIndex();
 
             if (!index || !index.items || index.items.length === 0) {
                 summaryEl.innerHTML = '<div class="empty-state">No science dossiers found</div>';
@@ -109,6 +200,26 @@ document.addEventListener('DOMContentLoaded', async () => {
             }
         },
 
+        fetchRunHistory: async (productId) => {
+            // history.jsonl: one compact record per run, oldest first
+            try {
+                const response = await fetch(`runs/${productId}/history.jsonl`);
+                if (!response.ok) return [];
+                const lines = (await response.text()).split('\n').filter(l => l.trim());
+                const records = [];
+                for (const line of lines.slice(-app.MAX_HISTORY)) {
+                    try {
+                        records.push(JSON.parse(line));
+                    } catch (e) {
+                        // Skip torn lines
+                    }
+                }
+                return records.reverse();
+            } catch (e) {
+                return [];
+            }
+        },
+
         fetchNexusInbox: async () => {
             // Try to fetch known inbox files (in production, this would be a manifest)
             const requests = [];
@@ -142,23 +253,40 @@ document.addEventListener('DOMContentLoaded', async () => {
             return decisions;
         },
 
+        renderFleet: (products) => {
+            // /api/fleet embeds last_run and history (oldest first) per product
+            document.getElementById('products-list').innerHTML = '';
+            app.cards = {};
+
+            for (const product of products) {
+                const history = (product.history || []).slice(-app.MAX_HISTORY).reverse();
+                app.placeCard(product, app.createProductCard(product, product.last_run, history));
+            }
+        },
+
         renderProducts: async (products) => {
             const list = document.getElementById('products-list');
             list.innerHTML = '';
 
-            for (const product of products) {
-                const runData = await app.fetchLastRun(product.product_id);
-                const card = app.createProductCard(product, runData);
-                list.appendChild(card);
-            }
+            // Fetch every product concurrently, then render in products.json order
+            const cards = await Promise.all(products.map(async (product) => {
+                const [runData, history] = await Promise.all([
+                    app.fetchLastRun(product.product_id),
+                    app.fetchRunHistory(product.product_id),
+                ]);
+                return app.createProductCard(product, runData, history);
+            }));
+            app.cards = {};
+            products.forEach((product, i) => app.placeCard(product, cards[i]));
         },
 
-        renderNexusQueue: async () => {
+        renderNexusQueue: async (nexus = null) => {
             const container = document.getElementById('nexus-pending');
             container.innerHTML = '';
 
-            const requests = await app.fetchNexusInbox();
-            const decisions = await app.fetchNexusOutbox();
+            const [requests, decisions] = nexus
+                ? [nexus.requests, nexus.decisions]
+                : await Promise.all([app.fetchNexusInbox(), app.fetchNexusOutbox()]);
 
             if (requests.length === 0 && decisions.length === 0) {
                 container.innerHTML = '<div class="empty-state">No pending requests or decisions</div>';
@@ -225,7 +353,7 @@ document.addEventListener('DOMContentLoaded', async () => {
             return div;
         },
 
-        createProductCard: (product, run) => {
+        createProductCard: (product, run, history = []) => {
             const div = document.createElement('div');
             div.className = 'card';
             
@@ -266,10 +394,21 @@ document.addEventListener('DOMContentLoaded', async () => {
                     </div>
                 `;
                 
+                const historyRows = history.map(h => `
+                    <li class="history-entry">
+                        <span class="status-indicator status-${h.status}">${h.status}</span>
+                        <span>${h.ended_at ? new Date(h.ended_at).toLocaleString() : h.run_id}</span>
+                        <span>${h.tests ? `${h.tests.passed}/${h.tests.total} passed` : ''}</span>
+                        <span>${h.spent_minutes ?? 0} min</span>
+                    </li>
+                `).join('');
+
                 historySection = `
                     <div class="history-section">
                         <p class="label">Run History:</p>
-                        <div class="history-note">Most recent run shown above. Previous runs in <code>runs/${product.product_id}/</code></div>
+                        ${historyRows
+                            ? `<ul class="history-list">${historyRows}</ul>`
+                            : `<div class="history-note">No run history yet in <code>runs/${product.product_id}/history.jsonl</code></div>`}
                     </div>
                 `;
             }
@@ -284,6 +423,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                 </div>
                 <div class="card-body">
                     <div class="row"><span class="label">Owner:</span> <span>${product.owner}</span></div>
+                    ${app.workOrderRow(app.workOrders[product.product_id])}
                     ${runDetails}
                     ${historySection}
                 </div>
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup - track `python -X importtime` cost over time.
+
+Agents invoke `codemonkeys` thousands of times a day, so interpreter
+startup plus imports dominate short commands. Each scenario (a
+`codemonkeys` argv) is run in a fresh interpreter under -X importtime;
+the median wall time, the median total import time and the slowest
+top-level imports are recorded. Every benchmark is appended, with the
+commit it ran on, to .codemonkeys/bench/cli_startup.jsonl, so a
+regression shows up as a step in the series.
+
+Usage:
+    python scripts/bench_cli_startup.py
+    python scripts/bench_cli_startup.py --runs 10 --compare
+    python scripts/bench_cli_startup.py --scenario "dossier validate --help"
+    python scripts/bench_cli_startup.py --max-ms 250 --no-record   # CI guard
+"""
+import argparse
+import json
+import platform
+import re
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+HISTORY_PATH = Path(".codemonkeys/bench/cli_startup.jsonl")
+
+DEFAULT_SCENARIOS = [
+    ["--help"],
+    ["fleet", "list"],
+    ["dossier", "--help"],
+    ["oracle", "--help"],
+]
+
+# Slowest top-level imports kept per scenario
+TOP_IMPORTS = 5
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \| (\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth)."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def measure(argv: list[str], runs: int) -> dict:
+    """Run `codemonkeys <argv>` runs times and summarize its startup cost."""
+    cmd = [sys.executable, "-X", "importtime", "-m", "codemonkeys.cli", *argv]
+    wall_ms, import_ms = [], []
+    top: dict[str, int] = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        wall_ms.append((time.perf_counter() - start) * 1000)
+        if proc.returncode != 0:
+            raise RuntimeError(f"codemonkeys {shlex.join(argv)} exited {proc.returncode}")
+        roots = [e for e in parse_importtime(proc.stderr) if e[3] == 0]
+        import_ms.append(sum(e[2] for e in roots) / 1000)
+        for module, _, cumulative_us, _ in roots:
+            top[module] = max(top.get(module, 0), cumulative_us)
+
+    slowest = sorted(top.items(), key=lambda item: -item[1])[:TOP_IMPORTS]
+    return {
+        "argv": argv,
+        "wall_ms": round(statistics.median(wall_ms), 1),
+        "import_ms": round(statistics.median(import_ms), 1),
+        "top_imports": [[module, round(us / 1000, 1)] for module, us in slowest],
+    }
+
+
+def current_commit() -> str | None:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def last_record(path: Path) -> dict | None:
+    """Return the most recent benchmark in a history file."""
+    try:
+        lines = path.read_text().splitlines()
+    except FileNotFoundError:
+        return None
+    for line in reversed(lines):
+        if line.strip():
+            return json.loads(line)
+    return None
+
+
+def append_record(path: Path, record: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark codemonkeys CLI startup")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario (median is reported)")
+    parser.add_argument(
+        "--scenario", action="append", dest="scenarios",
+        help="codemonkeys arguments to benchmark, quoted (repeatable; default: a standard set)",
+    )
+    parser.add_argument("--history", default=str(HISTORY_PATH), help="History file (JSON lines)")
+    parser.add_argument("--no-record", action="store_true", help="Do not append to the history")
+    parser.add_argument("--compare", action="store_true", help="Show the change since the previous benchmark")
+    parser.add_argument("--max-ms", type=float, help="Fail if any scenario's median wall time exceeds this")
+    args = parser.parse_args(argv)
+
+    history_path = Path(args.history)
+    scenarios = [shlex.split(s) for s in args.scenarios] if args.scenarios else DEFAULT_SCENARIOS
+    previous = last_record(history_path) if args.compare else None
+    before = {shlex.join(s["argv"]): s for s in previous["scenarios"]} if previous else {}
+
+    results = []
+    for scenario in scenarios:
+        result = measure(scenario, max(args.runs, 1))
+        results.append(result)
+        name = shlex.join(scenario)
+        line = f"[*] codemonkeys {name}: {result['wall_ms']:.1f} ms wall, {result['import_ms']:.1f} ms imports"
+        if name in before:
+            line += f" ({result['wall_ms'] - before[name]['wall_ms']:+.1f} ms since {previous.get('commit') or 'last run'})"
+        print(line)
+        for module, ms in result["top_imports"]:
+            print(f"      {ms:8.1f} ms  {module}")
+
+    if not args.no_record:
+        append_record(history_path, {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": current_commit(),
+            "python": platform.python_version(),
+            "runs": max(args.runs, 1),
+            "scenarios": results,
+        })
+        print(f"[*] Recorded: {history_path}")
+
+    if args.max_ms is not None:
+        slow = [r for r in results if r["wall_ms"] > args.max_ms]
+        for r in slow:
+            print(f"[!] codemonkeys {shlex.join(r['argv'])} exceeds {args.max_ms:g} ms")
+        if slow:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,19 @@ Runs pytest, captures output, and writes a structured last_run.json artifact.
 
 Features:
 - Atomic file writes (prevents partial/corrupted artifacts)
+- Appends each run to dash/runs/<product_id>/history.jsonl
 - Computes actual spent_minutes from timestamps
 - Ensures log file exists even on timeout/exception
+- A pytest run past PYTEST_TIMEOUT_SECONDS has its whole process group
+  killed and is reported with exit code 124 (as coreutils `timeout`)
 - Validates report against schema before exiting success
 - CI mode (--ci) runs without conda dependency
+- Streams pytest output to the log (flat memory) and records exact
+  counts and per-test timings from pytest's JUnit XML
+- Test impact selection (--changed) only runs tests affected by files
+  changed since the last green run, with a periodic full run
+- Sharding (--shards N) splits test files by historical duration and runs
+  the shards concurrently in separate pytest processes
 
 Usage:
     # Local (with conda)
@@ -17,17 +26,33 @@ Usage:
 
     # CI (without conda)
     python scripts/generate_run_report.py <product_id> --ci --test-path tests/dash/
+
+    # Only tests affected by changes since the last green run
+    python scripts/generate_run_report.py <product_id> --ci --changed
+
+    # Sharded across 4 pytest processes
+    python scripts/generate_run_report.py <product_id> --ci --shards 4
 """
 import argparse
+import heapq
 import json
 import os
+import shutil
 import subprocess
 import sys
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+from codemonkeys.core import history
+from codemonkeys.core import impact as impact_selection
+from codemonkeys.core import schemas
+from codemonkeys.core.jobs import TIMEOUT_EXIT_CODE, terminate_group
+
 try:
-    from jsonschema import validate, ValidationError
+    from jsonschema import ValidationError
     HAS_JSONSCHEMA = True
 except ImportError:
     HAS_JSONSCHEMA = False
@@ -76,64 +101,299 @@ def ensure_log_file(log_path: Path, content: str):
     log_path.write_text(content or "[No output captured]")
 
 
-def run_pytest(test_path: str, output_file: Path, ci_mode: bool = False) -> tuple[int, str]:
+PYTEST_TIMEOUT_SECONDS = 300
+
+
+def junit_nodeid(case) -> str:
+    """Rebuild a pytest node id from an xunit1 <testcase> element."""
+    name = case.get("name", "")
+    classname = case.get("classname", "")
+    file = case.get("file")
+    if not file:
+        return f"{classname}::{name}" if classname else name
+    module = file[:-3].replace("/", ".") if file.endswith(".py") else file
+    cls = classname[len(module) + 1:] if classname.startswith(module + ".") else ""
+    return "::".join(part for part in (file, cls, name) if part)
+
+
+def parse_junit_xml(junit_path: Path) -> dict | None:
+    """
+    Parse a pytest JUnit XML report into structured counts and timings.
+
+    The file is streamed with iterparse so memory stays flat for large suites.
+
+    Returns:
+        dict with total/passed/failed/errors/skipped counts, duration_seconds
+        and per-test cases, or None if the report is missing or unreadable.
     """
-    Run pytest and capture output.
+    if not junit_path.exists():
+        return None
+
+    counts = {"passed": 0, "failed": 0, "errors": 0, "skipped": 0}
+    cases = []
+    duration = 0.0
+    try:
+        for _, elem in ET.iterparse(junit_path, events=("end",)):
+            if elem.tag == "testsuite":
+                duration += float(elem.get("time") or 0)
+            elif elem.tag == "testcase":
+                if elem.find("error") is not None:
+                    outcome = "error"
+                    counts["errors"] += 1
+                elif elem.find("failure") is not None:
+                    outcome = "failed"
+                    counts["failed"] += 1
+                elif elem.find("skipped") is not None:
+                    outcome = "skipped"
+                    counts["skipped"] += 1
+                else:
+                    outcome = "passed"
+                    counts["passed"] += 1
+                cases.append({
+                    "nodeid": junit_nodeid(elem),
+                    "outcome": outcome,
+                    "duration": round(float(elem.get("time") or 0), 4),
+                })
+                elem.clear()
+    except (ET.ParseError, ValueError):
+        return None
+
+    return {
+        "total": len(cases),
+        **counts,
+        "duration_seconds": round(duration, 3),
+        "cases": cases,
+    }
+
+
+def summarize_results(results: dict) -> str:
+    """Render structured test results as a one-line summary."""
+    parts = [f"{results['passed']} passed"]
+    if results["failed"]:
+        parts.append(f"{results['failed']} failed")
+    if results["errors"]:
+        parts.append(f"{results['errors']} error" + ("s" if results["errors"] > 1 else ""))
+    if results["skipped"]:
+        parts.append(f"{results['skipped']} skipped")
+    return f"{', '.join(parts)} in {results['duration_seconds']}s"
+
+
+def run_pytest(
+    test_path: str | list[str],
+    output_file: Path,
+    ci_mode: bool = False,
+    junit_path: Path | None = None,
+) -> tuple[int, str, dict | None]:
+    """
+    Run pytest, streaming its output to the log file.
+
+    Output is tee'd line by line to output_file (and never held in memory);
+    structured counts and per-test timings come from pytest's JUnit XML.
 
     Args:
-        test_path: Path to tests
+        test_path: Path to tests (or a list of test files)
         output_file: Path to write pytest output
         ci_mode: If True, run pytest directly (no conda)
+        junit_path: Where pytest writes its JUnit XML report
+            (defaults to junit.xml next to output_file)
 
     Returns:
-        tuple: (exit_code, summary)
+        tuple: (exit_code, summary, test_results or None)
     """
+    junit_path = junit_path or output_file.with_name("junit.xml")
+    paths = [test_path] if isinstance(test_path, str) else list(test_path)
+    pytest_args = [
+        "pytest", *paths, "-v", "--tb=short",
+        f"--junitxml={junit_path}", "-o", "junit_family=xunit1",
+    ]
     if ci_mode:
         # CI mode: run pytest directly
-        cmd = ["pytest", test_path, "-v", "--tb=short"]
+        cmd = pytest_args
     else:
         # Local mode: use conda environment
-        cmd = [
-            "conda", "run", "-n", "helios-gpu-118",
-            "pytest", test_path, "-v", "--tb=short"
-        ]
+        cmd = ["conda", "run", "--no-capture-output", "-n", "helios-gpu-118", *pytest_args]
 
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    first_problem_line = None
+    timed_out = False
 
-        # Write full output to log file
-        full_output = result.stdout + "\n" + result.stderr
-        ensure_log_file(output_file, full_output)
-
-        # Parse summary
-        if result.returncode == 0:
-            summary = "All tests passed"
-        else:
-            # Try to extract failure summary
-            lines = result.stdout.split('\n')
-            summary_lines = [l for l in lines if 'failed' in l.lower() or 'error' in l.lower()]
-            summary = summary_lines[0] if summary_lines else "Tests failed"
-
-        return result.returncode, summary
-
-    except subprocess.TimeoutExpired as e:
-        # Ensure log file exists even on timeout
-        stdout = e.stdout.decode() if e.stdout else ''
-        stderr = e.stderr.decode() if e.stderr else ''
-        partial_output = f"[TIMEOUT after 300s]\nPartial stdout:\n{stdout}\nPartial stderr:\n{stderr}"
-        ensure_log_file(output_file, partial_output)
-        return 2, "Test run timed out (300s)"
+    try:
+        with open(output_file, "w") as log:
+            # Own process group, so a timeout also kills the conda
+            # wrapper's pytest and any workers it started
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                start_new_session=os.name == "posix",
+            )
+
+            def kill_on_timeout():
+                nonlocal timed_out
+                timed_out = True
+                terminate_group(proc)
+
+            timer = threading.Timer(PYTEST_TIMEOUT_SECONDS, kill_on_timeout)
+            timer.start()
+            try:
+                for line in proc.stdout:
+                    log.write(line)
+                    if first_problem_line is None:
+                        lowered = line.lower()
+                        if "failed" in lowered or "error" in lowered:
+                            first_problem_line = line.strip()
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+                proc.stdout.close()
+
+            if timed_out:
+                log.write(f"\n[TIMEOUT after {PYTEST_TIMEOUT_SECONDS}s]\n")
 
     except Exception as e:
         # Ensure log file exists on any exception
         error_content = f"[EXCEPTION]\n{type(e).__name__}: {e}"
         ensure_log_file(output_file, error_content)
-        return 2, f"Error running tests: {e}"
+        return 2, f"Error running tests: {e}", None
+
+    if output_file.stat().st_size == 0:
+        ensure_log_file(output_file, "")
+
+    if timed_out:
+        return TIMEOUT_EXIT_CODE, f"Test run timed out ({PYTEST_TIMEOUT_SECONDS}s)", parse_junit_xml(junit_path)
+
+    results = parse_junit_xml(junit_path)
+    if returncode == 0:
+        summary = "All tests passed"
+        if results:
+            summary += f" ({summarize_results(results)})"
+    elif results and results["total"]:
+        summary = summarize_results(results)
+    else:
+        summary = first_problem_line or "Tests failed"
+
+    return returncode, summary, results
+
+
+def collect_test_files(test_path: str) -> list[str]:
+    """List the pytest files under test_path (or test_path itself if a file)."""
+    path = Path(test_path)
+    if path.is_file():
+        return [str(path)]
+    files = set(path.rglob("test_*.py")) | set(path.rglob("*_test.py"))
+    return sorted(str(f) for f in files)
+
+
+def load_last_run(report_path: Path) -> dict | None:
+    """Load a product's previous last_run.json, if readable."""
+    try:
+        return json.loads(report_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def historical_durations(report_path: Path) -> dict[str, float]:
+    """Sum per-file test durations recorded in a previous last_run.json."""
+    report = load_last_run(report_path) or {}
+    durations: dict[str, float] = {}
+    for case in (report.get("tests") or {}).get("cases", []):
+        test_file = case["nodeid"].split("::", 1)[0]
+        durations[test_file] = durations.get(test_file, 0.0) + case.get("duration", 0.0)
+    return durations
+
+
+def partition_by_duration(
+    files: list[str],
+    durations: dict[str, float],
+    shards: int,
+) -> list[list[str]]:
+    """
+    Split test files into up to `shards` groups of similar total duration.
+
+    Longest-first greedy assignment to the currently lightest shard. Files
+    without history are assumed to take the average known duration.
+    """
+    known = [durations[f] for f in files if f in durations]
+    default = sum(known) / len(known) if known else 1.0
+    weighted = sorted(files, key=lambda f: (-durations.get(f, default), f))
+
+    heap = [(0.0, i) for i in range(min(shards, len(files)))]
+    groups: list[list[str]] = [[] for _ in heap]
+    for test_file in weighted:
+        load, i = heapq.heappop(heap)
+        groups[i].append(test_file)
+        heapq.heappush(heap, (load + durations.get(test_file, default), i))
+    return [sorted(group) for group in groups]
+
+
+def merge_results(results: list[dict | None]) -> dict | None:
+    """Combine per-shard JUnit results into one set of counts and cases."""
+    results = [r for r in results if r]
+    if not results:
+        return None
+    merged = {
+        key: sum(r[key] for r in results)
+        for key in ("total", "passed", "failed", "errors", "skipped")
+    }
+    merged["duration_seconds"] = round(sum(r["duration_seconds"] for r in results), 3)
+    merged["cases"] = [case for r in results for case in r["cases"]]
+    return merged
+
+
+def run_sharded(
+    shards: list[list[str]],
+    run_dir: Path,
+    log_path: Path,
+    ci_mode: bool = False,
+) -> tuple[int, str, dict | None, list[Path]]:
+    """
+    Run each shard in its own pytest process, concurrently.
+
+    Shard logs are merged into log_path (in shard order) afterwards.
+
+    Returns:
+        tuple: (exit_code, summary, merged test_results, shard junit paths)
+    """
+    def run_shard(index: int):
+        return run_pytest(
+            shards[index],
+            run_dir / f"pytest_output.shard{index}.log",
+            ci_mode=ci_mode,
+            junit_path=run_dir / f"junit.shard{index}.xml",
+        )
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        outcomes = list(pool.map(run_shard, range(len(shards))))
+
+    with open(log_path, "w") as log:
+        for index, (code, summary, _) in enumerate(outcomes):
+            shard_log = run_dir / f"pytest_output.shard{index}.log"
+            log.write(f"===== shard {index} ({len(shards[index])} files): exit {code}, {summary} =====\n")
+            with open(shard_log) as f:
+                shutil.copyfileobj(f, log)
+            log.write("\n")
+            shard_log.unlink()
+
+    exit_code = max(code for code, _, _ in outcomes)
+    results = merge_results([r for _, _, r in outcomes])
+    timed_out = [summary for code, summary, _ in outcomes if code == TIMEOUT_EXIT_CODE]
+    if timed_out:
+        summary = timed_out[0]
+    elif results and results["total"]:
+        summary = summarize_results(results)
+        if exit_code == 0:
+            summary = f"All tests passed ({summary})"
+    else:
+        summary = next((s for c, s, _ in outcomes if c != 0), "All tests passed")
+
+    junit_paths = [
+        run_dir / f"junit.shard{i}.xml"
+        for i in range(len(shards))
+        if (run_dir / f"junit.shard{i}.xml").exists()
+    ]
+    return exit_code, summary, results, junit_paths
 
 
 def validate_report(report: dict) -> tuple[bool, str]:
@@ -150,8 +410,7 @@ def validate_report(report: dict) -> tuple[bool, str]:
         return True, f"Schema not found at {SCHEMA_PATH}, skipping validation"
 
     try:
-        schema = json.loads(SCHEMA_PATH.read_text())
-        validate(instance=report, schema=schema)
+        schemas.validate(report, SCHEMA_PATH)
         return True, "Schema validation passed"
     except ValidationError as e:
         return False, f"Schema validation failed: {e.message}"
@@ -164,12 +423,14 @@ def generate_report(
     end_time: str,
     exit_code: int,
     summary: str,
-    evidence_paths: list[str]
+    evidence_paths: list[str],
+    test_results: dict | None = None,
+    test_impact: dict | None = None,
 ) -> dict:
     """Generate a run report dictionary."""
     spent_minutes = compute_spent_minutes(start_time, end_time)
 
-    return {
+    report = {
         "schema_version": "0.1",
         "product_id": product_id,
         "run_id": run_id,
@@ -198,15 +459,32 @@ def generate_report(
             "last_update": end_time
         }
     }
+    if test_results is not None:
+        report["tests"] = test_results
+    if test_impact is not None:
+        report["test_impact"] = test_impact
+    return report
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Generate run report for Dash")
     parser.add_argument("product_id", help="Product identifier (e.g., codemonkeys-dash)")
     parser.add_argument("--test-path", default="tests/", help="Path to tests")
     parser.add_argument("--output-dir", default="dash/runs", help="Output directory")
     parser.add_argument("--ci", action="store_true", help="CI mode: run pytest directly (no conda)")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--shards", type=int, default=1,
+        help="Split test files into N shards run concurrently (balanced by past durations)",
+    )
+    parser.add_argument(
+        "--changed", action="store_true",
+        help="Only run tests affected by changes since the last green run",
+    )
+    parser.add_argument(
+        "--full-every", type=int, default=impact_selection.DEFAULT_FULL_EVERY,
+        help="With --changed, force a full run after this many impacted runs",
+    )
+    args = parser.parse_args(argv)
 
     # Setup paths
     run_id = generate_run_id()
@@ -215,6 +493,7 @@ def main():
     run_dir.mkdir(parents=True, exist_ok=True)
 
     log_path = run_dir / "pytest_output.log"
+    junit_path = run_dir / "junit.xml"
     report_path = output_dir / "last_run.json"
 
     print(f"[*] Starting run: {run_id}")
@@ -222,10 +501,44 @@ def main():
     print(f"[*] Test path: {args.test_path}")
     print(f"[*] CI mode: {args.ci}")
 
+    previous_run = load_last_run(report_path)
+    test_files = None  # None = everything under --test-path
+    impact = {"mode": "full", "base_commit": None, "runs_since_full": 0, "reason": "full run requested"}
+    if args.changed:
+        test_files, impact = impact_selection.plan_selection(
+            collect_test_files(args.test_path), previous_run, args.full_every
+        )
+        print(f"[*] Test impact: {impact['mode']} ({impact['reason']})")
+        if test_files is not None:
+            print(f"[*] Selected test files: {len(test_files)}")
+
+    shards = []
+    if args.shards > 1 and test_files != []:
+        shards = partition_by_duration(
+            test_files if test_files is not None else collect_test_files(args.test_path),
+            historical_durations(report_path),
+            args.shards,
+        )
+        print(f"[*] Shards: {len(shards)}")
+
     # Run tests
     start_time = get_timestamp()
-    exit_code, summary = run_pytest(args.test_path, log_path, ci_mode=args.ci)
+    if test_files == []:
+        exit_code, summary, test_results = 0, f"No tests affected ({impact['reason']})", None
+        ensure_log_file(log_path, f"[TEST IMPACT] {summary}\n")
+        junit_paths = []
+    elif len(shards) > 1:
+        exit_code, summary, test_results, junit_paths = run_sharded(
+            shards, run_dir, log_path, ci_mode=args.ci
+        )
+    else:
+        exit_code, summary, test_results = run_pytest(
+            test_files if test_files is not None else args.test_path,
+            log_path, ci_mode=args.ci, junit_path=junit_path,
+        )
+        junit_paths = [junit_path] if junit_path.exists() else []
     end_time = get_timestamp()
+    impact = impact_selection.record_outcome(impact, previous_run, exit_code)
 
     print(f"[*] Exit code: {exit_code}")
     print(f"[*] Summary: {summary}")
@@ -234,6 +547,7 @@ def main():
     evidence_paths = [
         f"runs/{args.product_id}/{run_id}/pytest_output.log",
     ]
+    evidence_paths += [f"runs/{args.product_id}/{run_id}/{p.name}" for p in junit_paths]
 
     # Generate report
     report = generate_report(
@@ -243,7 +557,9 @@ def main():
         end_time=end_time,
         exit_code=exit_code,
         summary=summary,
-        evidence_paths=evidence_paths
+        evidence_paths=evidence_paths,
+        test_results=test_results,
+        test_impact=impact,
     )
 
     # Validate report against schema
@@ -258,6 +574,10 @@ def main():
     atomic_write_json(report_path, report)
     print(f"[*] Report written atomically to: {report_path}")
 
+    # Append to the product's run history (survives gc_runs)
+    history.append_run(output_dir, report)
+    print(f"[*] History appended to: {history.history_path(output_dir)}")
+
     return exit_code
 
 
@@ -1,24 +1,90 @@
 #!/usr/bin/env python3
-"""Generate science index for Dash Science Lane view."""
+"""Generate science index for Dash Science Lane view.
+
+Incremental by default: each science dossier's item and each design
+dossier's science_source link are cached in the dash refresh manifest
+(see codemonkeys.core.indexer), so only changed dossiers are re-parsed.
+"""
+import argparse
 import json
 import sys
 from datetime import datetime
 from pathlib import Path
 
-import frontmatter
+from codemonkeys.core.cache import file_digest
+from codemonkeys.core.dossiers import design_links, design_source, link_map, load_metadata
+from codemonkeys.core.indexer import DEFAULT_MANIFEST_PATH, Index, Manifest, refresh
+
+DEFAULT_OUTPUT = Path("dash/science_index.json")
+
+# Cached entries are discarded when the extraction code changes
+EXTRACTOR_DIGEST = file_digest(__file__) or ""
+
+
+def find_linked_design_dossier(
+    science_dossier_id: str,
+    dossiers_dir: Path,
+    links: dict[str, str] | None = None
+) -> str | None:
+    """
+    Find if a design dossier was created from this science dossier.
+
+    Pass links (from design_links) when looking up several dossiers, so
+    the design dossiers are parsed once rather than once per lookup.
+    """
+    if links is None:
+        links = design_links(dossiers_dir)
+    return links.get(science_dossier_id)
+
+
+def science_entry(sci_file: Path) -> dict | None:
+    """Extract a science dossier's index item (without its design link)."""
+    try:
+        meta = load_metadata(sci_file)
+    except Exception as e:
+        print(f"Warning: Could not parse {sci_file}: {e}", file=sys.stderr)
+        return None
+    return {
+        "dossier_id": meta.get("dossier_id", sci_file.stem),
+        "topic": meta.get("topic", "Unknown"),
+        "status": meta.get("status", "draft"),
+        "created_at": str(meta.get("created_at", "")),
+        "owner": meta.get("owner", "unknown"),
+        "science_path": str(sci_file),
+    }
+
 
+def assemble_science_index(entries: dict[str, dict]) -> dict:
+    """Join science items with the design dossiers linked to them."""
+    links = link_map(entries["designs"].items())
+    items = [
+        {**item, "design_dossier_path": links.get(item["dossier_id"])}
+        for item in entries["science"].values()
+        if item
+    ]
+    return {
+        "generated_at": datetime.now().isoformat() + "Z",
+        "items": items
+    }
 
-def find_linked_design_dossier(science_dossier_id: str, dossiers_dir: Path) -> str | None:
-    """Find if a design dossier was created from this science dossier."""
-    for dos_file in dossiers_dir.glob("DOS-*.md"):
-        try:
-            post = frontmatter.load(dos_file)
-            evidence = post.metadata.get("evidence", {})
-            if evidence.get("science_source") == science_dossier_id:
-                return str(dos_file)
-        except Exception:
-            continue
-    return None
+
+def index(
+    output: Path | None = None,
+    science_dir: Path = Path("docs/science"),
+    dossiers_dir: Path = Path("docs/dossiers")
+) -> Index:
+    """The science index as an incremental `dash refresh` indexer."""
+    return Index(
+        name="science",
+        output=output or DEFAULT_OUTPUT,
+        inputs={
+            "science": str(science_dir / "SCI-*.md"),
+            "designs": str(dossiers_dir / "DOS-*.md"),
+        },
+        extract=lambda group, path: science_entry(path) if group == "science" else design_source(path),
+        assemble=assemble_science_index,
+        version=EXTRACTOR_DIGEST,
+    )
 
 
 def generate_science_index(
@@ -26,42 +92,15 @@ def generate_science_index(
     dossiers_dir: Path,
     output_path: Path
 ) -> dict:
-    """Generate science index JSON."""
-    items = []
-
-    if not science_dir.exists():
-        return {"generated_at": datetime.now().isoformat() + "Z", "items": []}
-
-    for sci_file in sorted(science_dir.glob("SCI-*.md")):
-        try:
-            post = frontmatter.load(sci_file)
-            meta = post.metadata
-
-            dossier_id = meta.get("dossier_id", sci_file.stem)
-            topic = meta.get("topic", "Unknown")
-            status = meta.get("status", "draft")
-            created_at = meta.get("created_at", "")
-            owner = meta.get("owner", "unknown")
-
-            # Find linked design dossier
-            design_path = find_linked_design_dossier(dossier_id, dossiers_dir)
-
-            items.append({
-                "dossier_id": dossier_id,
-                "topic": topic,
-                "status": status,
-                "created_at": str(created_at),
-                "owner": owner,
-                "science_path": str(sci_file),
-                "design_dossier_path": design_path
-            })
-        except Exception as e:
-            print(f"Warning: Could not parse {sci_file}: {e}", file=sys.stderr)
-            continue
-
+    """Generate science index JSON from scratch (no manifest)."""
+    links = design_links(dossiers_dir)
+    items = [science_entry(p) for p in sorted(science_dir.glob("SCI-*.md"))]
     index = {
         "generated_at": datetime.now().isoformat() + "Z",
-        "items": items
+        "items": [
+            {**item, "design_dossier_path": links.get(item["dossier_id"])}
+            for item in items if item
+        ]
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -71,17 +110,25 @@ def generate_science_index(
     return index
 
 
-def main():
-    science_dir = Path("docs/science")
-    dossiers_dir = Path("docs/dossiers")
-    output_path = Path("dash/science_index.json")
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Generate Dash science index")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Output path")
+    parser.add_argument("--full", action="store_true", help="Rebuild every entry, ignoring the manifest")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH, help="Refresh manifest path")
+    args = parser.parse_args(argv)
 
-    index = generate_science_index(science_dir, dossiers_dir, output_path)
+    output_path = args.output
+    [result] = refresh([index(output_path)], Manifest(args.manifest), force=args.full)
+    with open(output_path) as f:
+        science = json.load(f)
 
-    print(f"Generated: {output_path}")
-    print(f"  Items: {len(index['items'])}")
+    if result.written:
+        print(f"Generated: {output_path}")
+    else:
+        print(f"Up to date: {output_path}")
+    print(f"  Items: {len(science['items'])} ({result.changed} inputs changed)")
 
-    for item in index["items"]:
+    for item in science["items"]:
         status_icon = "✅" if item["status"] == "validated" else "📝"
         converted = "→ " + item["design_dossier_path"] if item["design_dossier_path"] else ""
         print(f"  {status_icon} {item['dossier_id']}: {item['topic']} {converted}")
@@ -22,6 +22,8 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+from codemonkeys.core.state import StateStore
+
 NEXUS_OUTBOX = Path("nexus/outbox")
 NEXUS_INBOX = Path("nexus/inbox")
 DASH_RUNS = Path("dash/runs")
@@ -171,13 +173,22 @@ def process_decision(decision_path: Path, dry_run: bool = False) -> bool:
     return success
 
 
-def process_all_decisions(dry_run: bool = False) -> tuple[int, int]:
-    """Process all pending decisions in the outbox."""
+def process_all_decisions(dry_run: bool = False, store: StateStore | None = None) -> tuple[int, int]:
+    """
+    Process all pending decisions in the outbox.
+
+    With a state store, only decisions indexed as 'issued' are opened;
+    already-executed decisions are not re-read.
+    """
     if not NEXUS_OUTBOX.exists():
         print("[WARN] Nexus outbox directory not found")
         return 0, 0
     
-    decisions = list(NEXUS_OUTBOX.glob("*.json"))
+    if store is not None:
+        store.sync("decisions", NEXUS_OUTBOX)
+        decisions = [Path(p) for p, _ in store.find("decisions", status="issued", directory=NEXUS_OUTBOX)]
+    else:
+        decisions = list(NEXUS_OUTBOX.glob("*.json"))
     if not decisions:
         print("[INFO] No decisions in outbox")
         return 0, 0
@@ -194,11 +205,12 @@ def process_all_decisions(dry_run: bool = False) -> tuple[int, int]:
     return success_count, fail_count
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Nexus Decision Executor")
     parser.add_argument("--decision", help="Process specific decision by ID")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be done")
-    args = parser.parse_args()
+    parser.add_argument("--no-state", action="store_true", help="Scan the outbox directly, bypassing the state index")
+    args = parser.parse_args(argv)
     
     print("\n=== Nexus Executor ===\n")
     
@@ -210,7 +222,12 @@ def main():
         success = process_decision(decision_path, args.dry_run)
         return 0 if success else 1
     else:
-        success, fail = process_all_decisions(args.dry_run)
+        store = None if args.no_state else StateStore()
+        try:
+            success, fail = process_all_decisions(args.dry_run, store)
+        finally:
+            if store is not None:
+                store.close()
         print(f"\n=== Summary ===")
         print(f"Processed: {success}")
         print(f"Failed: {fail}")
@@ -3,7 +3,8 @@
 Oracle Executor - executes work orders with budget enforcement.
 
 Reads:
-- Work orders from nexus/work_orders/*.json
+- Work orders from nexus/work_orders/*.json, through the queue index
+  (codemonkeys.core.work_orders) so only the orders to run are opened
 
 Executes:
 - validate: codemonkeys silverback --all
@@ -14,62 +15,196 @@ Enforces:
 - Budget limits (max work orders, max_actions per job)
 - Stop conditions
 
+In-process dispatch:
+- Unbudgeted validate and science_to_design orders (e.g. hand-written
+  ones) run in this interpreter to avoid paying Python startup per order;
+  --subprocess restores isolation. Orders with budget.max_seconds, which
+  includes every planned and scheduled order, always run in a child
+  process: an in-process run cannot be stopped at its deadline (it would
+  keep writing after the order was marked timed_out, and race its retry).
+  test and regenerate_report always run pytest in a child process.
+
+Test impact selection:
+- test orders with inputs.test_selection == "impacted" only run the tests
+  affected by changes since the product's last green run (see
+  codemonkeys.core.impact), falling back to the full tree when unsure.
+  Every test run (impacted or full) is recorded in the product's
+  last_run.json test_impact, advancing its green commit and the count
+  towards the periodic full run; a shared full run is recorded for every
+  product that reused it. The planner emits full runs; a schedule opts a
+  test job in with "inputs": {"test_selection": "impacted"}.
+
+Time budgets:
+- budget.max_seconds bounds each order's wall time. Child processes run
+  in their own process group, which is killed on timeout; the order is
+  marked timed_out with the output produced so far, and the rest of the
+  queue carries on (a timeout does not trigger stop conditions).
+
+Shared results:
+- validate and full test runs do not depend on the product. Within one
+  executor run their result is memoized by repo tree hash and reused by
+  every other order for the same intent; each order still gets its own
+  result record (with shared_from naming the order that ran).
+
+Claims:
+- Orders are claimed by an atomic rename into nexus/work_orders/claimed/
+  and heartbeated while they run, so any number of executors (processes
+  or machines sharing the directory) can work one queue. Claims whose
+  executor died are requeued once their lease (--lease-seconds) expires.
+
+Retries:
+- A failed attempt is classified as timeout, infra_error or failure
+  (codemonkeys.core.retry). Timeouts and infra errors are retried per the
+  intent's policy with exponential backoff and jitter; a waiting retry
+  does not hold a worker. Every attempt is kept in result["attempts"],
+  and stop conditions only see an order's final attempt.
+
+Concurrency:
+- With --workers N, work orders are grouped by product and each product's
+  queue runs in its own worker. Orders within a product stay in priority
+  order, and a stop condition only halts the rest of that product's queue.
+
 Usage:
     python scripts/oracle_executor.py --budget 3
     python scripts/oracle_executor.py --budget 3 --dry-run
+    python scripts/oracle_executor.py --budget 20 --workers 4
+    python scripts/oracle_executor.py --budget 3 --subprocess
 """
 import argparse
+import hashlib
+import heapq
+import itertools
 import json
+import os
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from codemonkeys.core import impact
+from codemonkeys.core.cache import file_digest
+from codemonkeys.core.jobs import JobTimeout, TIMEOUT_EXIT_CODE, run_command
+from codemonkeys.core.scripts import call_captured
+from codemonkeys.core.retry import INFRA_ERROR, classify_failure, retry_policy
+from codemonkeys.core.work_orders import DEFAULT_LEASE_SECONDS, LeaseLost, WorkOrderQueue, queue_for
+
 
 def load_work_orders(work_orders_dir: Path, budget: int) -> list[dict]:
     """Load pending work orders sorted by priority."""
+    # The queue index only opens the orders it returns
     work_orders = []
-    
-    for wo_file in work_orders_dir.glob("*.json"):
-        if wo_file.name.startswith("_"):  # Skip meta files
-            continue
-        with open(wo_file) as f:
-            wo = json.load(f)
-        if wo.get("status") == "pending":
-            wo["_filepath"] = str(wo_file)
-            work_orders.append(wo)
-    
-    # Sort by priority descending
-    work_orders.sort(key=lambda x: -x.get("priority", 0))
-    
-    return work_orders[:budget]
+    for path, wo in WorkOrderQueue(work_orders_dir).pending(budget):
+        wo["_filepath"] = path
+        work_orders.append(wo)
+    return work_orders
 
 
-def execute_validate(dry_run: bool = False) -> tuple[int, str]:
+def execute_validate(
+    dry_run: bool = False,
+    in_process: bool = False,
+    timeout: float | None = None
+) -> tuple[int, str]:
     """Execute validation (Silverback)."""
     cmd = [sys.executable, "-m", "codemonkeys.cli", "silverback", "--all"]
     
     if dry_run:
         return (0, f"[DRY-RUN] Would execute: {' '.join(cmd)}")
+
+    # An in-process run cannot be killed at the deadline, so a budgeted
+    # one runs in its own process group instead
+    if in_process and timeout is None:
+        import silverback_validate
+        return call_captured(silverback_validate.main, ["--all"])
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    output = result.stdout + result.stderr
-    return (result.returncode, output)
+    return run_command(cmd, timeout)
+
+
+def load_last_run(product_id: str) -> dict | None:
+    """Load a product's last_run.json, or None if it has no readable report."""
+    try:
+        return json.loads((Path("dash/runs") / product_id / "last_run.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def select_impacted_tests(product_id: str, last_run: dict | None = None) -> tuple[list[str] | None, dict]:
+    """
+    Select the test files affected by changes since the product's last green run.
+
+    Returns (test files, or None for a full run; test_impact info).
+    """
+    test_files = sorted(str(p) for p in Path("tests").rglob("test_*.py"))
+    return impact.plan_selection(test_files, last_run)
+
+
+# test_impact info for a test order that asked for the full tree
+FULL_RUN_INFO = {"mode": "full", "base_commit": None, "runs_since_full": 0, "reason": "full run requested"}
 
 
-def execute_test(dry_run: bool = False) -> tuple[int, str]:
-    """Execute tests (pytest)."""
-    cmd = [sys.executable, "-m", "pytest", "tests/", "-q"]
+def record_test_outcome(product_id: str, info: dict, last_run: dict | None, exit_code: int):
+    """
+    Record a test run in last_run.json's test_impact.
+
+    This advances green_commit and runs_since_full, so the next impacted
+    run diffs against this one and the periodic full run comes due.
+    Products without a report are left alone; generate_run_report
+    writes the first one.
+    """
+    if last_run is None:
+        return
+    path = Path("dash/runs") / product_id / "last_run.json"
+    last_run["test_impact"] = impact.record_outcome(info, last_run, exit_code)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(last_run, indent=2))
+    os.replace(tmp_path, path)
+
+
+def execute_test(
+    dry_run: bool = False,
+    product_id: str | None = None,
+    test_selection: str = "full",
+    timeout: float | None = None
+) -> tuple[int, str]:
+    """Execute tests (pytest), optionally only those impacted by recent changes."""
+    selected = None
+    note = ""
+    info = dict(FULL_RUN_INFO)
+    last_run = load_last_run(product_id) if product_id else None
+    if test_selection == "impacted" and product_id:
+        selected, info = select_impacted_tests(product_id, last_run)
+        note = f"[TEST IMPACT] {info['reason']}\n"
+
+    cmd = [sys.executable, "-m", "pytest", *(selected or ["tests/"]), "-q"]
     
     if dry_run:
-        return (0, f"[DRY-RUN] Would execute: {' '.join(cmd)}")
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    output = result.stdout + result.stderr
-    return (result.returncode, output)
-
+        if selected == []:
+            return (0, f"{note}[DRY-RUN] No tests affected")
+        return (0, f"{note}[DRY-RUN] Would execute: {' '.join(cmd)}")
 
-def execute_regenerate_report(product_id: str, dry_run: bool = False) -> tuple[int, str]:
+    if selected == []:
+        exit_code, output = 0, "No tests affected"
+    else:
+        try:
+            exit_code, output = run_command(cmd, timeout)
+        except JobTimeout as e:
+            if product_id:
+                record_test_outcome(product_id, info, last_run, TIMEOUT_EXIT_CODE)
+            e.output = note + e.output
+            raise
+    if product_id:
+        record_test_outcome(product_id, info, last_run, exit_code)
+    return (exit_code, note + output)
+
+
+def execute_regenerate_report(
+    product_id: str,
+    dry_run: bool = False,
+    timeout: float | None = None
+) -> tuple[int, str]:
     """Execute report regeneration."""
     cmd = [sys.executable, "scripts/generate_run_report.py", product_id]
     
@@ -81,15 +216,15 @@ def execute_regenerate_report(product_id: str, dry_run: bool = False) -> tuple[i
     if not script_path.exists():
         return (1, f"Script not found: {script_path}")
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    output = result.stdout + result.stderr
-    return (result.returncode, output)
+    return run_command(cmd, timeout)
 
 
 def execute_science_to_design(
     science_path: str,
     product_id: str,
-    dry_run: bool = False
+    dry_run: bool = False,
+    in_process: bool = False,
+    timeout: float | None = None
 ) -> tuple[int, str]:
     """Execute science-to-design conversion."""
     cmd = [
@@ -106,9 +241,16 @@ def execute_science_to_design(
     if not P(science_path).exists():
         return (1, f"Science dossier not found: {science_path}")
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    output = result.stdout + result.stderr
-    return (result.returncode, output)
+    # As for validate: only unbudgeted runs stay in-process
+    if in_process and timeout is None:
+        from codemonkeys.commands.dossier import science_to_design
+        return call_captured(
+            science_to_design.main,
+            [science_path, "--product-id", product_id],
+            standalone_mode=False
+        )
+
+    return run_command(cmd, timeout)
 
 
 def execute_gc_runs(
@@ -148,7 +290,8 @@ def execute_gc_runs(
 
 def execute_drift_check(
     product_id: str,
-    dry_run: bool = False
+    dry_run: bool = False,
+    timeout: float | None = None
 ) -> tuple[int, str]:
     """Execute drift check - produce a report of environment state."""
     import platform
@@ -173,11 +316,12 @@ def execute_drift_check(
 
     # Get pip freeze if possible
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "freeze"],
-            capture_output=True, text=True
+        _, freeze = run_command(
+            [sys.executable, "-m", "pip", "freeze"], timeout, stderr=subprocess.DEVNULL
         )
-        report["pip_freeze"] = result.stdout.strip().split("\n")
+        report["pip_freeze"] = freeze.strip().split("\n")
+    except JobTimeout:
+        raise
     except Exception:
         report["pip_freeze"] = []
 
@@ -190,35 +334,231 @@ def execute_drift_check(
     return (0, f"Drift report written to {report_file}")
 
 
-def execute_work_order(wo: dict, dry_run: bool = False) -> dict:
-    """Execute a single work order and return result."""
+# Intents whose result can be shared between orders in one run, because
+# it depends only on the repository (test: full runs only, see shared_key).
+# Not the planner's REPO_WIDE_INTENTS, which decides what is coalesced into
+# one order when planning: test orders stay per product there.
+SHAREABLE_INTENTS = {"validate", "test"}
+
+
+def _git_output(*args: str) -> bytes | None:
+    """Run a git command and return its stdout, or None if it failed."""
+    try:
+        proc = subprocess.Popen(
+            ["git", *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        return None
+    stdout, _ = proc.communicate()
+    return stdout if proc.returncode == 0 else None
+
+
+def repo_tree_hash() -> str | None:
+    """
+    Hash the working tree as git sees it: HEAD's tree, uncommitted changes
+    and untracked (non-ignored) files. Returns None outside a git checkout.
+    """
+    head = _git_output("rev-parse", "HEAD^{tree}")
+    if head is None:
+        return None
+    h = hashlib.sha256(head)
+    h.update(_git_output("diff", "HEAD", "--binary") or b"")
+    untracked = _git_output("ls-files", "--others", "--exclude-standard", "-z") or b""
+    for name in sorted(filter(None, untracked.split(b"\0"))):
+        h.update(name)
+        h.update((file_digest(name.decode()) or "").encode())
+    return h.hexdigest()
+
+
+def shared_key(wo: dict) -> tuple | None:
+    """Memoization key for product-independent orders, or None if not shareable."""
+    intent = wo.get("intent")
+    if intent not in SHAREABLE_INTENTS:
+        return None
+    if intent == "test" and wo.get("inputs", {}).get("test_selection", "full") != "full":
+        return None  # Impacted selection depends on the product's last green run
+    return (intent,)
+
+
+class SharedResults:
+    """
+    Per-run memo of product-independent results, keyed by repo tree hash.
+
+    The first order to ask for a key runs it; concurrent or later orders
+    for the same key and tree wait for and reuse that result. Recomputing
+    the tree hash on every lookup means an order that changes the tree
+    (e.g. regenerate_report writing dash/runs) invalidates the memo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, dict] = {}
+
+    def get_or_run(self, key: tuple, job_id: str, func) -> tuple[tuple[int, str], str, str | None]:
+        """
+        Return (result, job_id that produced it, tree hash).
+
+        Outside git (no tree hash) nothing is shared.
+        """
+        tree = repo_tree_hash()
+        if tree is None:
+            return func(), job_id, None
+
+        while True:
+            with self._lock:
+                entry = self._entries.get((*key, tree))
+                leader = entry is None
+                if leader:
+                    entry = {"done": threading.Event(), "job_id": job_id, "value": None}
+                    self._entries[(*key, tree)] = entry
+
+            if leader:
+                try:
+                    entry["value"] = func()
+                except JobTimeout:
+                    # Not shared: waiting orders run under their own budget
+                    with self._lock:
+                        del self._entries[(*key, tree)]
+                    entry["timed_out"] = True
+                    raise
+                except Exception as e:
+                    entry["value"] = (2, f"{type(e).__name__}: {e}")
+                finally:
+                    entry["done"].set()
+            else:
+                entry["done"].wait()
+                if entry.get("timed_out"):
+                    continue
+            return entry["value"], entry["job_id"], tree
+
+
+def execute_work_order(
+    wo: dict,
+    dry_run: bool = False,
+    in_process: bool = True,
+    shared: SharedResults | None = None
+) -> dict:
+    """
+    Execute a single work order and return result.
+
+    With a SharedResults memo, product-independent intents reuse the result
+    of an identical order already run against the same repo tree.
+
+    An order running past budget.max_seconds is killed and marked
+    timed_out, keeping the output it produced before the deadline.
+    """
     intent = wo.get("intent")
     product_id = wo.get("product_id")
-    inputs = wo.get("inputs", {})
 
-    print(f"\n{'='*50}")
-    print(f"Executing: {wo.get('job_id')}")
-    print(f"  Product: {product_id}")
-    print(f"  Intent:  {intent}")
-    print(f"  Priority: {wo.get('priority')}")
-    print(f"{'='*50}")
+    # Each block is emitted with a single print so that concurrent workers
+    # do not interleave lines within one work order's output.
+    print(
+        f"\n{'='*50}\n"
+        f"Executing: {wo.get('job_id')}\n"
+        f"  Product: {product_id}\n"
+        f"  Intent:  {intent}\n"
+        f"  Priority: {wo.get('priority')}\n"
+        f"{'='*50}"
+    )
 
     start_time = datetime.now()
+    shared_from = None
+    timed_out = False
+    key = shared_key(wo) if shared is not None and not dry_run else None
+
+    try:
+        if key is not None:
+            (exit_code, output), source_job, tree = shared.get_or_run(
+                key,
+                wo.get("job_id"),
+                lambda: execute_intent(wo, dry_run, in_process)
+            )
+            if source_job != wo.get("job_id"):
+                shared_from = {"job_id": source_job, "tree_hash": tree}
+                if wo.get("intent") == "test" and product_id:
+                    # The leader recorded the run for its own product only
+                    record_test_outcome(
+                        product_id, dict(FULL_RUN_INFO), load_last_run(product_id), exit_code
+                    )
+        else:
+            exit_code, output = execute_intent(wo, dry_run, in_process)
+    except JobTimeout as e:
+        timed_out = True
+        exit_code = TIMEOUT_EXIT_CODE
+        output = f"{e.output}\n[TIMEOUT] {e} (budget.max_seconds)"
+    
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+    
+    result = {
+        "exit_code": exit_code,
+        "completed_at": end_time.isoformat() + "Z",
+        "duration_seconds": duration,
+        "evidence_produced": wo.get("evidence_expectations", []) if exit_code == 0 else [],
+        "error_message": output if exit_code != 0 else ""
+    }
+    if shared_from:
+        result["shared_from"] = shared_from
+    
+    if timed_out:
+        status = "timed_out"
+    else:
+        status = "completed" if exit_code == 0 else "failed"
+    
+    summary = (
+        f"\n  [{wo.get('job_id')}] Status: {status}\n"
+        f"  Exit code: {exit_code}\n"
+        f"  Duration: {duration:.2f}s\n"
+    )
+    if shared_from:
+        summary += f"  Reused result of {shared_from['job_id']} (tree {shared_from['tree_hash'][:12]})\n"
+    if timed_out:
+        summary += f"\n  Output (last 500 chars):\n{output[-500:]}"
+    elif not dry_run:
+        summary += f"\n  Output:\n{output[:500]}"
+    else:
+        summary += f"\n  {output}"
+    print(summary)
+    
+    return {
+        "status": status,
+        "result": result
+    }
+
+
+def execute_intent(wo: dict, dry_run: bool = False, in_process: bool = True) -> tuple[int, str]:
+    """
+    Dispatch a work order to its intent's executor. Returns (exit_code, output).
+
+    Raises JobTimeout if the intent's command outlives budget.max_seconds.
+    """
+    intent = wo.get("intent")
+    product_id = wo.get("product_id")
+    inputs = wo.get("inputs", {})
+    timeout = wo.get("budget", {}).get("max_seconds")
 
     if intent == "validate":
-        exit_code, output = execute_validate(dry_run)
+        exit_code, output = execute_validate(dry_run, in_process, timeout)
     elif intent == "test":
-        exit_code, output = execute_test(dry_run)
+        exit_code, output = execute_test(
+            dry_run,
+            product_id,
+            inputs.get("test_selection", "full"),
+            timeout
+        )
     elif intent == "regenerate_report":
         exit_code, output = execute_regenerate_report(
             inputs.get("product_id", product_id),
-            dry_run
+            dry_run,
+            timeout
         )
     elif intent == "science_to_design":
         exit_code, output = execute_science_to_design(
             inputs.get("science_path", ""),
             inputs.get("product_id", ""),
-            dry_run
+            dry_run,
+            in_process,
+            timeout
         )
     elif intent == "gc_runs":
         exit_code, output = execute_gc_runs(
@@ -229,42 +569,21 @@ def execute_work_order(wo: dict, dry_run: bool = False) -> dict:
     elif intent == "drift_check":
         exit_code, output = execute_drift_check(
             inputs.get("product_id", product_id),
-            dry_run
+            dry_run,
+            timeout
         )
     else:
         exit_code = 1
         output = f"Unknown intent: {intent}"
-        output = f"Unknown intent: {intent}"
-    
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
-    
-    result = {
-        "exit_code": exit_code,
-        "completed_at": end_time.isoformat() + "Z",
-        "duration_seconds": duration,
-        "evidence_produced": wo.get("evidence_expectations", []) if exit_code == 0 else [],
-        "error_message": output if exit_code != 0 else ""
-    }
-    
-    status = "completed" if exit_code == 0 else "failed"
-    
-    print(f"\n  Status: {status}")
-    print(f"  Exit code: {exit_code}")
-    print(f"  Duration: {duration:.2f}s")
-    
-    if not dry_run:
-        print(f"\n  Output:\n{output[:500]}")
-    else:
-        print(f"\n  {output}")
-    
-    return {
-        "status": status,
-        "result": result
-    }
 
+    return exit_code, output
 
-def update_work_order(wo: dict, execution_result: dict, dry_run: bool = False):
+
+def update_work_order(
+    wo: dict,
+    execution_result: dict,
+    dry_run: bool = False
+):
     """Update work order file with execution result."""
     if dry_run:
         return
@@ -275,15 +594,25 @@ def update_work_order(wo: dict, execution_result: dict, dry_run: bool = False):
     
     wo.update(execution_result)
     del wo["_filepath"]
-    
-    with open(filepath, "w") as f:
-        json.dump(wo, f, indent=2)
+
+    try:
+        queue_for(filepath).complete(filepath, wo)
+    except LeaseLost as e:
+        print(f"\n⚠️  {e}; result of {wo.get('job_id')} dropped")
+        return
+    wo.pop("lease", None)
 
 
 def should_stop(wo: dict, execution_result: dict) -> tuple[bool, str]:
     """Check if stop conditions are met."""
     stop_conditions = wo.get("stop_conditions", [])
+    if execution_result.get("status") == "timed_out":
+        # A hung job says nothing about the rest of the queue
+        return (False, "")
     result = execution_result.get("result", {})
+    if result.get("failure_class") == INFRA_ERROR:
+        # Nor does a broken run that exhausted its retries
+        return (False, "")
     exit_code = result.get("exit_code", 0)
     
     if exit_code != 0:
@@ -295,13 +624,185 @@ def should_stop(wo: dict, execution_result: dict) -> tuple[bool, str]:
     return (False, "")
 
 
+def group_by_product(work_orders: list[dict]) -> list[list[dict]]:
+    """
+    Split work orders into per-product queues.
+
+    Queues keep the incoming (priority) order of their orders and are
+    returned in order of each product's first appearance.
+    """
+    queues: dict[str, list[dict]] = {}
+    for wo in work_orders:
+        queues.setdefault(wo.get("product_id", ""), []).append(wo)
+    return list(queues.values())
+
+
+class QueueRunner:
+    """
+    Run queues of work orders on a pool of workers.
+
+    Each queue runs its orders one at a time, in order. An attempt that
+    fails transiently (see codemonkeys.core.retry) does not hold its
+    worker while it waits: the queue moves on, and once its backoff has
+    elapsed the order rejoins the front of its queue, ahead of the
+    lower-priority orders that ran in the meantime. A stop condition drops
+    the rest of its queue, waiting retries included.
+
+    Every attempt is recorded in the order's result["attempts"].
+    """
+
+    def __init__(
+        self,
+        queues: list[list[dict]],
+        workers: int = 1,
+        dry_run: bool = False,
+        in_process: bool = True,
+        shared: SharedResults | None = None
+    ):
+        self.queues = [deque(queue) for queue in queues]
+        self.workers = max(1, min(workers, len(queues)))
+        self.dry_run = dry_run
+        self.in_process = in_process
+        self.shared = shared
+        # (order, execution result) of every finished order
+        self.finished: list[tuple[dict, dict]] = []
+        self._attempts: dict[int, list[dict]] = {}
+        self._retries: list[tuple[float, int, int, dict]] = []  # (due, seq, queue, order)
+        self._seq = itertools.count()
+        self._active: set[int] = set()
+        self._stopped: set[int] = set()
+        self._error: BaseException | None = None
+        self._cond = threading.Condition()
+
+    def run(self) -> list[dict]:
+        """Run every queue to completion; returns the execution results."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            with self._cond:
+                for index in range(len(self.queues)):
+                    self._start(pool, index)
+                while self._error is None:
+                    now = time.monotonic()
+                    while self._retries and self._retries[0][0] <= now:
+                        _, _, index, wo = heapq.heappop(self._retries)
+                        if index not in self._stopped:
+                            self.queues[index].appendleft(wo)
+                            self._start(pool, index)
+                    if not self._active and not self._retries:
+                        break
+                    self._cond.wait(self._retries[0][0] - now if self._retries else None)
+        if self._error is not None:
+            raise self._error
+        return [result for _, result in self.finished]
+
+    def _start(self, pool: ThreadPoolExecutor, index: int):
+        if index not in self._active and self.queues[index]:
+            self._active.add(index)
+            pool.submit(self._drain, index)
+
+    def _drain(self, index: int):
+        try:
+            while True:
+                with self._cond:
+                    if index in self._stopped or not self.queues[index]:
+                        self._active.discard(index)
+                        self._cond.notify()
+                        return
+                    wo = self.queues[index].popleft()
+                self._run_one(index, wo)
+        except BaseException as e:
+            with self._cond:
+                self._error = e
+                self._active.discard(index)
+                self._cond.notify()
+
+    def _run_one(self, index: int, wo: dict):
+        job_id = wo.get("job_id")
+        attempts = self._attempts.setdefault(id(wo), [])
+        # A retry runs afresh rather than reusing a shared (failed) result
+        shared = self.shared if not attempts else None
+        execution_result = execute_work_order(wo, self.dry_run, self.in_process, shared)
+
+        result = execution_result["result"]
+        failure = classify_failure(
+            wo.get("intent"),
+            result["exit_code"],
+            result["error_message"],
+            execution_result["status"] == "timed_out"
+        )
+        attempt = {
+            "attempt": len(attempts) + 1,
+            "status": execution_result["status"],
+            "exit_code": result["exit_code"],
+            "failure_class": failure,
+            "completed_at": result["completed_at"],
+            "duration_seconds": result["duration_seconds"],
+        }
+        attempts.append(attempt)
+
+        policy = retry_policy(wo)
+        if not self.dry_run and policy.should_retry(failure, len(attempts)):
+            delay = policy.delay(len(attempts))
+            attempt["retry_after_seconds"] = round(delay, 3)
+            print(
+                f"\n🔁 [{job_id}] {failure} on attempt {len(attempts)}/{policy.max_attempts}; "
+                f"retrying in {delay:.1f}s"
+            )
+            with self._cond:
+                heapq.heappush(self._retries, (time.monotonic() + delay, next(self._seq), index, wo))
+                self._cond.notify()
+            return
+
+        result["attempts"] = attempts
+        if failure:
+            result["failure_class"] = failure
+        update_work_order(wo, execution_result, self.dry_run)
+
+        should_stop_now, reason = should_stop(wo, execution_result)
+        with self._cond:
+            self.finished.append((wo, execution_result))
+            if should_stop_now:
+                print(f"\n⚠️  Stop condition triggered by {job_id}: {reason}")
+                self._stopped.add(index)
+
+
+def run_queue(
+    work_orders: list[dict],
+    dry_run: bool = False,
+    in_process: bool = True,
+    shared: SharedResults | None = None
+) -> list[dict]:
+    """
+    Execute a queue of work orders in order until a stop condition triggers.
+
+    Returns the execution results of the orders that finished, in the
+    order they finished.
+    """
+    return QueueRunner([work_orders], 1, dry_run, in_process, shared).run()
+
+
 def run(
     work_orders_dir: Path,
     budget: int,
-    dry_run: bool = False
+    dry_run: bool = False,
+    workers: int = 1,
+    in_process: bool = True,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS
 ) -> int:
-    """Execute work orders with budget enforcement."""
-    work_orders = load_work_orders(work_orders_dir, budget)
+    """
+    Execute work orders with budget enforcement.
+
+    With workers == 1, orders run strictly one after another and a stop
+    condition halts the whole run. With workers > 1, each product's queue
+    runs concurrently and a stop condition only halts that product's queue.
+
+    Orders are claimed (see codemonkeys.core.work_orders), so several
+    executors can share one queue; a dry run only peeks at it.
+    """
+    queue = WorkOrderQueue(work_orders_dir)
+    if dry_run:
+        work_orders = load_work_orders(work_orders_dir, budget)
+    else:
+        work_orders = queue.claim(budget, lease_seconds=lease_seconds)
     
     if not work_orders:
         print("No pending work orders found.")
@@ -310,46 +811,48 @@ def run(
     print(f"\n🚀 Oracle Executor")
     print(f"   Budget: {budget} work orders")
     print(f"   Dry run: {dry_run}")
+    print(f"   Workers: {workers}")
     print(f"   Found: {len(work_orders)} pending work order(s)")
     
-    executed = 0
-    failed = 0
-    
-    for wo in work_orders:
-        execution_result = execute_work_order(wo, dry_run)
-        update_work_order(wo, execution_result, dry_run)
-        
-        executed += 1
-        if execution_result["status"] == "failed":
-            failed += 1
-        
-        # Check stop conditions
-        should_stop_now, reason = should_stop(wo, execution_result)
-        if should_stop_now:
-            print(f"\n⚠️  Stop condition triggered: {reason}")
-            break
+    shared = SharedResults()
+    # Orders left unrun by a stop condition go back to the queue
+    with queue.hold(work_orders):
+        queues = [work_orders] if workers <= 1 else group_by_product(work_orders)
+        results = QueueRunner(queues, workers, dry_run, in_process, shared).run()
+
+    executed = len(results)
+    failed = sum(1 for r in results if r["status"] == "failed")
+    timed_out = sum(1 for r in results if r["status"] == "timed_out")
     
     print(f"\n{'='*50}")
     print(f"✅ Execution complete")
     print(f"   Executed: {executed}")
     print(f"   Failed: {failed}")
-    print(f"   Passed: {executed - failed}")
+    print(f"   Timed out: {timed_out}")
+    print(f"   Passed: {executed - failed - timed_out}")
     
-    return 0 if failed == 0 else 1
+    return 0 if failed == 0 and timed_out == 0 else 1
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Oracle Executor")
     parser.add_argument("--budget", type=int, default=3, help="Max work orders to execute")
     parser.add_argument("--dry-run", action="store_true", help="Preview without executing")
     parser.add_argument("--work-orders-dir", type=Path, default=Path("nexus/work_orders"), help="Work orders directory")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent product queues (1 = sequential)")
+    parser.add_argument("--subprocess", action="store_true", help="Run every order in a child interpreter")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                        help="Requeue claimed orders not heartbeated for this long")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     return run(
         work_orders_dir=args.work_orders_dir,
         budget=args.budget,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        workers=args.workers,
+        in_process=not args.subprocess,
+        lease_seconds=args.lease_seconds
     )
 
 
@@ -4,11 +4,18 @@ Oracle Planner - generates bounded, prioritized work orders.
 
 Reads:
 - dash/products.json
-- dash/runs/<product_id>/last_run.json
+- dash/runs/<product_id>/last_run.json (via the fleet state index unless --no-state)
+- dash/runs/<product_id>/history.jsonl (staleness: time since last success)
 
 Outputs:
 - Work orders as JSON to nexus/work_orders/ or stdout
 
+Deduplication:
+- A planned order with the same (product_id, intent, inputs) as a pending
+  order is folded into it, bumping its priority instead of adding a new
+  file. Repo-wide intents (validate) are keyed without the product, so a
+  sweep queues one validate covering every product that asked for it.
+
 Usage:
     python scripts/oracle_planner.py --budget 3
     python scripts/oracle_planner.py --budget 3 --stdout
@@ -17,10 +24,16 @@ Usage:
 import argparse
 import json
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from codemonkeys.core import history
+from codemonkeys.core.state import StateStore
+from codemonkeys.core.work_orders import WorkOrderQueue
+
+STALE_AFTER = timedelta(days=1)
+
 
 def load_products(products_path: Path) -> list[dict]:
     """Load products from products.json."""
@@ -40,12 +53,27 @@ def load_last_run(product_id: str, runs_dir: Path) -> dict | None:
         return json.load(f)
 
 
-def calculate_priority(product: dict, last_run: dict | None) -> tuple[int, str]:
+def last_success_time(product_id: str, runs_dir: Path) -> datetime | None:
+    """Return when the product last ran successfully, from its run history."""
+    record = history.last_matching(history.history_path(runs_dir / product_id), "success")
+    return history.parse_time(record.get("ended_at")) if record else None
+
+
+def calculate_priority(
+    product: dict,
+    last_run: dict | None,
+    last_success_at: datetime | None = None,
+    now: datetime | None = None
+) -> tuple[int, str]:
     """
     Calculate priority score for a product.
     
     Returns (priority_score, recommended_intent).
     Higher score = more urgent.
+
+    A product is stale when its last successful run (from the run history,
+    else a successful last run's own timestamp) is older than STALE_AFTER, or
+    when no successful run is recorded at all.
     """
     # Default: low priority validate
     priority = 0
@@ -65,8 +93,8 @@ def calculate_priority(product: dict, last_run: dict | None) -> tuple[int, str]:
         # Governance failure = highest priority
         priority = 90
         intent = "validate"
-    elif status == "passed":
-        # Passed = low priority, just validate
+    elif status == "success":
+        # Last run succeeded = low priority, just validate
         priority = 10
         intent = "validate"
     else:
@@ -74,10 +102,17 @@ def calculate_priority(product: dict, last_run: dict | None) -> tuple[int, str]:
         priority = 50
         intent = "validate"
     
-    # Boost priority for stale runs (older than 1 day conceptually)
-    created = last_run.get("created_at", "")
-    if created:
-        # Simple staleness check (placeholder for actual time comparison)
+    # Boost priority for stale products (no success within STALE_AFTER).
+    # A successful last run counts as the last success; a product that has never
+    # recorded one is stale, however recently it failed.
+    reference = last_success_at
+    if reference is None and status == "success":
+        reference = history.parse_time(last_run.get("ended_at") or last_run.get("created_at"))
+    if reference is None:
+        stale = status != "success"
+    else:
+        stale = (now or datetime.now(timezone.utc)) - reference > STALE_AFTER
+    if stale:
         priority += 5
     
     return (priority, intent)
@@ -124,14 +159,19 @@ def plan(
     products_path: Path,
     runs_dir: Path,
     budget: int,
-    deterministic: bool = False
+    deterministic: bool = False,
+    store: StateStore | None = None
 ) -> list[dict]:
     """
     Generate bounded, prioritized work orders.
     
     Returns up to `budget` work orders, sorted by priority (descending).
+    When a state store is given, last runs are looked up in its index
+    instead of opening each product's last_run.json.
     """
     products = load_products(products_path)
+    if store is not None:
+        store.sync("runs", runs_dir)
     
     # Calculate priority for each product
     scored_products = []
@@ -139,8 +179,13 @@ def plan(
         product_id = product.get("product_id")
         if not product_id:
             continue
-        last_run = load_last_run(product_id, runs_dir)
-        priority, intent = calculate_priority(product, last_run)
+        if store is not None:
+            last_run = store.last_run(product_id, runs_dir)
+        else:
+            last_run = load_last_run(product_id, runs_dir)
+        priority, intent = calculate_priority(
+            product, last_run, last_success_time(product_id, runs_dir)
+        )
         scored_products.append({
             "product_id": product_id,
             "priority": priority,
@@ -165,43 +210,23 @@ def plan(
     return work_orders
 
 
-def find_pending_science_dossiers(science_dir: Path, dossiers_dir: Path) -> list[dict]:
-    """Find science dossiers that need conversion to design dossiers."""
-    pending = []
-
-    if not science_dir.exists():
-        return pending
+def find_pending_science_dossiers(
+    science_dir: Path,
+    dossiers_dir: Path,
+    links: dict[str, str] | None = None
+) -> list[dict]:
+    """
+    Find science dossiers that need conversion to design dossiers.
 
-    for sci_file in science_dir.glob("SCI-*.md"):
-        try:
-            import frontmatter
-            post = frontmatter.load(sci_file)
-            meta = post.metadata
-
-            # Only process validated dossiers
-            if meta.get("status") != "validated":
-                continue
-
-            dossier_id = meta.get("dossier_id", "")
-            topic = meta.get("topic", sci_file.stem)
-
-            # Check if design dossier already exists for this science input
-            # (By convention: we look for DOS-*-<topic-slug>.md)
-            topic_slug = topic.lower().replace(" ", "-")
-            existing = list(dossiers_dir.glob(f"DOS-*-{topic_slug}.md"))
-            if existing:
-                continue
-
-            pending.append({
-                "science_path": str(sci_file),
-                "dossier_id": dossier_id,
-                "topic": topic,
-                "priority": 75  # Science intake is high priority
-            })
-        except Exception:
-            continue
+    See codemonkeys.core.dossiers.pending_science; pass links (from
+    design_links) to reuse an already built reverse index.
+    """
+    from codemonkeys.core.dossiers import pending_science
 
-    return pending
+    return [
+        {**item, "priority": 75}  # Science intake is high priority
+        for item in pending_science(science_dir, dossiers_dir, links)
+    ]
 
 
 def generate_science_work_order(
@@ -288,13 +313,48 @@ def load_schedules(schedules_dir: Path, product_filter: str | None = None) -> li
     return schedules
 
 
+def schedule_work_order(
+    product_id: str,
+    job: dict,
+    rank: int,
+    deterministic: bool = False
+) -> dict[str, Any]:
+    """Generate a work order for one job of a schedule."""
+    intent = job.get("intent", "validate")
+
+    if deterministic:
+        job_id = f"wo_{product_id}_{intent}_{rank:03d}"
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        job_id = f"wo_{product_id}_{intent}_{timestamp}_{rank:03d}"
+
+    return {
+        "job_id": job_id,
+        "product_id": product_id,
+        "intent": intent,
+        "inputs": {**job.get("inputs", {}), "product_id": product_id},
+        "budget": job.get("budget", {"max_actions": 1}),
+        "stop_conditions": job.get("stop_conditions", []),
+        "priority": job.get("priority", 50),
+        "created_at": datetime.now().isoformat() + "Z",
+        "constitution_refs": ["constitution.md"],
+        "evidence_expectations": [],
+        "status": "pending"
+    }
+
+
 def plan_from_schedules(
     schedules_dir: Path,
     budget: int,
     product_filter: str | None = None,
     deterministic: bool = False
 ) -> list[dict]:
-    """Generate work orders from schedule definitions."""
+    """
+    Generate work orders from schedule definitions.
+
+    This is a one-shot plan of every job regardless of cadence; the
+    cadence-aware daemon is `codemonkeys fleet scheduler`.
+    """
     schedules = load_schedules(schedules_dir, product_filter)
     work_orders = []
     rank = 0
@@ -308,31 +368,7 @@ def plan_from_schedules(
                 break
 
             rank += 1
-            intent = job.get("intent", "validate")
-            priority = job.get("priority", 50)
-            job_budget = job.get("budget", {"max_actions": 1})
-            stop_conditions = job.get("stop_conditions", [])
-
-            if deterministic:
-                job_id = f"wo_{product_id}_{intent}_{rank:03d}"
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                job_id = f"wo_{product_id}_{intent}_{timestamp}_{rank:03d}"
-
-            wo = {
-                "job_id": job_id,
-                "product_id": product_id,
-                "intent": intent,
-                "inputs": {"product_id": product_id},
-                "budget": job_budget,
-                "stop_conditions": stop_conditions,
-                "priority": priority,
-                "created_at": datetime.now().isoformat() + "Z",
-                "constitution_refs": ["constitution.md"],
-                "evidence_expectations": [],
-                "status": "pending"
-            }
-            work_orders.append(wo)
+            work_orders.append(schedule_work_order(product_id, job, rank, deterministic))
 
         if rank >= budget:
             break
@@ -342,7 +378,105 @@ def plan_from_schedules(
     return work_orders[:budget]
 
 
-def main():
+# Intents whose work does not depend on the product (e.g. silverback --all):
+# one order per sweep covers every product that asked for it.
+REPO_WIDE_INTENTS = {"validate"}
+
+# Priority added to a pending order each time a duplicate is folded into it
+COALESCE_PRIORITY_BUMP = 1
+
+# Most a pending order can be bumped above the highest priority it was
+# planned at, so repeated sweeps cannot lift a routine order (50) into the
+# failed-test (80) or governance (90) bands
+COALESCE_MAX_BUMP = 5
+
+
+def dedup_key(wo: dict) -> tuple[str, str, str]:
+    """Identity of a work order for deduplication: (product_id, intent, inputs)."""
+    intent = wo.get("intent", "")
+    inputs = dict(wo.get("inputs", {}))
+    if intent in REPO_WIDE_INTENTS:
+        inputs.pop("product_id", None)
+        return ("*", intent, json.dumps(inputs, sort_keys=True))
+    return (wo.get("product_id", ""), intent, json.dumps(inputs, sort_keys=True))
+
+
+def _merge_into(survivor: dict, duplicate: dict):
+    """Fold a duplicate order into the surviving one."""
+    planned = max(
+        survivor.get("planned_priority", survivor.get("priority", 0)),
+        duplicate.get("planned_priority", duplicate.get("priority", 0)),
+    )
+    survivor["planned_priority"] = planned
+    survivor["priority"] = min(
+        max(survivor.get("priority", 0), duplicate.get("priority", 0)) + COALESCE_PRIORITY_BUMP,
+        planned + COALESCE_MAX_BUMP,
+    )
+    survivor["coalesced_count"] = (
+        survivor.get("coalesced_count", 0) + 1 + duplicate.get("coalesced_count", 0)
+    )
+    if survivor.get("intent") in REPO_WIDE_INTENTS:
+        products = set(survivor.get("products", [survivor.get("product_id")]))
+        products |= set(duplicate.get("products", [duplicate.get("product_id")]))
+        survivor["scope"] = "repo"
+        survivor["products"] = sorted(p for p in products if p)
+
+
+def coalesce_work_orders(
+    new_orders: list[dict],
+    pending: list[tuple[str, dict]] | None = None
+) -> tuple[list[dict], list[tuple[str, dict]]]:
+    """
+    Deduplicate work orders against each other and the pending queue.
+
+    Orders with the same dedup_key are folded into one surviving order whose
+    priority is bumped, by at most COALESCE_MAX_BUMP over its planned_priority. Pending duplicates already on disk are marked
+    status "coalesced" with coalesced_into pointing at the survivor.
+
+    Args:
+        new_orders: Freshly planned orders
+        pending: (path, order) pairs of pending orders on disk
+
+    Returns:
+        tuple: (new orders still to write, (path, order) pairs to rewrite)
+    """
+    survivors: dict[tuple, tuple[str | None, dict]] = {}
+    changed: dict[str, dict] = {}
+
+    ordered = sorted(pending or [], key=lambda item: (-item[1].get("priority", 0), item[1].get("job_id", "")))
+    for path, wo in ordered:
+        key = dedup_key(wo)
+        if key not in survivors:
+            survivors[key] = (path, wo)
+            continue
+        survivor_path, survivor = survivors[key]
+        _merge_into(survivor, wo)
+        wo["status"] = "coalesced"
+        wo["coalesced_into"] = survivor["job_id"]
+        changed[path] = wo
+        changed[survivor_path] = survivor
+
+    created = []
+    for wo in new_orders:
+        key = dedup_key(wo)
+        if key not in survivors:
+            survivors[key] = (None, wo)
+            created.append(wo)
+            continue
+        survivor_path, survivor = survivors[key]
+        _merge_into(survivor, wo)
+        if survivor_path is not None:
+            changed[survivor_path] = survivor
+
+    return created, list(changed.items())
+
+
+def load_pending_work_orders(work_orders_dir: Path) -> list[tuple[str, dict]]:
+    """Return (path, order) pairs of pending work orders on disk."""
+    return WorkOrderQueue(work_orders_dir).pending()
+
+
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Oracle Planner")
     parser.add_argument("--budget", type=int, default=3, help="Max work orders to generate")
     parser.add_argument("--stdout", action="store_true", help="Output to stdout instead of files")
@@ -353,8 +487,9 @@ def main():
     parser.add_argument("--deterministic", action="store_true", help="Use deterministic job IDs")
     parser.add_argument("--from-schedules", action="store_true", help="Plan from schedule files")
     parser.add_argument("--product", type=str, default=None, help="Filter to single product")
+    parser.add_argument("--no-state", action="store_true", help="Read JSON files directly, bypassing the state index")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.from_schedules:
         work_orders = plan_from_schedules(
@@ -364,26 +499,40 @@ def main():
             deterministic=args.deterministic
         )
     else:
-        work_orders = plan(
-            products_path=args.products,
-            runs_dir=args.runs_dir,
-            budget=args.budget,
-            deterministic=args.deterministic
-        )
+        store = None if args.no_state else StateStore()
+        try:
+            work_orders = plan(
+                products_path=args.products,
+                runs_dir=args.runs_dir,
+                budget=args.budget,
+                deterministic=args.deterministic,
+                store=store
+            )
+        finally:
+            if store is not None:
+                store.close()
 
     if not work_orders:
         print("No work orders generated.", file=sys.stderr)
         return 0
 
     if args.stdout:
+        work_orders, _ = coalesce_work_orders(work_orders)
         print(json.dumps(work_orders, indent=2))
     else:
-        args.output_dir.mkdir(parents=True, exist_ok=True)
+        pending = load_pending_work_orders(args.output_dir)
+        work_orders, updated = coalesce_work_orders(work_orders, pending)
+        queue = WorkOrderQueue(args.output_dir)
+        for filepath, wo in updated:
+            queue.write(filepath, wo)
+            if wo.get("status") == "coalesced":
+                print(f"Coalesced: {filepath} -> {wo['coalesced_into']}")
+            else:
+                print(f"Bumped: {filepath} (priority {wo['priority']})")
         for wo in work_orders:
             filename = f"{wo['job_id']}.json"
             filepath = args.output_dir / filename
-            with open(filepath, "w") as f:
-                json.dump(wo, f, indent=2)
+            queue.write(filepath, wo)
             print(f"Created: {filepath}")
 
     print(f"\n✅ Generated {len(work_orders)} work order(s)", file=sys.stderr)
@@ -10,6 +10,16 @@ Usage:
     python scripts/silverback_validate.py --run-artifact dash/runs/codemonkeys-dash/last_run.json
     python scripts/silverback_validate.py --nexus  # Validate Nexus inbox/outbox
     python scripts/silverback_validate.py --all
+    python scripts/silverback_validate.py --all --no-cache
+    python scripts/silverback_validate.py --all --jobs 8
+
+Caching:
+    Results for specs, run artifacts and Nexus files are cached in
+    .codemonkeys/cache/silverback.json, keyed by the file's content hash,
+    the schema it is checked against and a digest of this validator, the
+    schema and dossier helpers it uses and every schema file.
+    Unchanged targets replay their cached messages instead of re-running.
+    Specs that raise a Nexus escalation are always re-run.
 
 Exit codes:
     0: All validations passed
@@ -17,13 +27,20 @@ Exit codes:
     2: Internal error
 """
 import argparse
+import hashlib
 import json
 import re
 import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, NamedTuple
+
+from codemonkeys.core import schemas
+from codemonkeys.core.cache import ContentHashCache, file_digest, shared_cache
 
 try:
-    from jsonschema import validate, ValidationError
+    from jsonschema import ValidationError
 
     HAS_JSONSCHEMA = True
 except ImportError:
@@ -89,23 +106,76 @@ DASH_SCHEMA_DIR = Path("dash/schemas")
 NEXUS_SCHEMA_DIR = Path("nexus/schemas")
 NEXUS_INBOX_DIR = Path("nexus/inbox")
 NEXUS_OUTBOX_DIR = Path("nexus/outbox")
+CACHE_PATH = Path(".codemonkeys/cache/silverback.json")
+
+# Code the validation rules depend on, besides the schema files
+VALIDATOR_SOURCES = (
+    Path(__file__),
+    Path(schemas.__file__),
+    Path(schemas.__file__).with_name("dossiers.py"),
+)
+
+
+def validator_digest() -> str:
+    """
+    Digest everything a cached result depends on besides its target: the
+    validator sources, every schema file in the registry (schemas may $ref
+    one another) and jsonschema availability.
+    """
+    files = [
+        *VALIDATOR_SOURCES,
+        *sorted(p for d in schemas.SCHEMA_DIRS if d.exists() for p in d.glob("*.schema.json")),
+    ]
+    h = hashlib.sha256()
+    for path in files:
+        h.update(f"{path.name}:{file_digest(path)}\n".encode())
+    return f"{h.hexdigest()}:{HAS_JSONSCHEMA}"
+
+
+# Any change to it invalidates cached results. Recomputed by every main()
+# run, so a long-lived process (the daemon) sees edited rules and schemas.
+VALIDATOR_DIGEST = validator_digest()
 
 
 class ValidationResult:
-    def __init__(self):
+    def __init__(self, echo=True):
+        # echo=False collects messages without printing (parallel workers)
+        self.echo = echo
         self.errors = []
         self.warnings = []
+        # Every message in order, as (level, msg), so results can be replayed
+        self.messages = []
+        # Paths consulted while validating -> cache tracking mode
+        self.dependencies = {}
+        # Set when validating had a side effect (a Nexus escalation), so
+        # the result must not be replayed from cache
+        self.escalated = False
 
     def error(self, msg):
         self.errors.append(msg)
-        print(f"[ERROR] {msg}")
+        self.messages.append(("error", msg))
+        if self.echo:
+            print(f"[ERROR] {msg}")
 
     def warning(self, msg):
         self.warnings.append(msg)
-        print(f"[WARN] {msg}")
+        self.messages.append(("warning", msg))
+        if self.echo:
+            print(f"[WARN] {msg}")
 
     def ok(self, msg):
-        print(f"[OK] {msg}")
+        self.messages.append(("ok", msg))
+        if self.echo:
+            print(f"[OK] {msg}")
+
+    def depends_on(self, path, mode="content"):
+        """Record a path whose state affects the current target's result."""
+        self.dependencies[str(path)] = mode
+
+    def replay(self, messages):
+        """Re-emit previously recorded messages."""
+        for level, msg in messages:
+            getattr(self, level)(msg)
 
     @property
     def passed(self):
@@ -131,17 +201,18 @@ def validate_spec(spec_path: Path, result: ValidationResult):
         dossier_id = dossier_match.group(1)
         # Try to find the dossier file (fuzzy match)
         dossier_files = list(Path("docs/dossiers").glob(f"{dossier_id}*.md"))
+        result.depends_on(f"docs/dossiers/{dossier_id}*.md", "glob")
 
         if dossier_files:
             dossier_path = dossier_files[0]
+            result.depends_on(dossier_path)
             result.ok(f"Dossier reference found: {dossier_id} -> {dossier_path}")
 
             # Validate Dossier Content & Governance
             try:
-                import frontmatter
+                from codemonkeys.core.dossiers import load_metadata
 
-                post = frontmatter.load(dossier_path)
-                meta = post.metadata
+                meta = load_metadata(dossier_path)
 
                 # Check for Constitution Refs
                 refs = meta.get("constitution_refs", [])
@@ -161,6 +232,8 @@ def validate_spec(spec_path: Path, result: ValidationResult):
                     )
                 else:
                     # Check if referenced docs exist
+                    for r in refs:
+                        result.depends_on(r, "exists")
                     missing_refs = [r for r in refs if not Path(r).exists()]
                     if missing_refs:
                         result.error(
@@ -216,12 +289,15 @@ def _escalate_to_nexus_silverback(result, context, reason):
     """Create a Nexus request for clarification (internal helper)."""
     from datetime import datetime
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    req_file = Path(f"nexus/inbox/req_{timestamp}_governance_escalation.json")
+    result.escalated = True
+    # Several escalations can land in the same second (one per failing
+    # spec, or parallel workers), so each request gets its own suffix
+    request_id = f"req_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    req_file = Path(f"nexus/inbox/{request_id}_governance_escalation.json")
 
     payload = {
         "schema_version": "0.1",
-        "request_id": f"req_{timestamp}",
+        "request_id": request_id,
         "type": "clarification_required",
         "source": "silverback_validator",
         "created_at": datetime.now().isoformat(),
@@ -234,7 +310,8 @@ def _escalate_to_nexus_silverback(result, context, reason):
     }
 
     try:
-        req_file.write_text(json.dumps(payload, indent=2))
+        with open(req_file, "x") as f:
+            f.write(json.dumps(payload, indent=2))
         result.warning(f"Nexus escalation created: {req_file}")
     except Exception as e:
         result.error(f"Failed to create Nexus escalation: {e}")
@@ -257,8 +334,7 @@ def validate_run_artifact(artifact_path: Path, result: ValidationResult):
     schema_path = DASH_SCHEMA_DIR / "last_run.schema.json"
     if HAS_JSONSCHEMA and schema_path.exists():
         try:
-            schema = json.loads(schema_path.read_text())
-            validate(instance=data, schema=schema)
+            schemas.validate(data, schema_path)
             result.ok("Schema validation passed")
         except ValidationError as e:
             result.error(f"Schema validation failed: {e.message}")
@@ -274,6 +350,7 @@ def validate_run_artifact(artifact_path: Path, result: ValidationResult):
         base_dir = Path("dash")
         product_id = data.get("product_id", "")
         product_status = _get_product_status(product_id)
+        result.depends_on("dash/products.json")
 
         # Evidence policy: tiered severity based on product status
         # - active products: missing evidence = ERROR (fails CI)
@@ -282,6 +359,7 @@ def validate_run_artifact(artifact_path: Path, result: ValidationResult):
 
         for ep in evidence_paths:
             full_path = base_dir / ep
+            result.depends_on(full_path, "exists")
             if full_path.exists():
                 result.ok(f"Evidence exists: {ep}")
             else:
@@ -348,8 +426,7 @@ def validate_nexus_artifact(
     # Schema validation
     if HAS_JSONSCHEMA and schema_path.exists():
         try:
-            schema = json.loads(schema_path.read_text())
-            validate(instance=data, schema=schema)
+            schemas.validate(data, schema_path)
             result.ok(f"Schema validation passed: {artifact_path.name}")
         except ValidationError as e:
             result.error(
@@ -372,74 +449,181 @@ def validate_nexus_artifact(
     return data
 
 
-def validate_nexus_inbox(result: ValidationResult):
-    """Validate all Nexus inbox artifacts."""
-    if not NEXUS_INBOX_DIR.exists():
-        result.warning("Nexus inbox directory not found")
+def validate_cached(
+    target: Path,
+    result: ValidationResult,
+    cache: ContentHashCache | None,
+    check,
+    schema_path: Path | None = None,
+):
+    """
+    Run check(result) for target, or replay its cached messages.
+
+    The cache key combines the target's content hash, the schema it is
+    validated against and VALIDATOR_DIGEST. Targets that raised a Nexus
+    escalation are not cached, so every run escalates them again instead
+    of replaying a message about a file it never wrote.
+    """
+    if cache is None:
+        check(result)
         return
 
-    schema_path = NEXUS_SCHEMA_DIR / "request.schema.json"
-    files = list(NEXUS_INBOX_DIR.glob("*.json"))
-
-    if not files:
-        result.warning("No inbox files found")
+    key = ":".join([
+        file_digest(target) or "missing",
+        (file_digest(schema_path) or "no-schema") if schema_path else "",
+        VALIDATOR_DIGEST,
+    ])
+    cached = cache.get(str(target), key)
+    if cached is not None:
+        result.replay(cached)
         return
 
-    for filepath in files:
-        validate_nexus_artifact(filepath, schema_path, "inbox", result)
+    start = len(result.messages)
+    result.dependencies = {}
+    result.escalated = False
+    check(result)
+    if not result.escalated:
+        cache.put(str(target), key, result.messages[start:], result.dependencies)
 
 
-def validate_nexus_outbox(result: ValidationResult):
-    """Validate all Nexus outbox artifacts."""
-    if not NEXUS_OUTBOX_DIR.exists():
-        result.warning("Nexus outbox directory not found")
+class ValidationTask(NamedTuple):
+    """One unit of validation work, emitted in order after an optional header."""
+
+    header: str | None
+    target: Path | None
+    check: Callable[[ValidationResult], object]
+    schema_path: Path | None = None
+
+
+def run_task(task: ValidationTask, result: ValidationResult, cache: ContentHashCache | None = None):
+    """Run a task's check against result (through the cache if it has a target)."""
+    if task.target is None:
+        task.check(result)
+    else:
+        validate_cached(task.target, result, cache, task.check, task.schema_path)
+
+
+def run_tasks(
+    tasks: list[ValidationTask],
+    result: ValidationResult,
+    cache: ContentHashCache | None = None,
+    jobs: int = 1,
+):
+    """
+    Run validation tasks, optionally on a worker pool.
+
+    With jobs > 1 each task validates into its own silent result; results
+    are then replayed into `result` in task order, so output and message
+    order are identical to a sequential run.
+    """
+    if jobs <= 1:
+        for task in tasks:
+            if task.header:
+                print(task.header)
+            run_task(task, result, cache)
         return
 
-    schema_path = NEXUS_SCHEMA_DIR / "decision.schema.json"
-    files = list(NEXUS_OUTBOX_DIR.glob("*.json"))
+    def run_buffered(task: ValidationTask) -> ValidationResult:
+        buffered = ValidationResult(echo=False)
+        run_task(task, buffered, cache)
+        return buffered
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for task, buffered in zip(tasks, pool.map(run_buffered, tasks)):
+            if task.header:
+                print(task.header)
+            result.replay(buffered.messages)
+
+
+def nexus_tasks(directory: Path, schema_path: Path, artifact_type: str) -> list[ValidationTask]:
+    """Build tasks validating every Nexus artifact in an inbox/outbox directory."""
+    if not directory.exists():
+        return [ValidationTask(None, None, lambda r: r.warning(f"Nexus {artifact_type} directory not found"))]
 
+    files = sorted(directory.glob("*.json"))
     if not files:
-        result.warning("No outbox files found")
-        return
+        return [ValidationTask(None, None, lambda r: r.warning(f"No {artifact_type} files found"))]
+
+    return [
+        ValidationTask(
+            None,
+            filepath,
+            lambda r, fp=filepath: validate_nexus_artifact(fp, schema_path, artifact_type, r),
+            schema_path,
+        )
+        for filepath in files
+    ]
 
-    for filepath in files:
-        validate_nexus_artifact(filepath, schema_path, "outbox", result)
 
+def validate_nexus_inbox(result: ValidationResult, cache: ContentHashCache | None = None):
+    """Validate all Nexus inbox artifacts."""
+    tasks = nexus_tasks(NEXUS_INBOX_DIR, NEXUS_SCHEMA_DIR / "request.schema.json", "inbox")
+    run_tasks(tasks, result, cache)
 
-def validate_all(result: ValidationResult):
-    """Run all validations for the current project."""
-    print("\n=== Silverback Validation (Bootstrap) ===\n")
+
+def validate_nexus_outbox(result: ValidationResult, cache: ContentHashCache | None = None):
+    """Validate all Nexus outbox artifacts."""
+    tasks = nexus_tasks(NEXUS_OUTBOX_DIR, NEXUS_SCHEMA_DIR / "decision.schema.json", "outbox")
+    run_tasks(tasks, result, cache)
+
+
+def artifact_tasks() -> list[ValidationTask]:
+    """Build the ordered spec and run artifact tasks of a full validation run."""
+    tasks = []
 
     # Validate specs
     specs_dir = Path("specs")
     if specs_dir.exists():
-        for spec_dir in specs_dir.iterdir():
+        for spec_dir in sorted(specs_dir.iterdir()):
             if spec_dir.is_dir():
                 spec_file = spec_dir / "spec.md"
                 if spec_file.exists():
-                    print(f"\n--- Validating spec: {spec_file} ---")
-                    validate_spec(spec_file, result)
+                    tasks.append(ValidationTask(
+                        f"\n--- Validating spec: {spec_file} ---",
+                        spec_file,
+                        lambda r, sf=spec_file: validate_spec(sf, r),
+                    ))
 
     # Validate run artifacts
     runs_dir = Path("dash/runs")
     if runs_dir.exists():
-        for product_dir in runs_dir.iterdir():
+        for product_dir in sorted(runs_dir.iterdir()):
             if product_dir.is_dir():
                 last_run = product_dir / "last_run.json"
                 if last_run.exists():
-                    print(f"\n--- Validating artifact: {last_run} ---")
-                    validate_run_artifact(last_run, result)
+                    tasks.append(ValidationTask(
+                        f"\n--- Validating artifact: {last_run} ---",
+                        last_run,
+                        lambda r, lr=last_run: validate_run_artifact(lr, r),
+                        DASH_SCHEMA_DIR / "last_run.schema.json",
+                    ))
+
+    return tasks
 
-    # Validate Nexus inbox
-    print("\n--- Validating Nexus inbox ---")
-    validate_nexus_inbox(result)
 
-    # Validate Nexus outbox
-    print("\n--- Validating Nexus outbox ---")
-    validate_nexus_outbox(result)
+def nexus_inbox_outbox_tasks() -> list[ValidationTask]:
+    """Build the ordered Nexus inbox and outbox tasks, listing the files now."""
+    tasks = [ValidationTask("\n--- Validating Nexus inbox ---", None, lambda r: None)]
+    tasks += nexus_tasks(NEXUS_INBOX_DIR, NEXUS_SCHEMA_DIR / "request.schema.json", "inbox")
+    tasks += [ValidationTask("\n--- Validating Nexus outbox ---", None, lambda r: None)]
+    tasks += nexus_tasks(NEXUS_OUTBOX_DIR, NEXUS_SCHEMA_DIR / "decision.schema.json", "outbox")
+    return tasks
 
 
-def main():
+def validate_all(
+    result: ValidationResult,
+    cache: ContentHashCache | None = None,
+    jobs: int = 1,
+):
+    """Run all validations for the current project."""
+    print("\n=== Silverback Validation (Bootstrap) ===\n")
+    run_tasks(artifact_tasks(), result, cache, jobs)
+    # Listed only now: validating a spec can escalate a new request into
+    # the Nexus inbox, which this run must validate too
+    run_tasks(nexus_inbox_outbox_tasks(), result, cache, jobs)
+
+
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Silverback Validator")
     parser.add_argument("--spec", help="Validate a specific spec file")
     parser.add_argument("--run-artifact", help="Validate a specific run artifact")
@@ -449,26 +633,45 @@ def main():
     parser.add_argument(
         "--all", action="store_true", help="Validate all specs and artifacts"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore and do not update the result cache"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Validate up to N targets concurrently"
+    )
+    args = parser.parse_args(argv)
 
+    global VALIDATOR_DIGEST
+    VALIDATOR_DIGEST = validator_digest()
     result = ValidationResult()
+    cache = None if args.no_cache else shared_cache(CACHE_PATH)
 
     if args.spec:
         print(f"\n--- Validating spec: {args.spec} ---")
-        validate_spec(Path(args.spec), result)
+        spec_path = Path(args.spec)
+        validate_cached(spec_path, result, cache, lambda r: validate_spec(spec_path, r))
     elif args.run_artifact:
         print(f"\n--- Validating artifact: {args.run_artifact} ---")
-        validate_run_artifact(Path(args.run_artifact), result)
+        artifact_path = Path(args.run_artifact)
+        validate_cached(
+            artifact_path, result, cache,
+            lambda r: validate_run_artifact(artifact_path, r),
+            DASH_SCHEMA_DIR / "last_run.schema.json",
+        )
     elif args.nexus:
         print("\n=== Silverback Validation (Nexus) ===\n")
-        print("--- Validating Nexus inbox ---")
-        validate_nexus_inbox(result)
-        print("\n--- Validating Nexus outbox ---")
-        validate_nexus_outbox(result)
+        tasks = [ValidationTask("--- Validating Nexus inbox ---", None, lambda r: None)]
+        tasks += nexus_tasks(NEXUS_INBOX_DIR, NEXUS_SCHEMA_DIR / "request.schema.json", "inbox")
+        tasks += [ValidationTask("\n--- Validating Nexus outbox ---", None, lambda r: None)]
+        tasks += nexus_tasks(NEXUS_OUTBOX_DIR, NEXUS_SCHEMA_DIR / "decision.schema.json", "outbox")
+        run_tasks(tasks, result, cache, args.jobs)
     elif args.all:
-        validate_all(result)
+        validate_all(result, cache, args.jobs)
     else:
-        validate_all(result)
+        validate_all(result, cache, args.jobs)
+
+    if cache is not None:
+        cache.save()
 
     # Summary
     print("\n=== Summary ===")
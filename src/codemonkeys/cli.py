@@ -1,31 +1,74 @@
+"""Code Monkeys CLI entry point.
+
+Agents call the CLI thousands of times a day, so startup time matters.
+Command modules are imported only when their command is invoked (or its
+own --help is shown): `codemonkeys --help` lists commands from the short
+help registered here and imports none of them, and `codemonkeys fleet
+list` never imports jsonschema for the dossier commands.
+
+With a daemon running (`codemonkeys daemon start`), the console entry
+point (codemonkeys.client) forwards the quick read-mostly commands to it
+before this module is even imported; see codemonkeys.core.daemon.
+
+Track startup cost with `python scripts/bench_cli_startup.py`.
+"""
+import importlib
+
 import click
-from rich.console import Console
-from codemonkeys.commands.dash import dash
-from codemonkeys.commands.run import run
-from codemonkeys.commands.silverback import silverback
-from codemonkeys.commands.nexus import nexus
-from codemonkeys.commands.fleet import fleet
-from codemonkeys.commands.dossier import dossier
-from codemonkeys.commands.ship import ship
-from codemonkeys.commands.oracle import oracle
-from codemonkeys.commands.doctor import doctor
-
-console = Console()
-
-@click.group()
+
+# name -> ("module:attribute", short help for `codemonkeys --help`)
+COMMANDS = {
+    "daemon": ("codemonkeys.commands.daemon:daemon", "Daemon - keep a warm process that serves repeated CLI calls."),
+    "dash": ("codemonkeys.commands.dash:dash", "Dash - portfolio dashboard and index management."),
+    "doctor": ("codemonkeys.commands.doctor:doctor", "Check environment health for Code Monkeys development."),
+    "dossier": ("codemonkeys.commands.dossier:dossier", "Manage Design Dossiers."),
+    "fleet": ("codemonkeys.commands.fleet:fleet", "Manage the Product Fleet."),
+    "nexus": ("codemonkeys.commands.nexus:nexus", "Nexus Executive operations."),
+    "oracle": ("codemonkeys.commands.oracle:oracle", "Oracle - work order planning and execution."),
+    "run": ("codemonkeys.commands.run:run", "Run tests and generate artifact for a product."),
+    "ship": ("codemonkeys.commands.ship:ship", "Ship a released version (Tag & Push)."),
+    "silverback": ("codemonkeys.commands.silverback:silverback", "Run Silverback validation."),
+    "state": ("codemonkeys.commands.state:state", "State - SQLite index of runs, products and Nexus artifacts."),
+}
+
+
+class LazyGroup(click.Group):
+    """A click group that imports each subcommand's module on first use."""
+
+    def __init__(self, *args, lazy_subcommands: dict[str, tuple[str, str]] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx, name):
+        if name not in self.commands and name in self.lazy_subcommands:
+            module_name, attribute = self.lazy_subcommands[name][0].split(":")
+            self.add_command(getattr(importlib.import_module(module_name), attribute), name)
+        return super().get_command(ctx, name)
+
+    def format_commands(self, ctx, formatter):
+        """List commands without importing the ones not loaded yet."""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            cmd = self.commands.get(name)
+            if cmd is None:
+                rows.append((name, self.lazy_subcommands[name][1]))
+            elif not cmd.hidden:
+                rows.append((name, cmd.get_short_help_str(limit)))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=COMMANDS)
 def cli():
     """Code Monkeys Factory Control Plane."""
     pass
 
-cli.add_command(dash)
-cli.add_command(run)
-cli.add_command(silverback)
-cli.add_command(nexus)
-cli.add_command(fleet)
-cli.add_command(dossier)
-cli.add_command(ship)
-cli.add_command(oracle)
-cli.add_command(doctor)
-
 if __name__ == "__main__":
     cli()
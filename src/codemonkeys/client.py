@@ -0,0 +1,21 @@
+"""Console entry point - forward to a running daemon, else run the CLI.
+
+Only the daemon client is imported before deciding, so a forwarded call
+never imports click, rich or any command module.
+"""
+import sys
+
+from codemonkeys.core.daemon import forward
+
+
+def main():
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+    from codemonkeys.cli import cli
+
+    cli()
+
+
+if __name__ == "__main__":
+    main()
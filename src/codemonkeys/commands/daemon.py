@@ -0,0 +1,100 @@
+"""Daemon commands - a warm codemonkeys process for repeated CLI calls."""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+from rich.console import Console
+
+from codemonkeys.core.daemon import DEFAULT_LOG_PATH, FORWARDED_COMMANDS, Daemon, request, socket_path
+
+console = Console()
+
+# Seconds `start --detach` and `stop` wait for the daemon
+START_TIMEOUT = 10.0
+
+socket_option = click.option(
+    '--socket', 'path', type=click.Path(path_type=Path), default=None,
+    help='Socket path (default: .codemonkeys/daemon.sock or $CODEMONKEYS_DAEMON_SOCKET)',
+)
+
+
+@click.group()
+def daemon():
+    """Daemon - keep a warm process that serves repeated CLI calls."""
+    pass
+
+
+@daemon.command()
+@socket_option
+@click.option('--detach', is_flag=True, help='Run in the background (logs to .codemonkeys/daemon.log)')
+def start(path, detach):
+    """Start the daemon for this working tree (foreground unless --detach)."""
+    path = path or socket_path()
+    if request({"op": "status"}, path) is not None:
+        console.print(f"[yellow]Daemon already running on {path}[/yellow]")
+        sys.exit(1)
+
+    if detach:
+        DEFAULT_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(DEFAULT_LOG_PATH, "ab") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "codemonkeys.cli", "daemon", "start", "--socket", str(path)],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            status = request({"op": "status"}, path)
+            if status is not None:
+                console.print(f"[green]✓ Daemon started[/green] (pid {status['pid']}, {path})")
+                return
+            time.sleep(0.05)
+        console.print(f"[bold red]Daemon did not start; see {DEFAULT_LOG_PATH}[/bold red]")
+        sys.exit(1)
+
+    server = Daemon(path)
+    server.warm()
+    forwarded = ", ".join(" ".join(p) for p in FORWARDED_COMMANDS)
+    console.print(f"[bold blue]Code Monkeys Factory :: Daemon[/bold blue] listening on {path}")
+    console.print(f"Forwarding: {forwarded}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        sys.exit(1)
+    console.print("[bold yellow]Daemon stopped.[/bold yellow]")
+
+
+@daemon.command()
+@socket_option
+def stop(path):
+    """Stop the running daemon."""
+    path = path or socket_path()
+    if request({"op": "stop"}, path) is None:
+        console.print("[yellow]No daemon running[/yellow]")
+        sys.exit(1)
+    deadline = time.monotonic() + START_TIMEOUT
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    console.print("[green]✓ Daemon stopped[/green]")
+
+
+@daemon.command()
+@socket_option
+def status(path):
+    """Show whether a daemon is serving this working tree."""
+    info = request({"op": "status"}, path)
+    if info is None:
+        console.print("Daemon: [yellow]not running[/yellow] (commands run in-process)")
+        sys.exit(1)
+    console.print(f"Daemon: [green]running[/green] (pid {info['pid']})")
+    console.print(f"  Root: {info['root']}")
+    console.print(f"  Socket: {info['socket']}")
+    console.print(f"  Started: {info['started_at']}")
+    console.print(f"  Requests served: {info['requests']}")
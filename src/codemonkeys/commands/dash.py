@@ -6,6 +6,8 @@ from pathlib import Path
 import click
 from rich.console import Console
 
+from codemonkeys.core.scripts import load_script
+
 console = Console()
 
 
@@ -17,15 +19,23 @@ def dash():
 
 @dash.command()
 @click.option('--port', default=8080, help='Port to serve on')
-def serve(port):
-    """Serve the Dash interface."""
+@click.option('--host', default='', help='Interface to bind (default: all)')
+@click.option('--static', 'static_only', is_flag=True, help='Use the stdlib http.server (no /api endpoints)')
+def serve(port, host, static_only):
+    """Serve the Dash interface and its /api data endpoints."""
     console.print(
         f"[bold blue]Code Monkeys Factory :: Dash[/bold blue]"
     )
     console.print(f"Available at http://localhost:{port}/dash/index.html")
 
     try:
-        subprocess.run([sys.executable, "-m", "http.server", str(port)], check=False)
+        if static_only:
+            subprocess.run([sys.executable, "-m", "http.server", str(port)], check=False)
+        else:
+            import asyncio
+            from codemonkeys.core.dash_server import DashServer
+
+            asyncio.run(DashServer(Path(".")).serve_forever(host, port))
     except KeyboardInterrupt:
         console.print("\n[bold yellow]Dash server stopped.[/bold yellow]")
     except Exception as e:
@@ -33,37 +43,79 @@ def serve(port):
         sys.exit(1)
 
 
+# Dash indices: name -> script in scripts/ exposing index(output) -> Index
+# (see codemonkeys.core.indexer) and a main(argv) accepting --output/--full
+INDEXERS = {
+    "science": "generate_science_index",
+}
+
+
+def _report(results):
+    for result in results:
+        label = f"{result.name.capitalize()} index"
+        if result.written:
+            console.print(f"[green]✓ {label} generated[/green] ({result.changed} of {result.entries} entries changed)")
+        else:
+            console.print(f"[green]✓ {label} up to date[/green] ({result.entries} entries)")
+
+
 @dash.command()
 @click.option('--all', 'refresh_all', is_flag=True, default=True, help='Refresh all indices')
 @click.option('--science', is_flag=True, help='Only refresh science index')
 @click.option('--output', type=click.Path(), default=None, help='Alternate output path')
-def refresh(refresh_all, science, output):
-    """Regenerate Dash index artifacts."""
+@click.option('--subprocess', 'use_subprocess', is_flag=True, help='Run indexers in a separate interpreter')
+@click.option('--full', is_flag=True, help='Rebuild every entry, ignoring the refresh manifest')
+@click.option('--watch', is_flag=True, help='Keep running and refresh as inputs change')
+def refresh(refresh_all, science, output, use_subprocess, full, watch):
+    """Regenerate Dash index artifacts (incrementally)."""
     console.print("[bold blue]Code Monkeys Factory :: Dash Refresh[/bold blue]")
 
+    names = ["science"] if science else list(INDEXERS)
     failed = False
 
-    # Science index
-    if refresh_all or science:
-        console.print("\n[bold]Generating science_index.json...[/bold]")
-        cmd = [sys.executable, "scripts/generate_science_index.py"]
+    if use_subprocess:
+        if watch:
+            raise click.UsageError("--watch refreshes in-process; drop --subprocess")
+        for name in names:
+            console.print(f"\n[bold]Refreshing {name} index...[/bold]")
+            args = (["--output", output] if output else []) + (["--full"] if full else [])
+            cmd = [sys.executable, f"scripts/{INDEXERS[name]}.py", *args]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                console.print(f"[red]✗ {name.capitalize()} index generation failed[/red]")
+                console.print(result.stderr)
+                failed = True
+            else:
+                console.print(f"[green]✓ {name.capitalize()} index generated[/green]")
+                for line in result.stdout.strip().split('\n'):
+                    if line:
+                        console.print(f"  {line}")
+    else:
+        from codemonkeys.core import indexer
+
+        indices = [
+            load_script(INDEXERS[name]).index(Path(output) if output else None)
+            for name in names
+        ]
+        manifest = indexer.Manifest()
+        try:
+            _report(indexer.refresh(indices, manifest, force=full))
+        except Exception as e:
+            console.print(f"[red]✗ Refresh failed:[/red] {type(e).__name__}: {e}")
+            failed = True
+
+        if watch and not failed:
+            console.print("\n[bold]Watching for changes (Ctrl-C to stop)...[/bold]")
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+            def on_refresh(results, changed):
+                console.print(f"\n[dim]{len(changed)} file(s) changed[/dim]")
+                _report(results)
 
-        if result.returncode != 0:
-            console.print(f"[red]✗ Science index generation failed[/red]")
-            console.print(result.stderr)
-            failed = True
-        else:
-            console.print(f"[green]✓ Science index generated[/green]")
-            # Show output
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    console.print(f"  {line}")
-
-    # Future: Add more indexers here
-    # if refresh_all or other_flag:
-    #     run_other_indexer()
+            try:
+                indexer.watch(indices, manifest, on_refresh)
+            except KeyboardInterrupt:
+                console.print("\n[bold yellow]Stopped watching.[/bold yellow]")
+            return
 
     if failed:
         console.print("\n[red]✗ Refresh failed[/red]")
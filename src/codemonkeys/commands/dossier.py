@@ -1,11 +1,16 @@
 
 import click
-import frontmatter
+import glob
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from jsonschema import validate, ValidationError
+
+from codemonkeys.core.dossiers import DOSSIERS_DIR, SCIENCE_DIR, load_metadata, pending_science, topic_slug
+
+DESIGN_SCHEMA = Path("docs/schemas/design_dossier.schema.json")
+SCIENCE_SCHEMA = Path("docs/schemas/science_dossier.schema.json")
 
 @click.group()
 def dossier():
@@ -49,20 +54,22 @@ def new(product_slug):
 @click.argument('dossier_path', type=click.Path(exists=True))
 def validate_cmd(dossier_path):
     """Validate a Design Dossier against the schema."""
+    # jsonschema is imported only by the commands that validate
+    from jsonschema import ValidationError
+    from codemonkeys.core import schemas
+
     path = Path(dossier_path)
     click.echo(f"Validating Dossier: {path}")
 
     # Load Schema
-    schema_path = Path("docs/schemas/design_dossier.schema.json")
+    schema_path = DESIGN_SCHEMA
     if not schema_path.exists():
         click.echo("Error: Schema not found", err=True)
         exit(1)
     
-    schema = json.loads(schema_path.read_text())
-
     # Load Dossier
     try:
-        post = frontmatter.load(path)
+        meta = load_metadata(path)
     except Exception as e:
         click.echo(f"Error parsing frontmatter: {e}", err=True)
         _escalate_to_nexus(path, f"Frontmatter parse error: {e}")
@@ -70,7 +77,7 @@ def validate_cmd(dossier_path):
 
     # Validate Schema
     try:
-        validate(instance=post.metadata, schema=schema)
+        schemas.validate(meta, schema_path)
         click.echo("YAML Schema Valid")
     except ValidationError as e:
         click.echo(f"Schema Error: {e.message}", err=True)
@@ -78,8 +85,7 @@ def validate_cmd(dossier_path):
         exit(1)
 
     # Validate Content (Placeholders)
-    content = post.content
-    if "[One sentence problem statement]" in str(post.metadata) or "[Proof 1" in str(post.metadata):
+    if _has_placeholders(meta):
          click.echo("Validation Failed: Placeholders detected in metadata", err=True)
          _escalate_to_nexus(path, "Placeholders detected in metadata")
          exit(1)
@@ -87,14 +93,134 @@ def validate_cmd(dossier_path):
     click.echo("Dossier Valid")
 
 
+def _has_placeholders(meta: dict) -> bool:
+    return "[One sentence problem statement]" in str(meta) or "[Proof 1" in str(meta)
+
+
+def _missing_constitution_refs(meta: dict) -> list[str]:
+    # Checked in repo root and common locations
+    return [
+        ref for ref in meta.get('constitution_refs', [])
+        if not Path(ref).exists() and not Path(f".agent/{ref}").exists()
+    ]
+
+
+def expand_paths(args: tuple[str, ...], defaults: tuple[Path, ...] = ()) -> list[Path]:
+    """
+    Expand dossier arguments into file paths, in order and without duplicates.
+
+    An argument may be a file, a directory (its DOS-*.md and SCI-*.md
+    dossiers), a glob, or "-" to read more arguments from stdin, one per
+    line. defaults are expanded when no arguments are given.
+    """
+    paths: dict[Path, None] = {}
+
+    def add(arg: str):
+        path = Path(arg)
+        if path.is_dir():
+            for pattern in ("DOS-*.md", "SCI-*.md"):
+                paths.update(dict.fromkeys(sorted(path.glob(pattern))))
+        elif glob.has_magic(arg):
+            paths.update(dict.fromkeys(Path(p) for p in sorted(glob.glob(arg))))
+        else:
+            paths[path] = None
+
+    for arg in args or [str(d) for d in defaults]:
+        if arg == "-":
+            for line in click.open_file("-"):
+                if line.strip():
+                    add(line.strip())
+        else:
+            add(arg)
+    return [*paths]
+
+
+def check_dossier(path: Path) -> dict:
+    """
+    Validate one design or science dossier without side effects.
+
+    Science dossiers are recognised by dossier_type or an SCI- file name.
+    Returns the dossier's entry in the batch summary.
+    """
+    from codemonkeys.core import schemas
+
+    science = path.name.startswith("SCI-")
+    entry = {"path": str(path), "type": "science" if science else "design", "valid": False, "errors": [], "warnings": []}
+    errors = entry["errors"]
+
+    try:
+        meta = load_metadata(path)
+    except Exception as e:
+        errors.append(f"Frontmatter parse error: {e}")
+        return entry
+
+    if meta.get('dossier_type') == 'science':
+        science = True
+        entry["type"] = "science"
+    elif science:
+        errors.append("dossier_type must be 'science'")
+
+    schema_path = SCIENCE_SCHEMA if science else DESIGN_SCHEMA
+    try:
+        validator = schemas.get_validator(schema_path)
+    except FileNotFoundError:
+        errors.append(f"Schema not found: {schema_path}")
+        return entry
+    for error in validator.iter_errors(meta):
+        location = ".".join(str(p) for p in error.absolute_path)
+        errors.append(f"{location}: {error.message}" if location else error.message)
+
+    if science:
+        for ref in _missing_constitution_refs(meta):
+            entry["warnings"].append(f"constitution_ref '{ref}' not found locally")
+    elif _has_placeholders(meta):
+        errors.append("Placeholders detected in metadata")
+
+    entry["valid"] = not errors
+    return entry
+
+
+@dossier.command("validate")
+@click.argument('paths', nargs=-1)
+@click.option('--all', 'validate_all', is_flag=True, help=f"Validate every dossier in {DOSSIERS_DIR} and {SCIENCE_DIR} (or in the given directories)")
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, help='Validate up to N dossiers concurrently')
+@click.option('--json', 'as_json', is_flag=True, help='Print a JSON summary')
+def validate(paths, validate_all, jobs, as_json):
+    """Validate many design and science dossiers in one process.
+
+    PATHS may be files, directories, globs, or - to read paths from stdin.
+    Unlike validate-cmd, failures are reported but not escalated to Nexus.
+    """
+    if not paths and not validate_all:
+        raise click.UsageError("Pass dossier paths, - for stdin, or --all")
+    files = expand_paths(paths, (DOSSIERS_DIR, SCIENCE_DIR) if validate_all else ())
+
+    # Schemas are compiled once and shared; pool.map keeps input order
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = [*pool.map(check_dossier, files)]
+
+    invalid = sum(1 for r in results if not r["valid"])
+    if as_json:
+        click.echo(json.dumps({"total": len(results), "valid": len(results) - invalid, "invalid": invalid, "results": results}, indent=2))
+    else:
+        for r in results:
+            click.echo(f"{'PASS' if r['valid'] else 'FAIL'} {r['path']}")
+            for error in r["errors"]:
+                click.echo(f"  Error: {error}")
+            for warning in r["warnings"]:
+                click.echo(f"  Warning: {warning}")
+        click.echo(f"Validated {len(results)} dossier(s): {len(results) - invalid} valid, {invalid} invalid")
+    if invalid or not results:
+        exit(1)
+
+
 @dossier.command("to-spec")
 @click.argument('dossier_path', type=click.Path(exists=True))
 @click.option('--spec-id', default=None, help="Manual spec ID (e.g. 005)")
 def to_spec(dossier_path, spec_id):
     """Generate a Spec skeleton from a Dossier."""
     path = Path(dossier_path)
-    post = frontmatter.load(path)
-    meta = post.metadata
+    meta = load_metadata(path)
     
     product_slug = meta.get('product_id', 'unknown')
     
@@ -129,8 +255,8 @@ Owner: {meta.get('owner')}
 Epic: {product_slug}
 
 ## 1. Intent
-{post.metadata.get('hypothesis', {}).get('problem', 'Problem statement...')}
-{post.metadata.get('hypothesis', {}).get('claim', 'Hypothesis...')}
+{meta.get('hypothesis', {}).get('problem', 'Problem statement...')}
+{meta.get('hypothesis', {}).get('claim', 'Hypothesis...')}
 
 ## 2. User Stories
 - **As a User**, I want [feature] so that [benefit].
@@ -302,78 +428,52 @@ def new_science(topic_slug):
 @click.argument('dossier_path', type=click.Path(exists=True))
 def validate_science(dossier_path):
     """Validate a Science Dossier against the schema."""
+    from jsonschema import ValidationError
+    from codemonkeys.core import schemas
+
     path = Path(dossier_path)
     click.echo(f"Validating Science Dossier: {path}")
 
     # Load Schema
-    schema_path = Path("docs/schemas/science_dossier.schema.json")
+    schema_path = SCIENCE_SCHEMA
     if not schema_path.exists():
         click.echo("Error: Science dossier schema not found", err=True)
         exit(1)
     
-    schema = json.loads(schema_path.read_text())
-
     # Load Dossier
     try:
-        post = frontmatter.load(path)
+        meta = load_metadata(path)
     except Exception as e:
         click.echo(f"Error parsing frontmatter: {e}", err=True)
         exit(1)
 
     # Check dossier_type
-    if post.metadata.get('dossier_type') != 'science':
+    if meta.get('dossier_type') != 'science':
         click.echo("Error: dossier_type must be 'science'", err=True)
         exit(1)
 
     # Validate Schema
     try:
-        validate(instance=post.metadata, schema=schema)
+        schemas.validate(meta, schema_path)
         click.echo("Schema Valid")
     except ValidationError as e:
         click.echo(f"Schema Error: {e.message}", err=True)
         exit(1)
 
     # Check constitution refs exist
-    constitution_refs = post.metadata.get('constitution_refs', [])
-    for ref in constitution_refs:
-        ref_path = Path(ref)
-        # Check in repo root and common locations
-        if not ref_path.exists() and not Path(f".agent/{ref}").exists():
-            click.echo(f"Warning: constitution_ref '{ref}' not found locally")
+    for ref in _missing_constitution_refs(meta):
+        click.echo(f"Warning: constitution_ref '{ref}' not found locally")
     
     click.echo("Science Dossier Valid")
 
 
-@dossier.command("science-to-design")
-@click.argument('science_path', type=click.Path(exists=True))
-@click.option('--product-id', required=True, help="Product ID for the design dossier")
-def science_to_design(science_path, product_id):
-    """Convert a Science Dossier to a Design Dossier scaffold."""
-    path = Path(science_path)
-    
-    # Load science dossier
-    try:
-        post = frontmatter.load(path)
-    except Exception as e:
-        click.echo(f"Error parsing science dossier: {e}", err=True)
-        exit(1)
-    
-    meta = post.metadata
-    
-    # Validate it's a science dossier
-    if meta.get('dossier_type') != 'science':
-        click.echo("Error: Input must be a science dossier (dossier_type: science)", err=True)
-        exit(1)
-    
+def design_scaffold(meta: dict, path: Path, product_id: str) -> tuple[Path, str]:
+    """Return the design dossier path and content for a science dossier."""
     today = datetime.now().strftime("%Y%m%d")
     date_iso = datetime.now().strftime("%Y-%m-%d")
     design_id = f"DOS-{today}-{product_id}"
-    design_file = Path(f"docs/dossiers/{design_id}.md")
-    
-    if design_file.exists():
-        click.echo(f"Error: Design dossier {design_file} already exists", err=True)
-        exit(1)
-    
+    design_file = DOSSIERS_DIR / f"{design_id}.md"
+
     # Build acceptance proofs from science hooks
     acceptance_hooks = meta.get('acceptance_hooks', {})
     acceptance_proofs = []
@@ -441,7 +541,92 @@ Derived from science evidence plan.
 ## 4. Evidence Plan
 Validation method: {evidence_plan.get('validation_method', '[From science dossier]')}
 '''
+    return design_file, design_content
+
+
+def convert_pending(item: dict, dry_run: bool = False) -> dict:
+    """
+    Write the design dossier for one pending science dossier.
+
+    The product id is the science topic's slug, which is also how older
+    conversions are recognised. Returns the item's batch summary entry.
+    """
+    path = Path(item["science_path"])
+    product_id = topic_slug(str(item["topic"]))
+    entry = {
+        "science_path": str(path),
+        "dossier_id": item["dossier_id"],
+        "product_id": product_id,
+        "design_path": None,
+        "status": "failed",
+        "error": None,
+    }
+    try:
+        meta = load_metadata(path)  # Memoized by the pending scan
+    except Exception as e:
+        entry["error"] = f"Error parsing science dossier: {e}"
+        return entry
+    if meta.get('dossier_type') != 'science':
+        entry["error"] = "Input must be a science dossier (dossier_type: science)"
+        return entry
+
+    design_file, content = design_scaffold(meta, path, product_id)
+    entry["design_path"] = str(design_file)
+    if dry_run:
+        entry["status"] = "planned"
+        return entry
+    design_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        # Exclusive create: two topics with the same slug cannot overwrite each other
+        with open(design_file, "x") as f:
+            f.write(content)
+    except FileExistsError:
+        entry["error"] = f"Design dossier {design_file} already exists"
+        return entry
+    entry["status"] = "created"
+    return entry
+
+
+@dossier.command("science-to-design")
+@click.argument('science_path', type=click.Path(exists=True), required=False)
+@click.option('--product-id', help="Product ID for the design dossier")
+@click.option('--pending', is_flag=True, help=f"Convert every validated science dossier in {SCIENCE_DIR} without a design dossier")
+@click.option('--dry-run', is_flag=True, help='With --pending, list the conversions without writing')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, help='With --pending, convert up to N dossiers concurrently')
+@click.option('--json', 'as_json', is_flag=True, help='With --pending, print a JSON summary')
+def science_to_design(science_path, product_id, pending, dry_run, jobs, as_json):
+    """Convert a Science Dossier to a Design Dossier scaffold.
+
+    With --pending, converts the whole backlog in one process; each design
+    dossier's product id is its science topic's slug.
+    """
+    if pending:
+        if science_path or product_id:
+            raise click.UsageError("--pending takes no SCIENCE_PATH or --product-id")
+        _science_to_design_pending(dry_run, jobs, as_json)
+        return
+    if not science_path or not product_id:
+        raise click.UsageError("SCIENCE_PATH and --product-id are required (or pass --pending)")
+
+    path = Path(science_path)
+    
+    # Load science dossier
+    try:
+        meta = load_metadata(path)
+    except Exception as e:
+        click.echo(f"Error parsing science dossier: {e}", err=True)
+        exit(1)
     
+    # Validate it's a science dossier
+    if meta.get('dossier_type') != 'science':
+        click.echo("Error: Input must be a science dossier (dossier_type: science)", err=True)
+        exit(1)
+    
+    design_file, design_content = design_scaffold(meta, path, product_id)
+    if design_file.exists():
+        click.echo(f"Error: Design dossier {design_file} already exists", err=True)
+        exit(1)
+
     design_file.parent.mkdir(parents=True, exist_ok=True)
     design_file.write_text(design_content)
     
@@ -450,3 +635,26 @@ Validation method: {evidence_plan.get('validation_method', '[From science dossie
     click.echo(f"  Product ID: {product_id}")
     click.echo(f"\nNext: codemonkeys dossier validate {design_file}")
 
+
+def _science_to_design_pending(dry_run, jobs, as_json):
+    items = pending_science(SCIENCE_DIR, DOSSIERS_DIR)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = [*pool.map(lambda item: convert_pending(item, dry_run), items)]
+
+    failed = sum(1 for r in results if r["status"] == "failed")
+    if as_json:
+        summary = {"total": len(results), "failed": failed, "dry_run": dry_run, "results": results}
+        summary["planned" if dry_run else "created"] = len(results) - failed
+        click.echo(json.dumps(summary, indent=2))
+    else:
+        for r in results:
+            if r["status"] == "failed":
+                click.echo(f"Error: {r['science_path']}: {r['error']}", err=True)
+            elif dry_run:
+                click.echo(f"Would create {r['design_path']} from {r['science_path']}")
+            else:
+                click.echo(f"Created Design Dossier: {r['design_path']} from {r['science_path']}")
+        verb = "Planned" if dry_run else "Converted"
+        click.echo(f"{verb} {len(results) - failed} of {len(results)} pending science dossier(s)")
+    if failed:
+        exit(1)
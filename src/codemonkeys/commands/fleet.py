@@ -1,10 +1,18 @@
 import click
 import json
 import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 
+from codemonkeys.core import history
+from codemonkeys.core.scheduler import DEFAULT_STATE_PATH, Scheduler, run_loop
+from codemonkeys.core.scripts import load_script
+from codemonkeys.core.work_orders import WorkOrderQueue
+
 console = Console()
 
 @click.group()
@@ -49,3 +57,172 @@ def status():
     # Just reusing list for now, will enhance in Phase 4
     ctx = click.get_current_context()
     ctx.invoke(list)
+
+
+def parse_window(value):
+    """Parse a window bound: ISO 8601 or relative like '7d', '12h', '30m'."""
+    if value is None:
+        return None
+    match = re.fullmatch(r"(\d+)([dhm])", value)
+    if match:
+        unit = {"d": "days", "h": "hours", "m": "minutes"}[match.group(2)]
+        return datetime.now(timezone.utc) - timedelta(**{unit: int(match.group(1))})
+    parsed = history.parse_time(value)
+    if parsed is None:
+        raise click.BadParameter(f"Not a timestamp or relative window: {value}")
+    return parsed
+
+
+def summarize_trend(records):
+    """Aggregate history records into run count, success rate and averages."""
+    runs = len(records)
+    successes = sum(1 for r in records if r.get("status") == "success")
+    minutes = [r["spent_minutes"] for r in records if r.get("spent_minutes") is not None]
+    return {
+        "runs": runs,
+        "success_rate": round(successes / runs, 3) if runs else None,
+        "avg_minutes": round(sum(minutes) / len(minutes), 2) if minutes else None,
+        "last_status": records[-1].get("status") if records else None,
+    }
+
+
+@fleet.command(name='history')
+@click.argument('product_id', required=False)
+@click.option('--since', help="Window start: ISO timestamp or relative (7d, 12h)")
+@click.option('--until', help="Window end: ISO timestamp or relative (7d, 12h)")
+@click.option('--runs-dir', type=click.Path(path_type=Path), default=Path("dash/runs"), help='Runs directory')
+@click.option('--json', 'as_json', is_flag=True, help='Print JSON instead of a table')
+def history_cmd(product_id, since, until, runs_dir, as_json):
+    """Show run history trends (one product's runs, or every product)."""
+    since, until = parse_window(since), parse_window(until)
+
+    if product_id:
+        records = history.read_history(history.history_path(runs_dir / product_id), since, until)
+        if as_json:
+            click.echo(json.dumps({"product_id": product_id, "trend": summarize_trend(records), "runs": records}, indent=2))
+            return
+        table = Table(title=f"Run History :: {product_id} ({len(records)} runs)")
+        table.add_column("Run", style="cyan")
+        table.add_column("Ended")
+        table.add_column("Status", style="yellow")
+        table.add_column("Minutes", justify="right")
+        table.add_column("Tests", justify="right")
+        for r in records:
+            tests = r.get("tests")
+            table.add_row(
+                r.get("run_id") or "N/A",
+                r.get("ended_at") or "N/A",
+                r.get("status") or "N/A",
+                str(r.get("spent_minutes", "")),
+                f"{tests['passed']}/{tests['total']}" if tests else "",
+            )
+        console.print(table)
+        return
+
+    trends = {}
+    if runs_dir.exists():
+        for product_dir in sorted(runs_dir.iterdir()):
+            path = history.history_path(product_dir)
+            if path.exists():
+                trends[product_dir.name] = summarize_trend(history.read_history(path, since, until))
+
+    if as_json:
+        click.echo(json.dumps(trends, indent=2))
+        return
+    table = Table(title=f"Fleet Run Trends ({len(trends)} products)")
+    table.add_column("ID", style="cyan")
+    table.add_column("Runs", justify="right")
+    table.add_column("Success", justify="right", style="green")
+    table.add_column("Avg Minutes", justify="right")
+    table.add_column("Last Status", style="yellow")
+    for pid, trend in trends.items():
+        rate = trend["success_rate"]
+        table.add_row(
+            pid,
+            str(trend["runs"]),
+            f"{rate:.0%}" if rate is not None else "N/A",
+            str(trend["avg_minutes"] if trend["avg_minutes"] is not None else "N/A"),
+            trend["last_status"] or "N/A",
+        )
+    console.print(table)
+
+
+def dispatch_due(scheduler, keys, work_orders_dir, dry_run=False):
+    """Write work orders for due jobs and run them through the executor."""
+    planner = load_script("oracle_planner")
+    executor = load_script("oracle_executor")
+
+    keys = sorted(keys, key=lambda k: -scheduler.jobs[k][1].get("priority", 50))
+    planned = {}
+    for rank, key in enumerate(keys, start=1):
+        product_id, job, _ = scheduler.jobs[key]
+        planned[key] = planner.schedule_work_order(product_id, job, rank)
+
+    # Repo-wide intents due for several products run once
+    orders, _ = planner.coalesce_work_orders([*planned.values()])
+    queue = WorkOrderQueue(work_orders_dir)
+    if not dry_run:
+        claimed = []
+        for wo in orders:
+            path = work_orders_dir / f"{wo['job_id']}.json"
+            queue.write(path, wo)
+            # Claimed like the executor's, so a concurrent `oracle run` skips it
+            taken = queue.claim_path(path)
+            if taken is not None:
+                claimed.append(taken)
+        orders = claimed
+
+    console.print(f"[bold]Dispatching {len(orders)} order(s) for {len(keys)} due job(s):[/bold] {', '.join(keys)}")
+    order_status = {}
+    with queue.hold(orders):
+        runner = executor.QueueRunner(executor.group_by_product(orders), dry_run=dry_run)
+        runner.run()
+    for wo, result in runner.finished:
+        order_status[planner.dedup_key(wo)] = result.get("status", "completed")
+
+    return {
+        key: order_status.get(planner.dedup_key(wo), "skipped")
+        for key, wo in planned.items()
+    }
+
+
+@fleet.command()
+@click.option('--schedules-dir', type=click.Path(path_type=Path), default=Path("dash/schedules"), help='Schedules directory')
+@click.option('--work-orders-dir', type=click.Path(path_type=Path), default=Path("nexus/work_orders"), help='Where dispatched work orders are written')
+@click.option('--state', 'state_path', type=click.Path(path_type=Path), default=DEFAULT_STATE_PATH, help='Last-completion state file')
+@click.option('--once', is_flag=True, help='Dispatch whatever is due now and exit')
+@click.option('--dry-run', is_flag=True, help='Preview due jobs without executing or writing orders')
+@click.option('--max-sleep', type=float, default=60.0, help='Longest sleep between checks for schedule changes (seconds)')
+def scheduler(schedules_dir, work_orders_dir, state_path, once, dry_run, max_sleep):
+    """Run due schedule jobs by cadence (daemon)."""
+    console.print("[bold blue]Code Monkeys Factory :: Fleet Scheduler[/bold blue]")
+
+    sched = Scheduler(schedules_dir, state_path)
+    sched.reload()
+    console.print(f"Tracking {len(sched.jobs)} scheduled job(s) from {schedules_dir}")
+
+    if dry_run:
+        # Preview only: completions are not recorded
+        due = sched.pop_due(time.time())
+        if due:
+            dispatch_due(sched, due, work_orders_dir, dry_run=True)
+        else:
+            console.print("Nothing due.")
+        return
+
+    def dispatch(keys):
+        return dispatch_due(sched, keys, work_orders_dir)
+
+    def report_error(keys, error):
+        console.print(f"[bold red]Dispatch of {', '.join(keys)} failed:[/bold red] {type(error).__name__}: {error}")
+
+    try:
+        run_loop(sched, dispatch, once=once, max_sleep=max_sleep, on_error=report_error)
+    except KeyboardInterrupt:
+        console.print("\n[bold yellow]Scheduler stopped.[/bold yellow]")
+        return
+
+    next_at = sched.next_due()
+    if next_at is not None:
+        wait = max(0, int(next_at - time.time()))
+        console.print(f"Next job due in {wait}s")
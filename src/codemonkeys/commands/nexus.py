@@ -1,8 +1,9 @@
 import click
 import sys
-import subprocess
 from rich.console import Console
 
+from codemonkeys.core.scripts import run_script
+
 console = Console()
 
 @click.group()
@@ -13,20 +14,21 @@ def nexus():
 @nexus.command()
 @click.option('--decision', help='Process specific decision ID')
 @click.option('--dry-run', is_flag=True, help='Preview only')
-def exec(decision, dry_run):
+@click.option('--subprocess', 'use_subprocess', is_flag=True, help='Run the executor in a separate interpreter')
+def exec(decision, dry_run, use_subprocess):
     """Execute pending Nexus decisions."""
     console.print("[bold blue]Code Monkeys Factory :: Nexus Execution[/bold blue]")
     
-    cmd = ["python", "scripts/nexus_executor.py"]
+    cmd = []
     if decision:
         cmd.extend(["--decision", decision])
     if dry_run:
         cmd.append("--dry-run")
         
     try:
-        result = subprocess.run(cmd, check=False)
-        if result.returncode != 0:
-            sys.exit(result.returncode)
+        returncode = run_script("nexus_executor", cmd, use_subprocess)
+        if returncode != 0:
+            sys.exit(returncode)
     except Exception as e:
         console.print(f"[bold red]Error running Nexus Executor:[/bold red] {e}")
         sys.exit(1)
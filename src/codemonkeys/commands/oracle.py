@@ -1,11 +1,12 @@
 """Oracle command - work orchestration and execution."""
-import subprocess
-import sys
 from pathlib import Path
 
 import click
 from rich.console import Console
 
+from codemonkeys.core.scripts import run_script
+from codemonkeys.core.work_orders import CLAIMED_DIR, WorkOrderQueue
+
 console = Console()
 
 
@@ -22,11 +23,13 @@ def oracle():
 @click.option("--deterministic", is_flag=True, help="Use deterministic job IDs for testing")
 @click.option("--from-schedules", is_flag=True, help="Plan from schedule files")
 @click.option("--product", type=str, default=None, help="Filter to single product")
-def plan(budget: int, stdout: bool, output_dir: str, deterministic: bool, from_schedules: bool, product: str):
+@click.option("--subprocess", "use_subprocess", is_flag=True, help="Run the planner in a separate interpreter")
+def plan(budget: int, stdout: bool, output_dir: str, deterministic: bool, from_schedules: bool, product: str,
+         use_subprocess: bool):
     """Generate bounded, prioritized work orders."""
     console.print("[bold blue]Code Monkeys Factory :: Oracle Plan[/bold blue]")
 
-    cmd = [sys.executable, "scripts/oracle_planner.py", "--budget", str(budget)]
+    cmd = ["--budget", str(budget)]
 
     if stdout:
         cmd.append("--stdout")
@@ -42,33 +45,37 @@ def plan(budget: int, stdout: bool, output_dir: str, deterministic: bool, from_s
     if product:
         cmd.extend(["--product", product])
 
-    result = subprocess.run(cmd, capture_output=False)
-
-    raise SystemExit(result.returncode)
+    raise SystemExit(run_script("oracle_planner", cmd, use_subprocess))
 
 
 @oracle.command()
 @click.option("--budget", default=3, type=int, help="Max work orders to execute")
 @click.option("--dry-run", is_flag=True, help="Preview execution without making changes")
 @click.option("--work-orders-dir", type=click.Path(), default="nexus/work_orders", help="Work orders directory")
-def run(budget: int, dry_run: bool, work_orders_dir: str):
+@click.option("--workers", default=1, type=click.IntRange(min=1), help="Run up to N product queues concurrently")
+@click.option("--subprocess", "use_subprocess", is_flag=True, help="Run the executor and each order in separate interpreters")
+def run(budget: int, dry_run: bool, work_orders_dir: str, workers: int, use_subprocess: bool):
     """Execute pending work orders with budget enforcement."""
     console.print("[bold blue]Code Monkeys Factory :: Oracle Run[/bold blue]")
     
-    cmd = [sys.executable, "scripts/oracle_executor.py", "--budget", str(budget)]
+    cmd = ["--budget", str(budget)]
     
     if dry_run:
         cmd.append("--dry-run")
     
     cmd.extend(["--work-orders-dir", work_orders_dir])
+    cmd.extend(["--workers", str(workers)])
+
+    if use_subprocess:
+        cmd.append("--subprocess")
     
-    result = subprocess.run(cmd, capture_output=False)
-    
-    raise SystemExit(result.returncode)
+    raise SystemExit(run_script("oracle_executor", cmd, use_subprocess))
 
 
 @oracle.command()
-def status():
+@click.option("--no-state", is_flag=True, help="Scan work order files directly, bypassing the queue index")
+@click.option("--rebuild", is_flag=True, help="Rescan work order files and rewrite the queue index")
+def status(no_state: bool, rebuild: bool):
     """Show current work order queue status."""
     console.print("[bold blue]Code Monkeys Factory :: Oracle Status[/bold blue]")
     
@@ -78,31 +85,32 @@ def status():
         console.print("[yellow]No work orders directory found.[/yellow]")
         return
     
-    import json
-    
-    pending = 0
-    completed = 0
-    failed = 0
-    
-    for wo_file in work_orders_dir.glob("*.json"):
-        if wo_file.name.startswith("_"):
-            continue
-        with open(wo_file) as f:
-            wo = json.load(f)
-        status = wo.get("status", "pending")
-        if status == "pending":
-            pending += 1
-        elif status == "completed":
-            completed += 1
-        elif status == "failed":
-            failed += 1
+    if no_state:
+        import json
+
+        counts: dict[str, int] = {}
+        claimed = work_orders_dir.glob(f"{CLAIMED_DIR}/*.json")
+        for wo_file in [*work_orders_dir.glob("*.json"), *claimed]:
+            if wo_file.name.startswith("_"):
+                continue
+            with open(wo_file) as f:
+                wo = json.load(f)
+            wo_status = wo.get("status", "pending")
+            counts[wo_status] = counts.get(wo_status, 0) + 1
+    elif rebuild:
+        counts = WorkOrderQueue(work_orders_dir).rebuild()
+    else:
+        counts = WorkOrderQueue(work_orders_dir).counts()
     
-    console.print(f"\n[bold]Work Order Queue[/bold]")
-    console.print(f"  Pending:   {pending}")
-    console.print(f"  Completed: {completed}")
-    console.print(f"  Failed:    {failed}")
-    console.print(f"  Total:     {pending + completed + failed}")
+    # The usual statuses always show; any other (e.g. coalesced) follows
+    statuses = ["pending", "running", "completed", "failed", "timed_out"]
+    statuses += sorted(set(counts) - set(statuses))
 
+    console.print(f"\n[bold]Work Order Queue[/bold]")
+    for wo_status in statuses:
+        label = wo_status.replace("_", " ").capitalize() + ":"
+        console.print(f"  {label:<10} {counts.get(wo_status, 0)}")
+    console.print(f"  Total:     {sum(counts.values())}")
 
 if __name__ == "__main__":
     oracle()
@@ -1,8 +1,9 @@
 import click
 import sys
-import subprocess
 from rich.console import Console
 
+from codemonkeys.core.scripts import run_script
+
 console = Console()
 
 @click.command()
@@ -10,23 +11,33 @@ console = Console()
 @click.option('--path', default=None, help='Path to product directory')
 @click.option('--test-path', default=None, help='Path to tests')
 @click.option('--ci', is_flag=True, help='Run in CI mode')
-def run(product_id, path, test_path, ci):
+@click.option('--shards', type=click.IntRange(min=1), default=1, help='Run tests in N concurrent shards')
+@click.option('--changed', is_flag=True, help='Only run tests affected by changes since the last green run')
+@click.option('--full-every', type=click.IntRange(min=1), default=None, help='With --changed, force a full run after N impacted runs')
+@click.option('--subprocess', 'use_subprocess', is_flag=True, help='Run the report script in a separate interpreter')
+def run(product_id, path, test_path, ci, shards, changed, full_every, use_subprocess):
     """Run tests and generate artifact for a product."""
     console.print(f"[bold blue]Code Monkeys Factory :: Running {product_id}[/bold blue]")
     
-    cmd = ["python", "scripts/generate_run_report.py", product_id]
+    cmd = [product_id]
     if path:
         cmd.extend(["--path", path])
     if test_path:
         cmd.extend(["--test-path", test_path])
     if ci:
         cmd.append("--ci")
+    if shards > 1:
+        cmd.extend(["--shards", str(shards)])
+    if changed:
+        cmd.append("--changed")
+    if full_every:
+        cmd.extend(["--full-every", str(full_every)])
         
     try:
         # We delegate to the existing robust script
-        result = subprocess.run(cmd, check=False)
-        if result.returncode != 0:
-            sys.exit(result.returncode)
+        returncode = run_script("generate_run_report", cmd, use_subprocess)
+        if returncode != 0:
+            sys.exit(returncode)
     except Exception as e:
         console.print(f"[bold red]Error running product:[/bold red] {e}")
         sys.exit(1)
@@ -1,19 +1,23 @@
 import click
 import sys
-import subprocess
 from rich.console import Console
 
+from codemonkeys.core.scripts import run_script
+
 console = Console()
 
 @click.command()
 @click.option('--all', 'validate_all', is_flag=True, help='Validate everything')
 @click.option('--nexus', is_flag=True, help='Validate Nexus only')
 @click.option('--target', help='Validate specific file')
-def silverback(validate_all, nexus, target):
+@click.option('--no-cache', is_flag=True, help='Revalidate everything, ignoring cached results')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, help='Validate up to N targets concurrently')
+@click.option('--subprocess', 'use_subprocess', is_flag=True, help='Run the validator in a separate interpreter')
+def silverback(validate_all, nexus, target, no_cache, jobs, use_subprocess):
     """Run Silverback validation."""
     console.print("[bold blue]Code Monkeys Factory :: Silverback Validation[/bold blue]")
     
-    cmd = [sys.executable, "scripts/silverback_validate.py"]
+    cmd = []
     if validate_all:
         cmd.append("--all")
     if nexus:
@@ -21,11 +25,15 @@ def silverback(validate_all, nexus, target):
     if target:
         cmd.append("--spec")
         cmd.append(target)
+    if no_cache:
+        cmd.append("--no-cache")
+    if jobs > 1:
+        cmd.extend(["--jobs", str(jobs)])
         
     try:
-        result = subprocess.run(cmd, check=False)
-        if result.returncode != 0:
-            sys.exit(result.returncode)
+        returncode = run_script("silverback_validate", cmd, use_subprocess)
+        if returncode != 0:
+            sys.exit(returncode)
     except Exception as e:
         console.print(f"[bold red]Error running Silverback:[/bold red] {e}")
         sys.exit(1)
@@ -0,0 +1,51 @@
+"""State commands - fleet state index import/export."""
+from pathlib import Path
+
+import click
+from rich.console import Console
+
+from codemonkeys.core.state import COLLECTIONS, DEFAULT_DB_PATH, StateStore
+
+console = Console()
+
+
+@click.group()
+def state():
+    """State - SQLite index of runs, products and Nexus artifacts."""
+    pass
+
+
+@state.command()
+@click.option("--db", type=click.Path(), default=str(DEFAULT_DB_PATH), help="State database path")
+@click.option("--full", is_flag=True, help="Check every file, not just those in changed directories")
+def sync(db: str, full: bool):
+    """Import changed JSON artifacts into the state index."""
+    console.print("[bold blue]Code Monkeys Factory :: State Sync[/bold blue]")
+
+    with StateStore(db) as store:
+        counts = store.sync_all(full=full)
+        for kind, indexed in counts.items():
+            console.print(f"  {kind}: {indexed} re-indexed")
+        totals = {kind: sum(store.status_counts(kind).values()) for kind in COLLECTIONS}
+
+    console.print(f"\n[green]✓ Indexed {sum(totals.values())} documents[/green]")
+
+
+@state.command()
+@click.argument("output_dir", type=click.Path())
+@click.option("--db", type=click.Path(), default=str(DEFAULT_DB_PATH), help="State database path")
+def export(output_dir: str, db: str):
+    """Export the indexed documents as JSON files under OUTPUT_DIR."""
+    console.print("[bold blue]Code Monkeys Factory :: State Export[/bold blue]")
+
+    out = Path(output_dir)
+    with StateStore(db) as store:
+        for kind in COLLECTIONS:
+            count = store.export(kind, out / kind)
+            console.print(f"  {kind}: {count} file(s)")
+
+    console.print(f"\n[green]✓ Exported to {out}[/green]")
+
+
+if __name__ == "__main__":
+    state()
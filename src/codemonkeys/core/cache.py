@@ -0,0 +1,128 @@
+"""Content-hash keyed result cache.
+
+Stores the result of an expensive check per target file. An entry is
+reused only when the target's key (normally its content hash combined with
+the hash of whatever schema/logic checked it) is unchanged and every
+dependency the check consulted still has the same fingerprint.
+
+Dependencies are recorded in one of three modes:
+- "content": the file's sha256
+- "exists": only whether the path exists (e.g. large evidence logs)
+- "glob": the sorted set of paths matching a glob pattern
+
+shared_cache() returns one instance per cache file for the whole process,
+so a long-lived process (the CLI daemon) parses the file once and keeps
+the entries warm between calls. It reloads when another process has
+rewritten the file.
+"""
+import glob
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+
+def file_digest(path: Path | str) -> str | None:
+    """Return the sha256 of a file's content, or None if it does not exist."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+    return h.hexdigest()
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _fingerprint(path: str, mode: str) -> str | None:
+    if mode == "content":
+        return file_digest(path)
+    if mode == "glob":
+        matches = "\n".join(sorted(glob.glob(path)))
+        return hashlib.sha256(matches.encode()).hexdigest()
+    return "present" if os.path.exists(path) else None
+
+
+class ContentHashCache:
+    """JSON-backed cache of per-file results keyed by content hash."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stat = _stat(self.path)
+        try:
+            self.entries: dict[str, dict] = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def get(self, target: str, key: str) -> Any | None:
+        """Return the cached value for target, or None if stale or missing."""
+        with self._lock:
+            entry = self.entries.get(target)
+        if not entry or entry.get("key") != key:
+            return None
+        for dep, (mode, fingerprint) in entry.get("deps", {}).items():
+            if _fingerprint(dep, mode) != fingerprint:
+                return None
+        return entry["value"]
+
+    def put(self, target: str, key: str, value: Any, deps: dict[str, str] | None = None):
+        """
+        Record value for target.
+
+        deps maps each consulted path (or glob pattern) to its tracking
+        mode: "content", "exists" or "glob".
+        """
+        entry = {
+            "key": key,
+            "value": value,
+            "deps": {
+                dep: [mode, _fingerprint(dep, mode)]
+                for dep, mode in (deps or {}).items()
+            },
+        }
+        with self._lock:
+            self.entries[target] = entry
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to disk atomically if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self.entries))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            self._stat = _stat(self.path)
+
+    def stale(self) -> bool:
+        """True if the file changed on disk since this instance loaded or saved it."""
+        return _stat(self.path) != self._stat
+
+
+_shared_lock = threading.Lock()
+_shared: dict[str, ContentHashCache] = {}
+
+
+def shared_cache(path: Path | str) -> ContentHashCache:
+    """Return the process-wide cache for path, reloading it if stale."""
+    key = str(Path(path).resolve())
+    with _shared_lock:
+        cache = _shared.get(key)
+        if cache is None or cache.stale():
+            cache = ContentHashCache(path)
+            _shared[key] = cache
+    return cache
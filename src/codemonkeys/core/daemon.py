@@ -0,0 +1,246 @@
+"""CLI daemon - a resident codemonkeys process that runs commands for clients.
+
+Even with lazy imports, every `codemonkeys` call pays interpreter start,
+imports, schema compilation and cache parsing. `codemonkeys daemon start`
+keeps one process warm: the forwarded command modules imported, every
+schema compiled (core.schemas memoizes validators) and the Silverback
+result cache parsed (core.cache.shared_cache). Files the commands read
+per call (products.json, work orders) are small and always read fresh.
+
+The CLI entry point looks for the daemon's Unix socket under the current
+directory. The short, non-interactive commands in FORWARDED_COMMANDS are
+sent there and their output printed. Everything else runs in-process as
+before, as does any call when no daemon answers, it runs for another
+working tree, or CODEMONKEYS_NO_DAEMON is set.
+
+Each client is served in its own thread, with stdout and stderr captured
+per thread (core.scripts.call_captured_streams) and written back by the
+client to its own stdout and stderr. When a loaded source file changes, the
+daemon declines the call and exits, so it never serves stale code.
+
+Protocol: one JSON line each way.
+    -> {"op": "run", "argv": ["fleet", "list"], "cwd": "/path/to/repo"}
+    <- {"code": 0, "stdout": "...", "stderr": "..."}  or  {"fallback": "<reason>"}
+    -> {"op": "status"} / {"op": "stop"}
+
+This module is imported on every CLI call, so it keeps its own imports
+light; the server side imports what it needs when it starts.
+"""
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+DEFAULT_SOCKET_PATH = Path(".codemonkeys/daemon.sock")
+DEFAULT_LOG_PATH = Path(".codemonkeys/daemon.log")
+
+SOCKET_ENV = "CODEMONKEYS_DAEMON_SOCKET"
+NO_DAEMON_ENV = "CODEMONKEYS_NO_DAEMON"
+
+CONNECT_TIMEOUT = 0.5
+
+# How often the server loop checks for a stop request
+SHUTDOWN_POLL_SECONDS = 0.1
+
+# Command paths (argv prefixes) a client may forward: quick, read-mostly
+# and never prompting or reading stdin
+FORWARDED_COMMANDS = (
+    ("silverback",),
+    ("oracle", "status"),
+    ("fleet", "list"),
+    ("fleet", "history"),
+    ("dossier", "validate"),
+    ("dossier", "validate-cmd"),
+    ("dossier", "validate-science"),
+    ("state", "sync"),
+)
+
+
+def socket_path() -> Path:
+    """The daemon socket for the current directory."""
+    return Path(os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET_PATH)
+
+
+def forwardable(argv: list[str]) -> bool:
+    """True if argv runs a forwarded command and does not read stdin."""
+    if "-" in argv:
+        return False
+    return any(argv[:len(path)] == [*path] for path in FORWARDED_COMMANDS)
+
+
+def request(message: dict, path: Path | None = None) -> dict | None:
+    """Send one message to the daemon; None if no daemon answers."""
+    path = path or socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(os.fspath(path))
+            sock.settimeout(None)  # Commands may take a while
+            sock.sendall((json.dumps(message) + "\n").encode())
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+    except OSError:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def forward(argv: list[str], path: Path | None = None) -> int | None:
+    """
+    Run a CLI call in the daemon and print its output (stdout and stderr).
+
+    Returns the exit code, or None if the call must run in-process.
+    """
+    if os.environ.get(NO_DAEMON_ENV) or not forwardable(argv):
+        return None
+    path = path or socket_path()
+    if not path.exists():
+        return None
+    reply = request({"op": "run", "argv": argv, "cwd": os.getcwd()}, path)
+    if not reply or "code" not in reply:
+        return None
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.stderr.flush()
+    return reply["code"]
+
+
+def _source_stats() -> dict[str, int]:
+    """mtimes of the loaded codemonkeys and scripts/ source files."""
+    import codemonkeys
+    from codemonkeys.core.scripts import SCRIPTS_DIR
+
+    roots = (str(Path(codemonkeys.__file__).parent), str(SCRIPTS_DIR.resolve()))
+    stats = {}
+    for module in [*sys.modules.values()]:
+        path = getattr(module, "__file__", None)
+        if path and path.startswith(roots):
+            try:
+                stats[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                stats[path] = None
+    return stats
+
+
+class Daemon:
+    """Serves CLI calls for one working tree over a Unix socket."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path or socket_path())
+        self.root = Path.cwd().resolve()
+        self.started_at = None
+        self.requests = 0
+        self._sources: dict[str, int] = {}
+        self._server = None
+
+    def warm(self):
+        """Import the forwarded commands and load schemas and caches."""
+        import click
+
+        from codemonkeys.cli import cli
+        from codemonkeys.core import schemas
+        from codemonkeys.core.cache import shared_cache
+        from codemonkeys.core.scripts import load_script
+
+        ctx = click.Context(cli)
+        for command_path in FORWARDED_COMMANDS:
+            cli.get_command(ctx, command_path[0])
+
+        for directory in schemas.SCHEMA_DIRS:
+            for schema in sorted(directory.glob("*.schema.json")):
+                try:
+                    schemas.get_validator(schema)
+                except Exception:
+                    continue  # Reported by the commands that use it
+
+        try:
+            shared_cache(load_script("silverback_validate").CACHE_PATH)
+        except ImportError:
+            pass  # No scripts/ in this tree
+        self._sources = _source_stats()
+
+    def stale(self) -> bool:
+        """True if a source file loaded at warm-up has changed."""
+        return any(
+            (os.stat(path).st_mtime_ns if os.path.exists(path) else None) != mtime
+            for path, mtime in self._sources.items()
+        )
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "root": str(self.root),
+            "socket": str(self.path),
+            "started_at": self.started_at,
+            "requests": self.requests,
+        }
+
+    def handle(self, message: dict) -> dict:
+        """Answer one client message."""
+        op = message.get("op")
+        if op == "status":
+            return self.status()
+        if op == "stop":
+            self.shutdown()
+            return {"stopping": True}
+        if op != "run":
+            return {"error": f"Unknown op: {op}"}
+
+        argv = message.get("argv") or []
+        if Path(message.get("cwd", "")).resolve() != self.root:
+            return {"fallback": "different working directory"}
+        if not forwardable(argv):
+            return {"fallback": "command is not forwarded"}
+        if self.stale():
+            self.shutdown()
+            return {"fallback": "source changed, daemon stopping"}
+
+        from codemonkeys.cli import cli
+        from codemonkeys.core.scripts import call_captured_streams
+
+        code, stdout, stderr = call_captured_streams(cli.main, args=argv, prog_name="codemonkeys")
+        self.requests += 1
+        return {"code": code, "stdout": stdout, "stderr": stderr}
+
+    def serve_forever(self):
+        """Listen on the socket until stopped. Raises RuntimeError if one is running."""
+        import socketserver
+        from datetime import datetime, timezone
+
+        if self.path.exists():
+            if request({"op": "status"}, self.path) is not None:
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()  # Left behind by a daemon that died
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    message = json.loads(self.rfile.readline())
+                except ValueError:
+                    return
+                reply = daemon.handle(message) if isinstance(message, dict) else {"error": "Bad request"}
+                self.wfile.write((json.dumps(reply) + "\n").encode())
+
+        server = socketserver.ThreadingUnixStreamServer(os.fspath(self.path), Handler)
+        server.daemon_threads = True
+        self._server = server
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        try:
+            server.serve_forever(poll_interval=SHUTDOWN_POLL_SECONDS)
+        finally:
+            server.server_close()
+            self.path.unlink(missing_ok=True)
+
+    def shutdown(self):
+        """Stop serving (callable from a handler thread)."""
+        import threading
+
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
@@ -0,0 +1,389 @@
+"""Dash server - asyncio HTTP server for the Dash UI and its data API.
+
+`python -m http.server` handles one request at a time, and the UI used to
+issue a request per product (last_run.json, history.jsonl) plus guessed
+Nexus file names. This server keeps serving the repo's static files and
+adds aggregated endpoints that return a whole view in one response:
+
+- /api/fleet: products.json with each product's last run and recent history
+- /api/nexus: every inbox request and outbox decision
+- /api/science: the science index
+- /api/events: server-sent events with live deltas (see below)
+
+API responses are built in a worker thread, cached in memory and rebuilt
+only when one of their input files changes (checked by mtime and size on
+each request). Every response carries an ETag; If-None-Match is answered
+with 304, and bodies are gzipped for clients that accept it.
+
+While at least one client is subscribed to /api/events, dash/runs and
+the Nexus directories are watched (see codemonkeys.core.watch). A change
+to a product's last_run.json or history.jsonl pushes a `product` event
+with just that product's state; Nexus inbox/outbox changes push the
+(small) `nexus` view; work order changes push a `work_order` event with
+the order's id, product, intent and status. With no subscribers nothing
+is watched.
+
+Usage:
+    asyncio.run(DashServer(Path(".")).serve_forever("127.0.0.1", 8080))
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+from email.utils import formatdate
+from pathlib import Path
+from typing import Callable
+from urllib.parse import unquote, urlsplit
+
+from codemonkeys.core import history
+from codemonkeys.core.watch import POLL_INTERVAL, make_watcher
+
+# Runs of history embedded per product (matches MAX_HISTORY in dash/js/app.js)
+HISTORY_LIMIT = 5
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+KEEPALIVE_SECONDS = 15.0
+
+EVENTS_ROUTE = "/api/events"
+
+# Directories whose changes are pushed to /api/events subscribers
+WATCH_DIRS = ["dash/runs", "nexus/inbox", "nexus/outbox", "nexus/work_orders"]
+
+# Idle SSE streams get a comment line this often (also detects closed clients)
+HEARTBEAT_SECONDS = 15.0
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def _load_json(path: Path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _signature(paths: list[Path]) -> tuple:
+    """Fingerprint files by mtime and size (missing files included)."""
+    signature = []
+    for path in paths:
+        try:
+            st = path.stat()
+            signature.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append((str(path), None, None))
+    return tuple(signature)
+
+
+def _product_ids(root: Path) -> list[str]:
+    data = _load_json(root / "dash/products.json") or {}
+    return [p.get("product_id") for p in data.get("products", []) if p.get("product_id")]
+
+
+def fleet_inputs(root: Path) -> list[Path]:
+    paths = [root / "dash/products.json"]
+    for product_id in _product_ids(root):
+        product_dir = root / "dash/runs" / product_id
+        paths += [product_dir / "last_run.json", history.history_path(product_dir)]
+    return paths
+
+
+def product_state(root: Path, product_id: str) -> dict:
+    """A product's last run and recent history (oldest first)."""
+    product_dir = root / "dash/runs" / product_id
+    return {
+        "last_run": _load_json(product_dir / "last_run.json"),
+        "history": history.tail(history.history_path(product_dir), HISTORY_LIMIT),
+    }
+
+
+def build_fleet(root: Path) -> dict:
+    """products.json with last_run and recent history per product."""
+    data = _load_json(root / "dash/products.json") or {}
+    products = [
+        {**product, **product_state(root, product.get("product_id", ""))}
+        for product in data.get("products", [])
+    ]
+    return {"schema_version": data.get("schema_version"), "products": products}
+
+
+def nexus_inputs(root: Path) -> list[Path]:
+    return [
+        root / "nexus/inbox",
+        root / "nexus/outbox",
+        *sorted((root / "nexus/inbox").glob("*.json")),
+        *sorted((root / "nexus/outbox").glob("*.json")),
+    ]
+
+
+def build_nexus(root: Path) -> dict:
+    """Every Nexus inbox request and outbox decision."""
+    def load_all(directory: Path) -> list[dict]:
+        docs = (_load_json(p) for p in sorted(directory.glob("*.json")))
+        return [d for d in docs if isinstance(d, dict)]
+
+    return {
+        "requests": load_all(root / "nexus/inbox"),
+        "decisions": load_all(root / "nexus/outbox"),
+    }
+
+
+def science_inputs(root: Path) -> list[Path]:
+    return [root / "dash/science_index.json"]
+
+
+def build_science(root: Path) -> dict:
+    """The science index, or an empty one if it has not been generated."""
+    return _load_json(root / "dash/science_index.json") or {"items": []}
+
+
+# route -> (input files, builder)
+API_ROUTES: dict[str, tuple[Callable[[Path], list[Path]], Callable[[Path], dict]]] = {
+    "/api/fleet": (fleet_inputs, build_fleet),
+    "/api/nexus": (nexus_inputs, build_nexus),
+    "/api/science": (science_inputs, build_science),
+}
+
+
+def build_deltas(root: Path, changed: set[str]) -> list[tuple[str, dict]]:
+    """
+    Turn a batch of changed paths into (event, data) pairs for /api/events.
+
+    The `nexus` event carries no data; the server fills in the Nexus view.
+    """
+    products = set()
+    work_orders = set()
+    nexus = False
+    for path in changed:
+        parts = path.split("/")
+        if parts[:2] == ["dash", "runs"] and len(parts) == 4 and parts[3] in (
+            "last_run.json", history.HISTORY_FILENAME
+        ):
+            products.add(parts[2])
+        elif parts[:2] == ["nexus", "work_orders"] and len(parts) == 3 and path.endswith(".json"):
+            if not parts[2].startswith("_"):
+                work_orders.add(path)
+        elif parts[:2] in (["nexus", "inbox"], ["nexus", "outbox"]):
+            nexus = True
+
+    deltas = [
+        ("product", {"product_id": product_id, **product_state(root, product_id)})
+        for product_id in sorted(products)
+    ]
+    for path in sorted(work_orders):
+        wo = _load_json(root / path)
+        if isinstance(wo, dict):
+            deltas.append(("work_order", {
+                "path": path,
+                **{k: wo.get(k) for k in ("job_id", "product_id", "intent", "status")},
+            }))
+        else:
+            deltas.append(("work_order", {"path": path, "removed": True}))
+    if nexus:
+        deltas.append(("nexus", {}))
+    return deltas
+
+
+class _Body:
+    """An encoded response body with its ETag and lazily gzipped variant."""
+
+    def __init__(self, data: bytes, content_type: str, etag: str):
+        self.data = data
+        self.content_type = content_type
+        self.etag = etag
+        self._gzipped: bytes | None = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.data, compresslevel=6, mtime=0)
+        return self._gzipped
+
+
+class DashServer:
+    """Serves the repo's static files and the aggregated Dash API."""
+
+    def __init__(self, root: Path = Path("."), watch_interval: float = POLL_INTERVAL):
+        self.root = Path(root).resolve()
+        self.watch_interval = watch_interval
+        # route -> (input signature, body)
+        self._cache: dict[str, tuple[tuple, _Body]] = {}
+        self._locks = {route: asyncio.Lock() for route in API_ROUTES}
+        self._subscribers: set[asyncio.Queue] = set()
+        self._watch_task: asyncio.Task | None = None
+
+    async def _watch(self):
+        """Fan out deltas for watched file changes to every subscriber."""
+        watcher = make_watcher(self.root, WATCH_DIRS, self.watch_interval)
+        async for changed in watcher.changes():
+            deltas = await asyncio.to_thread(build_deltas, self.root, changed)
+            for event, data in deltas:
+                if event == "nexus":
+                    data = json.loads((await self.api_body("/api/nexus")).data)
+                for queue in self._subscribers:
+                    queue.put_nowait((event, data))
+
+    async def stream_events(self, writer: asyncio.StreamWriter, version: str):
+        """Hold an SSE stream open, writing deltas until the client goes away."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch())
+        try:
+            head = (
+                f"{version} 200 OK\r\n"
+                "Content-Type: text/event-stream\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Connection: keep-alive\r\n\r\n"
+                "retry: 3000\n\n"
+            )
+            writer.write(head.encode("latin-1"))
+            await writer.drain()
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                    chunk = f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+                except asyncio.TimeoutError:
+                    chunk = ": ping\n\n"
+                writer.write(chunk.encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers and self._watch_task is not None:
+                self._watch_task.cancel()
+                self._watch_task = None
+
+    async def api_body(self, route: str) -> _Body:
+        """Return the cached body of an API route, rebuilding it if its inputs changed."""
+        inputs, build = API_ROUTES[route]
+        async with self._locks[route]:
+            signature = await asyncio.to_thread(lambda: _signature(inputs(self.root)))
+            cached = self._cache.get(route)
+            if cached and cached[0] == signature:
+                return cached[1]
+            payload = await asyncio.to_thread(build, self.root)
+            data = json.dumps(payload, separators=(",", ":")).encode()
+            body = _Body(data, "application/json", f'"{hashlib.sha256(data).hexdigest()[:32]}"')
+            self._cache[route] = (signature, body)
+            return body
+
+    def static_body(self, path: str) -> _Body | None:
+        """Read a static file under the root, or None if it is missing or outside it."""
+        target = (self.root / unquote(path).lstrip("/")).resolve()
+        if target != self.root and self.root not in target.parents:
+            return None
+        if target.is_dir():
+            target = target / "index.html"
+        try:
+            st = target.stat()
+            data = target.read_bytes()
+        except OSError:
+            return None
+        content_type = mimetypes.guess_type(target.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith(("javascript", "json")):
+            content_type += "; charset=utf-8"
+        return _Body(data, content_type, f'"{st.st_mtime_ns:x}-{st.st_size:x}"')
+
+    async def respond(self, method: str, target: str, headers: dict[str, str]) -> tuple[int, dict, bytes]:
+        """Build (status, headers, body) for one request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+
+        path = urlsplit(target).path
+        if path in API_ROUTES:
+            body = await self.api_body(path)
+        else:
+            body = await asyncio.to_thread(self.static_body, path)
+        if body is None:
+            return 404, {"Content-Type": "text/plain; charset=utf-8"}, b"Not Found\n"
+
+        response_headers = {
+            "Content-Type": body.content_type,
+            "ETag": body.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if body.etag in (t.strip() for t in headers.get("if-none-match", "").split(",")):
+            return 304, response_headers, b""
+
+        data = body.data
+        if len(data) >= GZIP_MIN_BYTES and "gzip" in headers.get("accept-encoding", ""):
+            data = body.gzipped()
+            response_headers["Content-Encoding"] = "gzip"
+        return 200, response_headers, data
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes or goes idle."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        asyncio.TimeoutError, ConnectionError):
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._write(writer, "HTTP/1.1", 400, {}, b"", close=True)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                if method == "GET" and urlsplit(target).path == EVENTS_ROUTE:
+                    await self.stream_events(writer, version)
+                    return
+
+                try:
+                    status, response_headers, body = await self.respond(method, target, headers)
+                except Exception as e:
+                    status, response_headers, body = 500, {}, f"{type(e).__name__}: {e}\n".encode()
+
+                connection = headers.get("connection", "").lower()
+                close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                await self._write(writer, version, status, response_headers, body, close, head_only=method == "HEAD")
+                if close:
+                    return
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _write(self, writer, version, status, headers, body, close, head_only=False):
+        lines = [f"{version} {status} {_REASONS.get(status, '')}"]
+        headers = {
+            **headers,
+            "Date": formatdate(usegmt=True),
+            "Content-Length": str(len(body)),
+            "Connection": "close" if close else "keep-alive",
+        }
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+    async def start(self, host: str = "", port: int = 8080) -> asyncio.Server:
+        """Start listening; returns the asyncio server."""
+        return await asyncio.start_server(self.handle, host or None, port)
+
+    async def serve_forever(self, host: str = "", port: int = 8080):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,160 @@
+"""Dossier metadata and links.
+
+load_metadata() reads only a dossier's leading YAML frontmatter block,
+stopping at the closing `---` instead of reading and splitting the whole
+markdown body as frontmatter.load() does. It parses with libyaml's
+CSafeLoader when PyYAML was built with it, and memoizes by (path, mtime,
+size), so repeated scans of unchanged dossiers cost one stat each.
+Results match frontmatter.load(path).metadata: {} when there is no
+(closed) frontmatter block or it is not a mapping.
+
+`dossier science-to-design` records the science dossier id in the design
+dossier's `evidence.science_source`. Looking that up per science dossier
+means re-parsing every design dossier each time (science x design
+parses); design_links() instead reads each design dossier once and
+returns the reverse map, which the science index, the planner and
+`dossier science-to-design --pending` share.
+
+Usage:
+    load_metadata(Path("docs/science/SCI-....md")).get("status")
+    links = design_links(Path("docs/dossiers"))
+    links.get("SCI-20251222-arqonhpo-runtime-optimization")
+    pending = pending_science(SCIENCE_DIR, DOSSIERS_DIR, links)
+"""
+import copy
+import fnmatch
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+SCIENCE_DIR = Path("docs/science")
+DOSSIERS_DIR = Path("docs/dossiers")
+
+# Same delimiter as python-frontmatter's YAML handler
+_BOUNDARY = re.compile(r"^-{3,}\s*$")
+
+_lock = threading.Lock()
+_metadata: dict[str, tuple[int, int, dict]] = {}
+
+
+def _read_frontmatter(path: str) -> dict[str, Any]:
+    """Read and parse the leading YAML block of a file (no caching)."""
+    lines = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                break
+        else:
+            return {}
+        if not _BOUNDARY.match(line):
+            return {}
+        for line in f:
+            if _BOUNDARY.match(line):
+                break
+            lines.append(line)
+        else:
+            return {}  # Unclosed block: not frontmatter
+    data = yaml.load("".join(lines), Loader=_Loader)
+    return data if isinstance(data, dict) else {}
+
+
+def load_metadata(path: Path | str) -> dict[str, Any]:
+    """
+    Return a dossier's frontmatter metadata, memoized by (path, mtime, size).
+
+    Raises OSError if the file cannot be read and yaml.YAMLError if the
+    frontmatter is malformed. The returned dict is the caller's to modify.
+    """
+    key = os.fspath(path)
+    st = os.stat(key)
+    with _lock:
+        cached = _metadata.get(key)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        cached = (st.st_mtime_ns, st.st_size, _read_frontmatter(key))
+        with _lock:
+            _metadata[key] = cached
+    return copy.deepcopy(cached[2])
+
+
+def design_source(dos_file: Path) -> str | None:
+    """Return the science dossier id a design dossier was converted from."""
+    try:
+        evidence = load_metadata(dos_file).get("evidence", {})
+    except Exception:
+        return None
+    return evidence.get("science_source") if isinstance(evidence, dict) else None
+
+
+def link_map(sources: Iterable[tuple[str, str | None]]) -> dict[str, str]:
+    """
+    Reverse (design path, science source) pairs into {science id: design path}.
+
+    If several design dossiers name the same source, the first one wins.
+    """
+    links: dict[str, str] = {}
+    for dos_path, source in sources:
+        if source:
+            links.setdefault(source, dos_path)
+    return links
+
+
+def design_links(dossiers_dir: Path) -> dict[str, str]:
+    """Map science dossier ids to their design dossier paths in one pass."""
+    return link_map(
+        (str(dos_file), design_source(dos_file))
+        for dos_file in sorted(dossiers_dir.glob("DOS-*.md"))
+    )
+
+
+def topic_slug(topic: str) -> str:
+    """Product slug a science topic converts to (DOS-<date>-<slug>.md)."""
+    return topic.lower().replace(" ", "-")
+
+
+def pending_science(
+    science_dir: Path,
+    dossiers_dir: Path,
+    links: dict[str, str] | None = None,
+) -> list[dict[str, str]]:
+    """
+    Find validated science dossiers that have no design dossier yet.
+
+    A science dossier is converted if a design dossier names it as its
+    evidence.science_source (links, from design_links, parsed once per
+    call) or, for older conversions, a DOS-*-<topic slug>.md exists.
+    Unreadable dossiers are skipped.
+    """
+    pending: list[dict[str, str]] = []
+    if not science_dir.exists():
+        return pending
+
+    if links is None:
+        links = design_links(dossiers_dir)
+    design_names = {p.name for p in dossiers_dir.glob("DOS-*.md")}
+
+    for sci_file in sorted(science_dir.glob("SCI-*.md")):
+        try:
+            meta = load_metadata(sci_file)
+        except Exception:
+            continue
+        if meta.get("status") != "validated":
+            continue
+
+        dossier_id = meta.get("dossier_id", "")
+        topic = meta.get("topic", sci_file.stem)
+        if dossier_id in links:
+            continue
+        if fnmatch.filter(design_names, f"DOS-*-{topic_slug(str(topic))}.md"):
+            continue
+
+        pending.append({"science_path": str(sci_file), "dossier_id": dossier_id, "topic": topic})
+    return pending
@@ -0,0 +1,177 @@
+"""Run history - append-only time series of a product's runs.
+
+`last_run.json` only holds the latest run and `gc_runs.py` deletes old
+run directories, so history is kept separately in
+`dash/runs/<product_id>/history.jsonl`: one compact JSON record per run,
+appended in completion order. Readers get everything they need (status,
+durations, spent minutes, token counters, test counts) from one
+sequential read of a small file instead of walking run directories.
+
+Records are appended in `ended_at` order, so a time-window query can
+bisect the file for its start offset and stop reading at the window end.
+
+Usage:
+    append_run(Path("dash/runs/my-product"), report)
+    read_history(path, since=datetime.now(timezone.utc) - timedelta(days=7))
+    tail(path, 5)
+"""
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+HISTORY_FILENAME = "history.jsonl"
+
+_BLOCK_SIZE = 1 << 16
+
+
+def history_path(product_dir: Path) -> Path:
+    """Return the history file of a product's runs directory."""
+    return Path(product_dir) / HISTORY_FILENAME
+
+
+def history_record(report: dict) -> dict:
+    """Reduce a last_run.json report to its compact history record."""
+    economy = report.get("banana_economy", {})
+    record = {
+        "run_id": report.get("run_id"),
+        "started_at": report.get("started_at"),
+        "ended_at": report.get("ended_at"),
+        "status": report.get("status"),
+        "spent_minutes": economy.get("spent_minutes"),
+        "budget_minutes": economy.get("budget_minutes"),
+        "spent_tokens": economy.get("spent_tokens"),
+        "budget_tokens": economy.get("budget_tokens"),
+    }
+    tests = report.get("tests")
+    if tests:
+        record["tests"] = {k: v for k, v in tests.items() if k != "cases"}
+    impact = report.get("test_impact")
+    if impact:
+        record["test_mode"] = impact.get("mode")
+        record["commit"] = impact.get("commit")
+    return record
+
+
+def append_run(product_dir: Path, report: dict) -> dict:
+    """Append a run report's history record to the product's history."""
+    record = history_record(report)
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+    path = history_path(product_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # One O_APPEND write per record keeps concurrent appends line-atomic
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+    return record
+
+
+def parse_time(value: str | datetime | None) -> datetime | None:
+    """Parse an ISO 8601 timestamp (naive times are taken as UTC)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _record_time(line: bytes) -> datetime | None:
+    try:
+        return parse_time(json.loads(line).get("ended_at"))
+    except (json.JSONDecodeError, AttributeError):
+        return None
+
+
+def _line_start(f, offset: int) -> int:
+    """Return the offset of the first line starting at or after offset."""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def _offset_since(f, size: int, since: datetime) -> int:
+    """Bisect for the offset of the first record that ended at or after since."""
+    lo, hi = 0, size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(_line_start(f, mid))
+        line = f.readline()
+        ended = _record_time(line) if line else None
+        if line and ended is not None and ended < since:
+            lo = mid + 1
+        else:
+            hi = mid
+    return _line_start(f, lo)
+
+
+def read_history(
+    path: Path,
+    since: str | datetime | None = None,
+    until: str | datetime | None = None,
+) -> list[dict]:
+    """Return the records whose ended_at falls in [since, until], oldest first."""
+    since, until = parse_time(since), parse_time(until)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    records = []
+    with f:
+        if since is not None:
+            f.seek(_offset_since(f, os.fstat(f.fileno()).st_size, since))
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn or partial line
+            ended = parse_time(record.get("ended_at"))
+            if since is not None and ended is not None and ended < since:
+                continue
+            if until is not None and ended is not None and ended > until:
+                break
+            records.append(record)
+    return records
+
+
+def tail(path: Path, count: int) -> list[dict]:
+    """Return the last `count` records, oldest first, reading from the end."""
+    if count <= 0:
+        return []
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        end = os.fstat(f.fileno()).st_size
+        data = b""
+        pos = end
+        while pos > 0 and data.count(b"\n") <= count:
+            pos = max(0, pos - _BLOCK_SIZE)
+            f.seek(pos)
+            data = f.read(end - pos)
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]  # First line may be partial
+    records = []
+    for line in lines[-count:]:
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records[-count:]
+
+
+def last_matching(path: Path, status: str) -> dict | None:
+    """Return the most recent record with the given status."""
+    match = None
+    for record in read_history(path):
+        if record.get("status") == status:
+            match = record
+    return match
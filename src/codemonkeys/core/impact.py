@@ -0,0 +1,246 @@
+"""Test impact selection - run only the tests a change can affect.
+
+Changed files come from `git diff` against the last green commit recorded
+in a product's last_run.json (plus untracked files). Each test file's
+dependencies are its transitive in-repo imports plus any repo paths it or
+those modules name as string literals (schemas, fixtures, data dirs). A
+test is selected when it, or one of its dependencies, changed.
+
+Selection falls back to a full run when it cannot be sure: no green
+commit yet, git cannot diff against it, a pytest/packaging config file
+changed, a Python file was deleted or renamed (imports of it no longer
+resolve, so the graph cannot tell who used it), or `full_every` impacted
+runs happened since the last full run.
+
+Per-file imports and path literals are parsed with `ast` and cached by
+content hash, so rebuilding the graph after a small change is cheap.
+"""
+import ast
+import subprocess
+from pathlib import Path
+
+from codemonkeys.core.cache import ContentHashCache, file_digest
+
+GRAPH_CACHE_PATH = Path(".codemonkeys/cache/import_graph.json")
+
+# Files whose change can affect any test
+CONFIG_FILES = {
+    "conftest.py",
+    "pyproject.toml",
+    "setup.cfg",
+    "setup.py",
+    "pytest.ini",
+    "tox.ini",
+    "requirements.txt",
+}
+
+# Roots that imports are resolved against (relative to the repo root)
+SEARCH_PATHS = ("", "src", "scripts")
+
+DEFAULT_FULL_EVERY = 10
+
+
+def git_head(root: Path = Path(".")) -> str | None:
+    """Return the current commit sha, or None outside a git checkout."""
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def changed_files(base: str, root: Path = Path(".")) -> list[str] | None:
+    """
+    List files changed since base (committed, staged, unstaged and untracked),
+    relative to root.
+
+    Returns None if git cannot diff against base (e.g. unknown commit).
+    """
+    diff = subprocess.run(
+        ["git", "diff", "--name-only", "--relative", base, "--"], cwd=root, capture_output=True, text=True
+    )
+    if diff.returncode != 0:
+        return None
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        cwd=root, capture_output=True, text=True,
+    )
+    files = set(diff.stdout.split("\n")) | set(untracked.stdout.split("\n"))
+    files.discard("")
+    return sorted(files)
+
+
+def _parse_references(source: str) -> dict:
+    """Extract imported module names and string literals from Python source."""
+    tree = ast.parse(source)
+    imports = []
+    literals = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend([alias.name, 0, []] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append([node.module or "", node.level, [a.name for a in node.names]])
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            value = node.value
+            if "/" in value and "\n" not in value and len(value) < 200:
+                literals.add(value.rstrip("/"))
+    return {"imports": imports, "literals": sorted(literals)}
+
+
+class ImportGraph:
+    """Dependency graph of the repo's Python files."""
+
+    def __init__(self, root: Path = Path("."), cache: ContentHashCache | None = None):
+        self.root = Path(root)
+        self.cache = cache
+        self._direct: dict[str, tuple[set[str], set[str]]] = {}
+
+    def _references(self, rel: str) -> dict:
+        path = self.root / rel
+        digest = file_digest(path)
+        if self.cache is not None and digest:
+            cached = self.cache.get(rel, digest)
+            if cached is not None:
+                return cached
+        try:
+            refs = _parse_references(path.read_text())
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+            refs = {"imports": [], "literals": []}
+        if self.cache is not None and digest:
+            self.cache.put(rel, digest, refs)
+        return refs
+
+    def _module_file(self, dotted: str) -> str | None:
+        parts = dotted.split(".")
+        for search in SEARCH_PATHS:
+            base = Path(search).joinpath(*parts) if parts[0] else Path(search)
+            for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+                if (self.root / candidate).is_file():
+                    return candidate.as_posix()
+        return None
+
+    def _resolve(self, rel: str, module: str, level: int, names: list[str]) -> set[str]:
+        if level:
+            package = Path(rel).parent
+            for _ in range(level - 1):
+                package = package.parent
+            prefix = ".".join(package.parts)
+            module = f"{prefix}.{module}" if module else prefix
+        found = set()
+        target = self._module_file(module) if module else None
+        if target:
+            found.add(target)
+        for name in names:
+            # `from pkg import submodule`
+            submodule = self._module_file(f"{module}.{name}" if module else name)
+            if submodule:
+                found.add(submodule)
+        return found
+
+    def direct(self, rel: str) -> tuple[set[str], set[str]]:
+        """Return (imported repo files, referenced repo paths) of one file."""
+        if rel not in self._direct:
+            refs = self._references(rel)
+            modules = set()
+            for module, level, names in refs["imports"]:
+                modules |= self._resolve(rel, module, level, names)
+            paths = {
+                literal for literal in refs["literals"]
+                if not literal.startswith("/") and (self.root / literal).exists()
+            }
+            self._direct[rel] = (modules, paths)
+        return self._direct[rel]
+
+    def dependencies(self, rel: str) -> tuple[set[str], set[str]]:
+        """Return the transitive (files, referenced paths) a file depends on."""
+        files, paths = {rel}, set()
+        stack = [rel]
+        while stack:
+            modules, literals = self.direct(stack.pop())
+            paths |= literals
+            for module in modules - files:
+                files.add(module)
+                stack.append(module)
+        return files, paths
+
+
+def affected_tests(
+    test_files: list[str],
+    changed: list[str],
+    graph: ImportGraph,
+) -> list[str] | None:
+    """
+    Return the test files affected by the changed files.
+
+    Returns None if a change can affect every test (config files), or if
+    a Python file was deleted or renamed away.
+    """
+    if any(Path(c).name in CONFIG_FILES for c in changed):
+        return None
+    if any(c.endswith(".py") and not (graph.root / c).exists() for c in changed):
+        return None
+
+    changed_set = set(changed)
+    selected = []
+    for test_file in test_files:
+        files, paths = graph.dependencies(test_file)
+        if files & changed_set or any(
+            c == p or c.startswith(p + "/") for c in changed for p in paths
+        ):
+            selected.append(test_file)
+    return selected
+
+
+def plan_selection(
+    test_files: list[str],
+    last_run: dict | None,
+    full_every: int = DEFAULT_FULL_EVERY,
+    root: Path = Path("."),
+) -> tuple[list[str] | None, dict]:
+    """
+    Decide which test files to run.
+
+    Returns (selected files, or None for a full run; test_impact info with
+    mode, base_commit, runs_since_full, reason and the selected count).
+    """
+    previous = (last_run or {}).get("test_impact") or {}
+    base = previous.get("green_commit")
+    runs_since_full = previous.get("runs_since_full", 0)
+
+    def full(reason: str):
+        return None, {"mode": "full", "base_commit": base, "runs_since_full": 0, "reason": reason}
+
+    if not base:
+        return full("no green commit recorded")
+    if runs_since_full + 1 >= full_every:
+        return full(f"periodic full run (every {full_every})")
+
+    changed = changed_files(base, root)
+    if changed is None:
+        return full(f"cannot diff against {base[:12]}")
+
+    cache = ContentHashCache(root / GRAPH_CACHE_PATH)
+    selected = affected_tests(test_files, changed, ImportGraph(root, cache))
+    cache.save()
+    if selected is None:
+        return full("test configuration changed")
+
+    return selected, {
+        "mode": "impacted",
+        "base_commit": base,
+        "runs_since_full": runs_since_full + 1,
+        "selected": len(selected),
+        "reason": f"{len(changed)} files changed since {base[:12]}",
+    }
+
+
+def record_outcome(impact: dict, last_run: dict | None, exit_code: int, root: Path = Path(".")) -> dict:
+    """
+    Complete test_impact info for the new report.
+
+    A passing run makes the current commit the new green commit; a failing
+    run keeps the previous one so the next diff still covers the change.
+    """
+    previous = (last_run or {}).get("test_impact") or {}
+    commit = git_head(root)
+    green = commit if exit_code == 0 and commit else previous.get("green_commit")
+    return {**impact, "commit": commit, "green_commit": green}
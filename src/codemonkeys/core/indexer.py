@@ -0,0 +1,214 @@
+"""Incremental indexers for `dash refresh`.
+
+An Index declares its inputs as named glob groups, how to extract one
+entry from each input file, and how to assemble the entries into the
+index document. refresh() records every input's mtime, size and sha256
+in a manifest together with its extracted entry. On the next refresh:
+
+- only files whose content changed are re-extracted (a touched file with
+  the same hash just has its manifest stat updated),
+- entries of deleted files are dropped,
+- an index is reassembled and written only if one of its entries
+  changed, its extractor changed (Index.version), or its output file is
+  missing or was modified by someone else.
+
+So the cost of a refresh is proportional to what changed, not to the
+number of dossiers. watch() keeps refreshing as input directories change.
+
+Usage:
+    manifest = Manifest()
+    science = load_script("generate_science_index").index()
+    results = refresh([science], manifest)
+    manifest.save()
+"""
+import asyncio
+import glob
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from codemonkeys.core.cache import file_digest
+from codemonkeys.core.watch import POLL_INTERVAL, make_watcher
+
+DEFAULT_MANIFEST_PATH = Path(".codemonkeys/cache/dash_manifest.json")
+
+
+class Index:
+    """An index document built from per-file entries."""
+
+    def __init__(
+        self,
+        name: str,
+        output: Path,
+        inputs: dict[str, str],
+        extract: Callable[[str, Path], Any],
+        assemble: Callable[[dict[str, dict[str, Any]]], dict],
+        version: str = "",
+    ):
+        """
+        inputs maps a group name to a glob. extract(group, path) returns the
+        JSON-serializable entry of one input file; assemble receives
+        {group: {path: entry}} (paths sorted) and returns the document.
+        """
+        self.name = name
+        self.output = Path(output)
+        self.inputs = inputs
+        self.extract = extract
+        self.assemble = assemble
+        self.version = version
+
+    def watch_dirs(self) -> list[str]:
+        """Directories containing this index's inputs (glob prefixes)."""
+        dirs = []
+        for pattern in self.inputs.values():
+            parts = []
+            for part in Path(pattern).parts:
+                if glob.has_magic(part):
+                    break
+                parts.append(part)
+            dirs.append(str(Path(*parts)) if parts else ".")
+        return dirs
+
+
+class IndexResult(NamedTuple):
+    name: str
+    output: Path
+    written: bool
+    changed: int  # entries re-extracted or removed
+    entries: int
+
+
+class Manifest:
+    """Per-index record of input stats, hashes and extracted entries."""
+
+    def __init__(self, path: Path = DEFAULT_MANIFEST_PATH):
+        self.path = Path(path)
+        self._dirty = False
+        try:
+            self.indices: dict[str, dict] = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.indices = {}
+
+    def section(self, index: Index) -> dict:
+        key = f"{index.name}:{index.output}"
+        section = self.indices.get(key)
+        if section is None or section.get("version") != index.version:
+            section = {"version": index.version, "files": {}, "output_stat": None}
+            self.indices[key] = section
+            self._dirty = True
+        return section
+
+    def touch(self):
+        self._dirty = True
+
+    def save(self):
+        """Write the manifest atomically if anything changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.indices))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def _stat(path: Path | str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def refresh_index(index: Index, manifest: Manifest, force: bool = False) -> IndexResult:
+    """Bring one index up to date, re-extracting only changed inputs."""
+    section = manifest.section(index)
+    files: dict[str, dict] = section["files"]
+    seen = set()
+    changed = 0
+
+    for group, pattern in index.inputs.items():
+        for path in sorted(glob.glob(pattern)):
+            seen.add(path)
+            stat = _stat(path)
+            record = files.get(path)
+            same_group = record is not None and record["group"] == group
+            if not force and same_group and record["stat"] == stat:
+                continue
+            digest = file_digest(path)
+            if not force and same_group and record["sha256"] == digest:
+                record["stat"] = stat
+                manifest.touch()
+                continue
+            files[path] = {
+                "group": group,
+                "stat": stat,
+                "sha256": digest,
+                "value": index.extract(group, Path(path)),
+            }
+            changed += 1
+
+    for path in set(files) - seen:
+        del files[path]
+        changed += 1
+
+    written = False
+    if changed or force or _stat(index.output) != section["output_stat"]:
+        entries: dict[str, dict[str, Any]] = {group: {} for group in index.inputs}
+        for path in sorted(files):
+            entries[files[path]["group"]][path] = files[path]["value"]
+        document = index.assemble(entries)
+
+        index.output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index.output.with_suffix(index.output.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(document, indent=2))
+        os.replace(tmp_path, index.output)
+        section["output_stat"] = _stat(index.output)
+        written = True
+
+    if changed or written:
+        manifest.touch()
+    return IndexResult(index.name, index.output, written, changed, len(files))
+
+
+def refresh(indices: list[Index], manifest: Manifest, force: bool = False) -> list[IndexResult]:
+    """Refresh every index and save the manifest."""
+    results = [refresh_index(index, manifest, force) for index in indices]
+    manifest.save()
+    return results
+
+
+def watch(
+    indices: list[Index],
+    manifest: Manifest,
+    on_refresh: Callable[[list[IndexResult], set[str]], None],
+    interval: float = POLL_INTERVAL,
+    stop: threading.Event | None = None,
+):
+    """
+    Refresh indices whenever files in their input directories change.
+
+    on_refresh(results, changed paths) is called after each refresh.
+    Runs until stop is set (or KeyboardInterrupt).
+    """
+    stop = stop or threading.Event()
+    dirs = sorted({d for index in indices for d in index.watch_dirs()})
+
+    async def consume():
+        async for changed in make_watcher(Path("."), dirs, interval).changes():
+            results = await asyncio.to_thread(refresh, indices, manifest)
+            on_refresh(results, changed)
+
+    async def run():
+        task = asyncio.create_task(consume())
+        while not stop.is_set() and not task.done():
+            await asyncio.sleep(min(interval, 0.1))
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
@@ -0,0 +1,97 @@
+"""Job runner - run a work order's command under its wall-time budget.
+
+Work orders carry `budget.max_seconds`. Child processes are started in
+their own process group (session) so that on timeout the whole tree -
+pytest and its workers, conda wrappers, pip - is terminated, then killed
+after a grace period. Output produced before the deadline is kept and
+carried by the JobTimeout exception.
+
+In-process entry points cannot be killed, so anything with a budget runs
+through run_command.
+
+Usage:
+    code, output = run_command([sys.executable, "-m", "pytest"], timeout=300)
+"""
+import os
+import signal
+import subprocess
+
+# Exit code recorded for timed-out jobs (as coreutils `timeout`)
+TIMEOUT_EXIT_CODE = 124
+
+# Seconds between SIGTERM and SIGKILL of a timed-out process group
+KILL_GRACE_SECONDS = 5.0
+
+
+class JobTimeout(Exception):
+    """A job exceeded its wall-time budget."""
+
+    def __init__(self, seconds: float, output: str = ""):
+        super().__init__(f"Timed out after {seconds:g}s")
+        self.seconds = seconds
+        self.output = output
+
+
+def _signal_group(proc: subprocess.Popen, sig: int):
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, sig)
+        elif sig == getattr(signal, "SIGKILL", None):
+            proc.kill()
+        else:
+            proc.terminate()
+    except (ProcessLookupError, PermissionError):
+        pass  # Already gone
+
+
+def terminate_group(proc: subprocess.Popen, grace: float = KILL_GRACE_SECONDS):
+    """SIGTERM a process group, then SIGKILL it if it outlives the grace period."""
+    _signal_group(proc, signal.SIGTERM)
+    try:
+        proc.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        _signal_group(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+        proc.wait()
+
+
+def run_command(
+    cmd: list[str],
+    timeout: float | None = None,
+    cwd: str | os.PathLike | None = None,
+    grace: float = KILL_GRACE_SECONDS,
+    stderr: int | None = subprocess.STDOUT,
+) -> tuple[int, str]:
+    """
+    Run a command and return (exit_code, output).
+
+    stderr is merged into the output by default; pass subprocess.DEVNULL
+    to drop it.
+
+    Raises JobTimeout, carrying the output produced so far, if the command
+    is still running after timeout seconds; its process group is killed.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+        text=True,
+        start_new_session=os.name == "posix",
+    )
+    try:
+        output, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        terminate_group(proc, grace)
+        try:
+            # Collects everything read before and after the deadline
+            output, _ = proc.communicate(timeout=grace)
+        except subprocess.TimeoutExpired:
+            # A descendant left the group and still holds the pipe
+            proc.stdout.close()
+            output = ""
+        raise JobTimeout(timeout, output or "")
+    except BaseException:
+        terminate_group(proc, grace)
+        raise
+    return proc.returncode, output
+
@@ -0,0 +1,104 @@
+"""Retry policies - classify failed work orders and decide whether to retry.
+
+Not every non-zero exit means the product is broken. A failed attempt
+falls into one of three classes:
+- timeout: the order ran past budget.max_seconds, or pytest-timeout
+  fired inside the run
+- infra_error: the run itself broke. This covers a pytest exit code
+  other than "tests failed", or output showing a transient condition such
+  as a locked database or file, or a reset connection
+- failure: a genuine failure (tests or validation failed)
+
+Each intent has a RetryPolicy saying how many attempts an order gets and
+which classes are worth retrying. An order may override fields of its
+intent's policy under "retry". Retries wait with exponential backoff and
+jitter, so orders that failed together do not retry in lockstep.
+
+Usage:
+    failure = classify_failure("test", exit_code, output)
+    policy = retry_policy(wo)
+    if policy.should_retry(failure, attempts_so_far):
+        time_to_wait = policy.delay(attempts_so_far)
+"""
+import random
+import re
+from typing import NamedTuple
+
+from codemonkeys.core.jobs import TIMEOUT_EXIT_CODE
+
+TIMEOUT = "timeout"
+INFRA_ERROR = "infra_error"
+FAILURE = "failure"
+FAILURE_CLASSES = (TIMEOUT, INFRA_ERROR, FAILURE)
+
+# Exit codes that mean the run broke rather than its checks failing.
+# pytest: 2 interrupted, 3 internal error, 4 usage error.
+INFRA_EXIT_CODES = {
+    "test": {2, 3, 4},
+    "regenerate_report": {2, 3, 4},
+}
+
+# pytest-timeout's banner, for orders whose tests time out individually
+TIMEOUT_OUTPUT = re.compile(r"\+{3,} Timeout \+{3,}")
+
+TRANSIENT_OUTPUT = re.compile(
+    r"database is locked"
+    r"|Resource temporarily unavailable"
+    r"|BlockingIOError"
+    r"|Text file busy"
+    r"|Connection (?:reset|refused|aborted)"
+    r"|Temporary failure in name resolution"
+    r"|Unable to create '[^']*\.lock': File exists",  # git index.lock
+    re.IGNORECASE,
+)
+
+
+class RetryPolicy(NamedTuple):
+    """How often, and after which failures, an order is retried."""
+
+    max_attempts: int = 2
+    retry_on: tuple[str, ...] = (TIMEOUT, INFRA_ERROR)
+    base_delay_seconds: float = 5.0
+    max_delay_seconds: float = 300.0
+
+    def should_retry(self, failure: str | None, attempts: int) -> bool:
+        """True if an order whose attempt number `attempts` failed with `failure` gets another."""
+        return failure in self.retry_on and attempts < self.max_attempts
+
+    def delay(self, attempts: int, rng: random.Random | None = None) -> float:
+        """Seconds to wait before the next attempt (exponential, with equal jitter)."""
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempts - 1))
+        return (rng or random).uniform(ceiling / 2, ceiling)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+RETRY_POLICIES = {
+    "validate": RetryPolicy(max_attempts=2),
+    "test": RetryPolicy(max_attempts=3),
+    "regenerate_report": RetryPolicy(max_attempts=2),
+    # Writes the design dossier; a rerun after a partial write would clash
+    "science_to_design": RetryPolicy(max_attempts=1),
+    "gc_runs": RetryPolicy(max_attempts=2),
+    "drift_check": RetryPolicy(max_attempts=2),
+}
+
+
+def classify_failure(intent: str | None, exit_code: int, output: str = "", timed_out: bool = False) -> str | None:
+    """Classify a finished attempt; None if it succeeded."""
+    if exit_code == 0 and not timed_out:
+        return None
+    if timed_out or exit_code == TIMEOUT_EXIT_CODE or TIMEOUT_OUTPUT.search(output or ""):
+        return TIMEOUT
+    if exit_code in INFRA_EXIT_CODES.get(intent, ()) or TRANSIENT_OUTPUT.search(output or ""):
+        return INFRA_ERROR
+    return FAILURE
+
+
+def retry_policy(wo: dict) -> RetryPolicy:
+    """The intent's policy with the order's own "retry" overrides applied."""
+    policy = RETRY_POLICIES.get(wo.get("intent"), DEFAULT_RETRY_POLICY)
+    overrides = {k: v for k, v in (wo.get("retry") or {}).items() if k in RetryPolicy._fields}
+    if "retry_on" in overrides:
+        overrides["retry_on"] = tuple(overrides["retry_on"])
+    return policy._replace(**overrides)
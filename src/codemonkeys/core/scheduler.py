@@ -0,0 +1,206 @@
+"""Cadence-aware scheduler for dash/schedules.
+
+Each (product, intent) job of an enabled schedule with a timed cadence
+(hourly, daily, weekly) is due one cadence interval after its last
+completion, or immediately if it never ran. Due times live in a min-heap,
+so finding the next job is O(1) and rescheduling is O(log n); the daemon
+sleeps until the earliest due time instead of re-planning every schedule
+on every tick.
+
+A job that failed (or whose dispatch raised) is retried after
+FAILURE_RETRY_SECONDS, or its cadence interval if that is shorter,
+rather than waiting out a whole cadence period.
+
+Completion times persist in .codemonkeys/scheduler.json so a restarted
+daemon does not re-run jobs that already ran this cadence period.
+Schedule files are re-read only when the directory's files change.
+"""
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+CADENCES = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+DEFAULT_STATE_PATH = Path(".codemonkeys/scheduler.json")
+
+# Job outcomes that are retried early instead of one cadence later
+FAILED_STATUSES = {"failed", "timed_out", "error"}
+FAILURE_RETRY_SECONDS = 15 * 60
+
+
+def job_key(product_id: str, intent: str) -> str:
+    return f"{product_id}:{intent}"
+
+
+def _timestamp(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _isoformat(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class Scheduler:
+    """Priority queue of next-due times per (product, intent)."""
+
+    def __init__(self, schedules_dir: Path, state_path: Path = DEFAULT_STATE_PATH):
+        self.schedules_dir = Path(schedules_dir)
+        self.state_path = Path(state_path)
+        # key -> (product_id, job, interval seconds)
+        self.jobs: dict[str, tuple[str, dict, float]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._due: dict[str, float] = {}
+        self._signature: tuple | None = None
+        try:
+            self.state: dict[str, dict] = json.loads(self.state_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.state = {}
+
+    def _dir_signature(self) -> tuple:
+        if not self.schedules_dir.exists():
+            return ()
+        return tuple(
+            (p.name, p.stat().st_mtime_ns)
+            for p in sorted(self.schedules_dir.glob("*.json"))
+        )
+
+    def reload(self) -> bool:
+        """Re-read schedules if any schedule file changed. Returns True if reloaded."""
+        signature = self._dir_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+
+        jobs = {}
+        for name, _ in signature:
+            try:
+                schedule = json.loads((self.schedules_dir / name).read_text())
+            except (OSError, json.JSONDecodeError):
+                continue
+            interval = CADENCES.get(schedule.get("cadence"))
+            if not schedule.get("enabled", False) or interval is None:
+                continue
+            product_id = schedule.get("product_id", "unknown")
+            seed = _timestamp(schedule.get("last_run"))
+            for job in schedule.get("jobs", []):
+                key = job_key(product_id, job.get("intent", "validate"))
+                jobs[key] = (product_id, job, interval.total_seconds())
+                if seed is not None and key not in self.state:
+                    self.state[key] = {"completed_at": _isoformat(seed)}
+        self.jobs = jobs
+
+        self._heap = []
+        self._due = {}
+        for key in jobs:
+            record = self.state.get(key, {})
+            last = _timestamp(record.get("completed_at"))
+            self._push(key, last + self._delay(key, record.get("status")) if last is not None else 0.0)
+        return True
+
+    def _delay(self, key: str, status: str | None) -> float:
+        """Seconds from a job finishing with status until it is due again."""
+        interval = self.jobs[key][2]
+        if status in FAILED_STATUSES:
+            return min(interval, FAILURE_RETRY_SECONDS)
+        return interval
+
+    def _push(self, key: str, due_at: float):
+        # Superseded heap entries are skipped lazily (see _valid)
+        self._due[key] = due_at
+        heapq.heappush(self._heap, (due_at, key))
+
+    def _valid(self, entry: tuple[float, str]) -> bool:
+        due_at, key = entry
+        return key in self.jobs and self._due.get(key) == due_at
+
+    def next_due(self) -> float | None:
+        """Return the earliest due time (epoch seconds), or None if nothing is scheduled."""
+        while self._heap and not self._valid(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list[str]:
+        """Remove and return every job key due at or before now."""
+        due = []
+        while True:
+            next_at = self.next_due()
+            if next_at is None or next_at > now:
+                return due
+            _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            due.append(key)
+
+    def complete(self, key: str, finished_at: float, status: str = "completed"):
+        """Record a finished job and schedule its next run (sooner if it failed)."""
+        self.state[key] = {"completed_at": _isoformat(finished_at), "status": status}
+        if key in self.jobs:
+            self._push(key, finished_at + self._delay(key, status))
+        self.save()
+
+    def save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.state, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.state_path)
+
+
+def run_loop(
+    scheduler: Scheduler,
+    dispatch: Callable[[list[str]], dict[str, str]],
+    once: bool = False,
+    max_sleep: float = 60.0,
+    stop: threading.Event | None = None,
+    clock: Callable[[], float] = time.time,
+    on_error: Callable[[list[str], Exception], None] | None = None,
+):
+    """
+    Dispatch due jobs until stopped.
+
+    dispatch(keys) runs the due jobs and returns {key: status}. The loop
+    then sleeps until the next due time, waking at least every max_sleep
+    seconds to pick up schedule changes (and to honour stop).
+
+    If dispatch raises, on_error(keys, exc) is called (by default the
+    traceback goes to stderr) and the keys are recorded as "error", so
+    they are retried like failed jobs and the daemon keeps running.
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        scheduler.reload()
+        due = scheduler.pop_due(clock())
+        if due:
+            try:
+                statuses = dispatch(due)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(due, e)
+                else:
+                    traceback.print_exception(e, file=sys.stderr)
+                statuses = {key: "error" for key in due}
+            finished_at = clock()
+            for key in due:
+                scheduler.complete(key, finished_at, statuses.get(key, "completed"))
+        if once:
+            return
+        next_at = scheduler.next_due()
+        timeout = max_sleep if next_at is None else min(max_sleep, max(0.0, next_at - clock()))
+        stop.wait(timeout)
@@ -0,0 +1,146 @@
+"""Schema registry - compiled JSON Schema validators shared by all checks.
+
+`jsonschema.validate()` re-checks the schema and builds a new validator on
+every call. This module loads each schema file once, checks it once,
+builds its Draft*Validator once and reuses it until the file, or any
+local schema it could `$ref`, changes on disk (validators are keyed by
+the resolved path, mtime and size of every schema in SCHEMA_DIRS).
+
+Schemas can be referenced by path or by short id, which is the file name
+without `.schema.json` (e.g. "last_run", "decision", "design_dossier"),
+looked up in SCHEMA_DIRS. `$ref`s to other local schemas resolve against
+every schema in SCHEMA_DIRS by `$id` or file name, without network access.
+
+Usage:
+    from codemonkeys.core import schemas
+    schemas.validate(data, "last_run")          # raises ValidationError
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+try:
+    from jsonschema.exceptions import best_match
+    from jsonschema.validators import validator_for
+
+    HAS_JSONSCHEMA = True
+except ImportError:
+    HAS_JSONSCHEMA = False
+
+try:
+    from referencing import Registry, Resource
+    from referencing.jsonschema import DRAFT202012
+
+    HAS_REFERENCING = True
+except ImportError:
+    HAS_REFERENCING = False
+
+SCHEMA_DIRS = (
+    Path("dash/schemas"),
+    Path("nexus/schemas"),
+    Path("docs/schemas"),
+    Path("schemas"),
+)
+
+_lock = threading.Lock()
+_schemas: dict[tuple, dict] = {}
+_validators: dict[tuple, Any] = {}
+_registries: dict[tuple, Any] = {}
+
+
+def schema_path(schema: str | Path) -> Path:
+    """Resolve a schema id or path to a schema file path."""
+    path = Path(schema)
+    if path.suffix == ".json":
+        return path
+    for directory in SCHEMA_DIRS:
+        candidate = directory / f"{schema}.schema.json"
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"Unknown schema: {schema}")
+
+
+def _stat_key(path: Path) -> tuple:
+    resolved = path.resolve()
+    st = resolved.stat()
+    return (str(resolved), st.st_mtime_ns, st.st_size)
+
+
+def load_schema(schema: str | Path) -> dict:
+    """Load (and memoize) a schema document."""
+    key = _stat_key(schema_path(schema))
+    with _lock:
+        cached = _schemas.get(key)
+    if cached is None:
+        cached = json.loads(Path(key[0]).read_text())
+        with _lock:
+            _schemas[key] = cached
+    return cached
+
+
+def _registry_key() -> tuple:
+    """Stat keys of every schema in SCHEMA_DIRS, in path order."""
+    files = sorted(p for d in SCHEMA_DIRS if d.exists() for p in d.glob("*.schema.json"))
+    return tuple(_stat_key(p) for p in files)
+
+
+def _local_registry(key: tuple):
+    """Build a referencing.Registry of the schemas listed in a _registry_key()."""
+    with _lock:
+        registry = _registries.get(key)
+    if registry is not None:
+        return registry
+
+    resources = []
+    for path in (Path(k[0]) for k in key):
+        try:
+            contents = load_schema(path)
+        except (OSError, json.JSONDecodeError):
+            continue
+        resource = Resource.from_contents(contents, default_specification=DRAFT202012)
+        resources.append((path.name, resource))
+        if contents.get("$id"):
+            resources.append((contents["$id"], resource))
+    registry = Registry().with_resources(resources)
+    with _lock:
+        _registries.clear()
+        _registries[key] = registry
+    return registry
+
+
+def get_validator(schema: str | Path):
+    """Return the compiled validator for a schema, building it at most once."""
+    if not HAS_JSONSCHEMA:
+        raise ImportError("jsonschema is required for schema validation")
+
+    registry_key = _registry_key() if HAS_REFERENCING else ()
+    key = (_stat_key(schema_path(schema)), registry_key)
+    with _lock:
+        validator = _validators.get(key)
+    if validator is not None:
+        return validator
+
+    contents = load_schema(schema)
+    cls = validator_for(contents)
+    cls.check_schema(contents)
+    if HAS_REFERENCING:
+        validator = cls(contents, registry=_local_registry(registry_key))
+    else:
+        validator = cls(contents)
+    with _lock:
+        _validators[key] = validator
+    return validator
+
+
+def validate(instance: Any, schema: str | Path):
+    """
+    Validate one document against a schema.
+
+    Raises jsonschema.ValidationError with the same best-match error that
+    jsonschema.validate() would report.
+    """
+    error = best_match(get_validator(schema).iter_errors(instance))
+    if error is not None:
+        raise error
+
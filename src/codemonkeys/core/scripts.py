@@ -0,0 +1,137 @@
+"""In-process access to the factory scripts in scripts/.
+
+The CLI used to shell out to `python scripts/<name>.py` for every command,
+paying interpreter startup and re-importing jsonschema/frontmatter/rich on
+each hop. Scripts expose `main(argv)` so commands can call them directly;
+`use_subprocess=True` keeps the old isolated behaviour as a fallback.
+"""
+import importlib
+import io
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+SCRIPTS_DIR = Path("scripts")
+
+
+def load_script(name: str) -> ModuleType:
+    """Import scripts/<name>.py as a module (scripts/ is resolved from cwd)."""
+    scripts_dir = str(SCRIPTS_DIR.resolve())
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return importlib.import_module(name)
+
+
+def exit_code_of(code: Any) -> int:
+    """Normalize a main() return value or SystemExit.code to an exit code."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    return 1
+
+
+def run_script(name: str, args: list[str], use_subprocess: bool = False) -> int:
+    """Run a script's main(args) in-process, or in a fresh interpreter."""
+    if use_subprocess:
+        cmd = [sys.executable, str(SCRIPTS_DIR / f"{name}.py"), *args]
+        return subprocess.run(cmd, check=False).returncode
+
+    module = load_script(name)
+    try:
+        return exit_code_of(module.main(args))
+    except SystemExit as e:
+        return exit_code_of(e.code)
+
+
+class _ThreadLocalStream:
+    """Stream proxy that routes writes to a per-thread capture when one is set.
+
+    Everything else, including the binary `buffer`, is the real stream's.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    @property
+    def _capture(self):
+        return getattr(self._local, "capture", None)
+
+    @_capture.setter
+    def _capture(self, value):
+        self._local.capture = value
+
+    def write(self, data):
+        target = self._capture if self._capture is not None else self._stream
+        return target.write(data)
+
+    def flush(self):
+        target = self._capture if self._capture is not None else self._stream
+        return target.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+_capture_lock = threading.Lock()
+_capture_depth = 0
+_proxies: tuple[_ThreadLocalStream, _ThreadLocalStream] | None = None
+
+
+def _install_proxies() -> tuple[_ThreadLocalStream, _ThreadLocalStream]:
+    global _capture_depth, _proxies
+    with _capture_lock:
+        if _capture_depth == 0:
+            _proxies = (_ThreadLocalStream(sys.stdout), _ThreadLocalStream(sys.stderr))
+            sys.stdout, sys.stderr = _proxies
+        _capture_depth += 1
+        return _proxies
+
+
+def _remove_proxies():
+    global _capture_depth, _proxies
+    with _capture_lock:
+        _capture_depth -= 1
+        if _capture_depth == 0 and _proxies is not None:
+            sys.stdout, sys.stderr = _proxies[0]._stream, _proxies[1]._stream
+            _proxies = None
+
+
+def _call_into(func: Callable[..., Any], out: io.StringIO, err: io.StringIO, args, kwargs) -> int:
+    """Call an entry point with this thread's stdout/stderr sent to out/err."""
+    out_proxy, err_proxy = _install_proxies()
+    out_proxy._capture, err_proxy._capture = out, err
+    try:
+        try:
+            return exit_code_of(func(*args, **kwargs))
+        except SystemExit as e:
+            return exit_code_of(e.code)
+        except Exception as e:
+            err.write(f"{type(e).__name__}: {e}\n")
+            return 2
+    finally:
+        out_proxy._capture = err_proxy._capture = None
+        _remove_proxies()
+
+
+def call_captured(func: Callable[..., Any], *args, **kwargs) -> tuple[int, str]:
+    """
+    Call an entry point in-process and capture everything it prints.
+
+    Capture is per thread, so concurrent executor workers each get only
+    their own output. Returns (exit_code, output).
+    """
+    captured = io.StringIO()
+    code = _call_into(func, captured, captured, args, kwargs)
+    return code, captured.getvalue()
+
+
+def call_captured_streams(func: Callable[..., Any], *args, **kwargs) -> tuple[int, str, str]:
+    """Like call_captured, but keep stdout and stderr apart: (exit_code, stdout, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    code = _call_into(func, out, err, args, kwargs)
+    return code, out.getvalue(), err.getvalue()
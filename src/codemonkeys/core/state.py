@@ -0,0 +1,338 @@
+"""Fleet state store - SQLite index over the factory's JSON artifacts.
+
+The JSON files under dash/ and nexus/ remain the source of truth and the
+exchange format. This store indexes them so that status queries, planning
+and Nexus processing become indexed lookups instead of re-opening and
+re-parsing every file on each call.
+
+Syncing is incremental. A directory whose mtime is unchanged since the
+last sync is not listed again, so a sync costs one stat per directory
+rather than per file. Within a changed directory, a file is only
+re-parsed when its (mtime, size) changed, and files that disappeared are
+dropped. This relies on writers replacing files atomically (tmp file +
+os.replace), as every writer here does; `sync(full=True)` rescans every
+file for artifacts edited in place. Writers that already hold the new
+document can index it directly with `put()` instead of a rescan.
+
+Work orders are not indexed here: codemonkeys.core.work_orders keeps
+their queue index next to the files.
+
+Usage:
+    store = StateStore()
+    store.sync("requests", Path("nexus/inbox"))
+    store.status_counts("requests")
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from codemonkeys.core.work_orders import RACY_NS
+
+DEFAULT_DB_PATH = Path(".codemonkeys/state.db")
+
+# kind -> (default directory, glob pattern, key field)
+COLLECTIONS: dict[str, tuple[Path, str, str]] = {
+    "runs": (Path("dash/runs"), "*/last_run.json", "product_id"),
+    "requests": (Path("nexus/inbox"), "*.json", "request_id"),
+    "decisions": (Path("nexus/outbox"), "*.json", "decision_id"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    key TEXT,
+    product_id TEXT,
+    status TEXT,
+    priority INTEGER,
+    mtime_ns INTEGER,
+    size INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, path)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents (kind, status, priority DESC);
+CREATE INDEX IF NOT EXISTS idx_documents_product ON documents (kind, product_id);
+CREATE INDEX IF NOT EXISTS idx_documents_key ON documents (kind, key);
+CREATE TABLE IF NOT EXISTS directories (
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER,
+    PRIMARY KEY (kind, path)
+);
+"""
+
+
+def _extract(kind: str, path: Path, data: dict) -> tuple[Any, ...]:
+    """Pull the indexed columns (key, product_id, status, priority) from a document."""
+    key_field = COLLECTIONS[kind][2] if kind in COLLECTIONS else "key"
+    key = data.get(key_field) or path.stem
+    if kind == "runs":
+        product_id = data.get("product_id") or path.parent.name
+    elif kind == "decisions":
+        product_id = data.get("target")
+    else:
+        product_id = data.get("product_id")
+    priority = data.get("priority")
+    if not isinstance(priority, int):
+        priority = None
+    return key, product_id, data.get("status"), priority
+
+
+class StateStore:
+    """SQLite (WAL mode) index of runs, the product registry and Nexus artifacts."""
+
+    def __init__(self, db_path: Path | str = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Executor workers share one store, so the connection is used from
+        # several threads; _lock serializes statements on it.
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = threading.RLock()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Import / write-through
+    # ------------------------------------------------------------------
+
+    def put(self, kind: str, path: Path | str, data: dict):
+        """Index (or re-index) a single document after it was written."""
+        path = Path(path)
+        try:
+            st = path.stat()
+            mtime_ns, size = st.st_mtime_ns, st.st_size
+        except OSError:
+            mtime_ns, size = None, None
+        key, product_id, status, priority = _extract(kind, path, data)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(kind, path, key, product_id, status, priority, mtime_ns, size, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, str(path), key, product_id, status, priority, mtime_ns, size, json.dumps(data)),
+            )
+
+    def sync(
+        self,
+        kind: str,
+        directory: Path | None = None,
+        pattern: str | None = None,
+        full: bool = False,
+    ) -> int:
+        """
+        Bring one collection in line with the files on disk.
+
+        Directories unchanged since the last sync are skipped, and only
+        files whose (mtime, size) changed are parsed; full=True checks
+        every file. Returns the number of files (re-)indexed.
+        """
+        default_dir, default_pattern, _ = COLLECTIONS[kind]
+        directory = Path(directory) if directory is not None else default_dir
+        pattern = pattern or default_pattern
+        *parents, name_pattern = pattern.split("/")
+
+        clause, params = self._where(kind, directory)
+        known = {
+            row["path"]: (row["mtime_ns"], row["size"])
+            for row in self._query(f"SELECT path, mtime_ns, size FROM documents WHERE {clause}", params)
+        }
+        by_parent: dict[str, list[str]] = {}
+        for path in known:
+            by_parent.setdefault(str(Path(path).parent), []).append(path)
+        known_dirs = {
+            row["path"]: row["mtime_ns"]
+            for row in self._query(
+                f"SELECT path, mtime_ns FROM directories WHERE {clause}",
+                params,
+            )
+        }
+
+        # Only the directories holding the files are skipped when
+        # unchanged; the (few) levels above them are always listed
+        leaves = [directory] if directory.is_dir() else []
+        for part in parents:
+            leaves = [d for leaf in leaves for d in leaf.glob(part) if d.is_dir()]
+
+        # A directory changed within RACY_NS of the scan may change again
+        # without its mtime moving, so it is not recorded as synced
+        racy_after = time.time_ns() - RACY_NS
+        synced_dirs = {}
+        seen = set()
+        indexed = 0
+        for leaf in leaves:
+            try:
+                dir_mtime_ns = leaf.stat().st_mtime_ns
+            except OSError:
+                continue
+            if dir_mtime_ns < racy_after:
+                synced_dirs[str(leaf)] = dir_mtime_ns
+            if not full and known_dirs.get(str(leaf)) == dir_mtime_ns:
+                seen.update(by_parent.get(str(leaf), ()))
+                continue
+
+            for path in leaf.glob(name_pattern):
+                if path.name.startswith("_"):  # Skip meta files
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                seen.add(str(path))
+                if known.get(str(path)) == (st.st_mtime_ns, st.st_size):
+                    continue
+                try:
+                    data = json.loads(path.read_text())
+                except (json.JSONDecodeError, OSError):
+                    continue
+                self.put(kind, path, data)
+                indexed += 1
+
+        stale = [p for p in known if p not in seen]
+        with self._lock, self.conn:
+            if stale:
+                self.conn.executemany(
+                    "DELETE FROM documents WHERE kind = ? AND path = ?",
+                    [(kind, p) for p in stale],
+                )
+            self.conn.execute(f"DELETE FROM directories WHERE {clause}", params)
+            self.conn.executemany(
+                "INSERT INTO directories (kind, path, mtime_ns) VALUES (?, ?, ?)",
+                [(kind, path, mtime_ns) for path, mtime_ns in synced_dirs.items()],
+            )
+        return indexed
+
+    def sync_all(self, root: Path = Path("."), full: bool = False) -> dict[str, int]:
+        """Sync every known collection plus the product registry under root."""
+        counts = {
+            kind: self.sync(kind, root / directory, full=full)
+            for kind, (directory, _, _) in COLLECTIONS.items()
+        }
+        counts["products"] = self.sync_products(root / "dash/products.json")
+        return counts
+
+    def sync_products(self, products_path: Path = Path("dash/products.json")) -> int:
+        """Index dash/products.json (one document per product)."""
+        try:
+            st = products_path.stat()
+        except OSError:
+            return 0
+        row = self._query_one(
+            "SELECT mtime_ns, size FROM documents WHERE kind = 'registry' AND path = ?",
+            (str(products_path),),
+        )
+        if row and (row["mtime_ns"], row["size"]) == (st.st_mtime_ns, st.st_size):
+            return 0
+
+        registry = json.loads(products_path.read_text())
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM documents WHERE kind = 'products'")
+        for product in registry.get("products", []):
+            self.put("products", f"{products_path}#{product.get('product_id')}", product)
+        self.put("registry", products_path, {"product_count": len(registry.get("products", []))})
+        return 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple | list = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _query_one(self, sql: str, params: tuple | list = ()) -> sqlite3.Row | None:
+        rows = self._query(sql, params)
+        return rows[0] if rows else None
+
+    def _where(
+        self,
+        kind: str,
+        directory: Path | None = None,
+        **filters: Any,
+    ) -> tuple[str, list[Any]]:
+        clause = "kind = ?"
+        params: list[Any] = [kind]
+        if directory is not None:
+            # The directory itself, or anything below it (but not a sibling
+            # sharing its name as a prefix, like work_orders_archive)
+            clause += " AND (path = ? OR instr(path, ?) = 1)"
+            params += [str(directory), str(directory).rstrip("/") + "/"]
+        for column, value in filters.items():
+            if value is not None:
+                clause += f" AND {column} = ?"
+                params.append(value)
+        return clause, params
+
+    def get(self, kind: str, key: str, directory: Path | None = None) -> dict | None:
+        """Return the document with the given key (job_id, product_id, ...)."""
+        clause, params = self._where(kind, directory, key=key)
+        row = self._query_one(f"SELECT data FROM documents WHERE {clause} LIMIT 1", params)
+        return json.loads(row["data"]) if row else None
+
+    def last_run(self, product_id: str, directory: Path | None = None) -> dict | None:
+        """Return the indexed last_run.json of a product."""
+        clause, params = self._where("runs", directory, product_id=product_id)
+        row = self._query_one(f"SELECT data FROM documents WHERE {clause} LIMIT 1", params)
+        return json.loads(row["data"]) if row else None
+
+    def products(self) -> list[dict]:
+        """Return the indexed product registry entries."""
+        rows = self._query("SELECT data FROM documents WHERE kind = 'products' ORDER BY path")
+        return [json.loads(row["data"]) for row in rows]
+
+    def status_counts(self, kind: str, directory: Path | None = None) -> dict[str, int]:
+        """Count documents of a kind by status (a missing status counts as pending)."""
+        clause, params = self._where(kind, directory)
+        counts: dict[str, int] = {}
+        for row in self._query(
+            f"SELECT status, COUNT(*) AS n FROM documents WHERE {clause} GROUP BY status",
+            params,
+        ):
+            status = row["status"] or "pending"
+            counts[status] = counts.get(status, 0) + row["n"]
+        return counts
+
+    def find(
+        self,
+        kind: str,
+        status: str | None = None,
+        limit: int | None = None,
+        directory: Path | None = None,
+    ) -> list[tuple[str, dict]]:
+        """Return (path, document) pairs, highest priority first."""
+        clause, params = self._where(kind, directory, status=status)
+        sql = f"SELECT path, data FROM documents WHERE {clause} ORDER BY priority DESC, path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [(row["path"], json.loads(row["data"])) for row in self._query(sql, params)]
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export(self, kind: str, directory: Path) -> int:
+        """Write every indexed document of a kind back out as JSON files."""
+        directory.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for path, data in self.find(kind):
+            src = Path(path)
+            target = directory / (f"{src.parent.name}/{src.name}" if kind == "runs" else src.name)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(json.dumps(data, indent=2))
+            count += 1
+        return count
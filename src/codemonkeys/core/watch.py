@@ -0,0 +1,146 @@
+"""File watching - report which files under a set of directories changed.
+
+With `watchdog` installed (`pip install codemonkeys[watch]`), changes come
+from the OS (inotify on Linux, FSEvents/kqueue elsewhere) and cost nothing
+while the tree is idle. A directory that does not exist yet is watched
+through its nearest existing parent, so it is picked up once created.
+Without it, the directories are re-scanned every `interval` seconds and
+compared by mtime and size.
+
+Both watchers are async iterators yielding batches of changed paths
+(relative to the root, POSIX style). Bursts of events - a report write
+followed by a history append - are coalesced into one batch.
+
+Usage:
+    async for changed in make_watcher(Path("."), ["dash/runs"]).changes():
+        ...
+"""
+import asyncio
+import os
+from pathlib import Path
+from typing import AsyncIterator
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+POLL_INTERVAL = 1.0
+
+# Events arriving within this window are delivered as one batch
+DEBOUNCE_SECONDS = 0.2
+
+
+def snapshot(root: Path, dirs: list[str]) -> dict[str, tuple[int, int]]:
+    """Map every file under dirs to its (mtime_ns, size)."""
+    files = {}
+    stack = [root / d for d in dirs]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    else:
+                        st = entry.stat()
+                        rel = Path(entry.path).relative_to(root).as_posix()
+                        files[rel] = (st.st_mtime_ns, st.st_size)
+                except FileNotFoundError:
+                    continue  # Removed while scanning
+    return files
+
+
+def diff(old: dict, new: dict) -> set[str]:
+    """Return paths added, removed or modified between two snapshots."""
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+
+class PollingWatcher:
+    """Detects changes by re-scanning the directories."""
+
+    def __init__(self, root: Path, dirs: list[str], interval: float = POLL_INTERVAL):
+        self.root = Path(root)
+        self.dirs = dirs
+        self.interval = interval
+
+    async def changes(self) -> AsyncIterator[set[str]]:
+        previous = await asyncio.to_thread(snapshot, self.root, self.dirs)
+        while True:
+            await asyncio.sleep(self.interval)
+            current = await asyncio.to_thread(snapshot, self.root, self.dirs)
+            changed = diff(previous, current)
+            previous = current
+            if changed:
+                yield changed
+
+
+class NativeWatcher:
+    """Receives changes from the OS through watchdog."""
+
+    def __init__(self, root: Path, dirs: list[str]):
+        self.root = Path(root).resolve()
+        self.dirs = dirs
+
+    def _relative(self, path: str) -> str | None:
+        """Path relative to the root, or None if it is outside the watched dirs."""
+        try:
+            rel = Path(path).resolve().relative_to(self.root)
+        except ValueError:
+            return None
+        if not any(rel.is_relative_to(d) for d in self.dirs):
+            return None
+        return rel.as_posix()
+
+    def _watch_roots(self) -> set[Path]:
+        """The nearest existing directory at or above each watched dir."""
+        roots = set()
+        for d in self.dirs:
+            path = self.root / d
+            while not path.is_dir() and path != self.root:
+                path = path.parent
+            roots.add(path)
+        # A root inside another root is already covered by the recursive watch
+        return {r for r in roots if not any(r != o and r.is_relative_to(o) for o in roots)}
+
+    async def changes(self) -> AsyncIterator[set[str]]:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[str] = asyncio.Queue()
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                for path in (event.src_path, getattr(event, "dest_path", "")):
+                    if path:
+                        loop.call_soon_threadsafe(queue.put_nowait, path)
+
+        observer = Observer()
+        for path in self._watch_roots():
+            observer.schedule(Handler(), str(path), recursive=True)
+        observer.start()
+        try:
+            while True:
+                batch = {await queue.get()}
+                await asyncio.sleep(DEBOUNCE_SECONDS)
+                while not queue.empty():
+                    batch.add(queue.get_nowait())
+                changed = {rel for rel in map(self._relative, batch) if rel}
+                if changed:
+                    yield changed
+        finally:
+            observer.stop()
+            await asyncio.to_thread(observer.join)
+
+
+def make_watcher(root: Path, dirs: list[str], interval: float = POLL_INTERVAL):
+    """Return a native watcher if watchdog is available, else a polling one."""
+    if HAS_WATCHDOG:
+        return NativeWatcher(root, dirs)
+    return PollingWatcher(root, dirs, interval)
@@ -0,0 +1,480 @@
+"""Work order queue index.
+
+Work orders stay one JSON file per order in nexus/work_orders/, but the
+queue keeps a small index next to them (_index/queue.json) so readers do
+not have to parse every order the factory ever wrote:
+
+- counts: number of orders per status, for `oracle status`
+- pending: a heap of (-priority, filename) for the pending orders, so the
+  executor and planner only open the orders they are about to use
+
+Writers go through WorkOrderQueue.write(), which replaces the order file
+atomically and updates the index under a lock (a thread lock plus an
+flock on _index/queue.lock where fcntl is available).
+
+Files added, renamed or removed by hand change the directory's mtime,
+which the index records; a mismatch triggers a full rescan. So does a
+scan made within RACY_NS of the directory's last change, since a later
+change in the same timestamp tick would not move the mtime (the same
+"racy" problem git solves for its index). Orders edited in place without
+going through the queue are not noticed until the next rescan;
+`oracle status --rebuild` forces one.
+
+Claims:
+- An executor claims an order by renaming it into claimed/. The rename
+  is atomic, so only one executor gets each order, whether the others
+  are processes on this host or machines sharing the filesystem. The
+  claimed copy is marked running and records a lease (owner, token,
+  lease_seconds).
+- While it runs, a Heartbeat thread touches the file; its mtime is the
+  lease's last heartbeat. Clocks of executors sharing a queue must
+  roughly agree.
+- complete() moves the finished order back next to the others. If the
+  lease was lost in the meantime, it raises LeaseLost and the result is
+  dropped.
+- Orders whose lease expired (their executor died) are requeued as
+  pending by the next claim, and marked failed after MAX_LEASE_EXPIRIES.
+
+Usage:
+    queue = WorkOrderQueue(Path("nexus/work_orders"))
+    queue.counts()  # {"pending": 2, "running": 1, "completed": 7}
+    orders = queue.claim(limit=3)
+    with queue.hold(orders):
+        for wo in orders:
+            ...
+            queue.complete(wo["_filepath"], {**wo, "status": "completed"})
+"""
+import heapq
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+DEFAULT_DIR = Path("nexus/work_orders")
+
+INDEX_DIR = "_index"
+INDEX_NAME = "queue.json"
+LOCK_NAME = "queue.lock"
+INDEX_VERSION = 2
+CLAIMED_DIR = "claimed"
+
+# A claim not heartbeated for this long is considered orphaned
+DEFAULT_LEASE_SECONDS = 60
+# Orders orphaned this many times are failed instead of requeued
+MAX_LEASE_EXPIRIES = 3
+
+# Directory mtimes closer than this to the time they were read may hide a
+# later change within the same timestamp tick (2s covers FAT's resolution)
+RACY_NS = 2_000_000_000
+
+_lock = threading.Lock()
+
+
+class LeaseLost(Exception):
+    """A claimed order expired and was requeued before it was completed."""
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def queue_for(path: Path | str) -> "WorkOrderQueue":
+    """The queue an order file (pending, finished or claimed) belongs to."""
+    parent = Path(path).parent
+    return WorkOrderQueue(parent.parent if parent.name == CLAIMED_DIR else parent)
+
+
+def _status(wo: dict) -> str:
+    return wo.get("status") or "pending"
+
+
+def _read(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_json(path: Path, data: dict, indent: int | None = None):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=indent))
+    os.replace(tmp_path, path)
+
+
+class WorkOrderQueue:
+    """The work orders in one directory, with an index of counts and pending orders."""
+
+    def __init__(self, directory: Path | str = DEFAULT_DIR):
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_DIR / INDEX_NAME
+        self.lock_path = self.directory / INDEX_DIR / LOCK_NAME
+        self.claimed_dir = self.directory / CLAIMED_DIR
+        self.rebuilds = 0
+
+    @contextmanager
+    def _locked(self):
+        with _lock:
+            if fcntl is None:
+                yield
+                return
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _dir_mtime_ns(self) -> int | None:
+        try:
+            return self.directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _save(self, index: dict, scanned: bool = False):
+        mtime_ns = self._dir_mtime_ns()
+        index["dir_mtime_ns"] = mtime_ns
+        # Only a scan can miss a change; writes hold the lock. A claim that
+        # lost a race also asks for a rescan.
+        index["racy"] = bool(index.get("racy")) or (
+            scanned and mtime_ns is not None and time.time_ns() - mtime_ns < RACY_NS
+        )
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(self.index_path, index)
+
+    def _load(self) -> dict:
+        """Return the index, rescanning the directory if it is missing or stale."""
+        index = _read(self.index_path)
+        if (
+            index is None
+            or index.get("version") != INDEX_VERSION
+            or index.get("dir_mtime_ns") != self._dir_mtime_ns()
+            or index.get("racy")
+        ):
+            index = self._rebuild()
+        return index
+
+    def _rebuild(self) -> dict:
+        # The index directory must exist before the mtime is recorded
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        index = {"version": INDEX_VERSION, "counts": {}, "pending": []}
+        for path in self.directory.glob("*.json"):
+            if path.name.startswith("_"):  # Skip meta files
+                continue
+            wo = _read(path)
+            if wo is None:
+                continue
+            self._add(index, path.name, wo)
+        for path in self.claimed_dir.glob("*.json"):
+            wo = _read(path)
+            if wo is not None:
+                self._count(index, _status(wo), 1)
+        heapq.heapify(index["pending"])
+        self._save(index, scanned=True)
+        self.rebuilds += 1
+        return index
+
+    @staticmethod
+    def _count(index: dict, status: str, delta: int):
+        counts = index["counts"]
+        counts[status] = counts.get(status, 0) + delta
+        if counts[status] <= 0:
+            del counts[status]
+
+    @classmethod
+    def _add(cls, index: dict, name: str, wo: dict):
+        status = _status(wo)
+        cls._count(index, status, 1)
+        if status == "pending":
+            index["pending"].append([-wo.get("priority", 0), name])
+
+    @classmethod
+    def _remove(cls, index: dict, name: str, status: str):
+        cls._count(index, status, -1)
+        if status == "pending":
+            index["pending"] = [entry for entry in index["pending"] if entry[1] != name]
+            heapq.heapify(index["pending"])
+
+    def rebuild(self) -> dict[str, int]:
+        """Rescan every order file and return the status counts."""
+        if not self.directory.is_dir():
+            return {}
+        with self._locked():
+            return dict(self._rebuild()["counts"])
+
+    def counts(self) -> dict[str, int]:
+        """Number of orders per status (a missing status counts as pending)."""
+        if not self.directory.is_dir():
+            return {}
+        with self._locked():
+            return dict(self._load()["counts"])
+
+    def pending(self, limit: int | None = None) -> list[tuple[str, dict]]:
+        """Return (path, order) pairs of pending orders, highest priority first."""
+        if not self.directory.is_dir():
+            return []
+        with self._locked():
+            index = self._load()
+            while True:
+                heap = index["pending"]
+                entries = heapq.nsmallest(len(heap) if limit is None else limit, heap)
+                orders, stale = [], []
+                for _, name in entries:
+                    path = self.directory / name
+                    wo = _read(path)
+                    if wo is None or _status(wo) != "pending":
+                        stale.append((name, wo))
+                    else:
+                        orders.append((str(path), wo))
+                if not stale:
+                    return orders
+                # Changed in place behind the queue's back: fix up and refill
+                for name, wo in stale:
+                    self._remove(index, name, "pending")
+                    if wo is not None:
+                        self._add(index, name, wo)
+                self._save(index)
+
+    def write(self, path: Path | str, wo: dict):
+        """Write one order file atomically and update the index."""
+        path = Path(path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            index = self._load()
+            previous = _read(path)
+            _write_json(path, wo, indent=2)
+            if path.parent.resolve() != self.directory.resolve() or path.name.startswith("_"):
+                return  # Not one of this queue's orders
+            if previous is not None:
+                self._remove(index, path.name, _status(previous))
+            self._add(index, path.name, wo)
+            heapq.heapify(index["pending"])
+            self._save(index)
+
+    # ------------------------------------------------------------------
+    # Claims
+    # ------------------------------------------------------------------
+
+    def _claim(self, index: dict, name: str, owner: str, lease_seconds: float) -> tuple[str, dict] | None:
+        """Move one pending order into claimed/; None if it is not ours to take."""
+        source, target = self.directory / name, self.claimed_dir / name
+        self.claimed_dir.mkdir(exist_ok=True)
+        try:
+            os.rename(source, target)  # Atomic: exactly one claimer wins
+        except FileNotFoundError:
+            index["racy"] = True  # Taken behind the index's back
+            return None
+        wo = _read(target)
+        if wo is None or _status(wo) != "pending":
+            os.rename(target, source)
+            index["racy"] = True
+            return None
+        wo["status"] = "running"
+        wo["lease"] = {
+            "owner": owner,
+            "token": uuid.uuid4().hex,
+            "claimed_at": datetime.now(timezone.utc).isoformat(),
+            "lease_seconds": lease_seconds,
+        }
+        _write_json(target, wo, indent=2)
+        self._count(index, "running", 1)
+        wo["_filepath"] = str(target)
+        return str(target), wo
+
+    def claim(
+        self,
+        limit: int,
+        owner: str | None = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> list[dict]:
+        """
+        Claim up to limit pending orders, highest priority first.
+
+        Orphaned claims are requeued first. Each returned order carries
+        its claimed path in _filepath.
+        """
+        if not self.directory.is_dir():
+            return []
+        owner = owner or default_owner()
+        claimed = []
+        with self._locked():
+            index = self._load()
+            self._requeue_expired(index, time.time())
+            while len(claimed) < limit and index["pending"]:
+                _, name = heapq.heappop(index["pending"])
+                self._count(index, "pending", -1)
+                taken = self._claim(index, name, owner, lease_seconds)
+                if taken is not None:
+                    claimed.append(taken[1])
+            self._save(index)
+        return claimed
+
+    def claim_path(
+        self,
+        path: Path | str,
+        owner: str | None = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> dict | None:
+        """Claim one specific pending order; None if it is not pending."""
+        name = Path(path).name
+        with self._locked():
+            index = self._load()
+            self._remove(index, name, "pending")
+            taken = self._claim(index, name, owner or default_owner(), lease_seconds)
+            self._save(index)
+        return taken[1] if taken else None
+
+    def heartbeat(self, path: Path | str, token: str) -> bool:
+        """Renew a lease; False if it was lost."""
+        current = _read(Path(path))
+        if current is None or current.get("lease", {}).get("token") != token:
+            return False
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        return True
+
+    def complete(self, path: Path | str, wo: dict) -> str:
+        """
+        Write a claimed order back to the queue and return its path.
+
+        Unclaimed paths are written in place. Raises LeaseLost if the
+        claim expired in the meantime.
+        """
+        path = Path(path)
+        if path.parent.name != CLAIMED_DIR:
+            self.write(path, wo)
+            return str(path)
+
+        token = wo.get("lease", {}).get("token")
+        wo = {k: v for k, v in wo.items() if k not in ("lease", "_filepath")}
+        target = self.directory / path.name
+        with self._locked():
+            index = self._load()
+            current = _read(path)
+            if current is None or current.get("lease", {}).get("token") != token:
+                raise LeaseLost(f"Lease on {path.name} expired before it was completed")
+            _write_json(path, wo, indent=2)
+            os.replace(path, target)
+            self._count(index, _status(current), -1)
+            self._add(index, target.name, wo)
+            heapq.heapify(index["pending"])
+            self._save(index)
+        return str(target)
+
+    def release(self, path: Path | str, wo: dict) -> str:
+        """Give an unstarted claim back to the queue as pending."""
+        return self.complete(path, {**wo, "status": "pending"})
+
+    def _requeue_expired(self, index: dict, now: float) -> list[str]:
+        requeued = []
+        for path in self.claimed_dir.glob("*.json"):
+            wo = _read(path)
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue  # Completed meanwhile
+            if wo is None:
+                continue
+            lease = wo.pop("lease", None) or {}
+            status = _status(wo)
+            if status == "running":
+                if mtime + lease.get("lease_seconds", DEFAULT_LEASE_SECONDS) > now:
+                    continue  # Still heartbeating
+                wo["lease_expiries"] = wo.get("lease_expiries", 0) + 1
+                if wo["lease_expiries"] >= MAX_LEASE_EXPIRIES:
+                    wo["status"] = "failed"
+                    wo["result"] = {
+                        "exit_code": 1,
+                        "completed_at": datetime.now(timezone.utc).isoformat(),
+                        "evidence_produced": [],
+                        "error_message": (
+                            f"Lease expired {wo['lease_expiries']} times "
+                            f"(last owner {lease.get('owner')})"
+                        ),
+                    }
+                else:
+                    wo["status"] = "pending"
+            # Otherwise its executor died between writing the result and
+            # moving it back; finish the move
+            _write_json(path, wo, indent=2)
+            os.replace(path, self.directory / path.name)
+            self._count(index, status, -1)
+            self._add(index, path.name, wo)
+            requeued.append(path.name)
+        heapq.heapify(index["pending"])
+        return requeued
+
+    def requeue_expired(self) -> list[str]:
+        """Return orphaned claims to the queue; returns their file names."""
+        if not self.claimed_dir.is_dir():
+            return []
+        with self._locked():
+            index = self._load()
+            requeued = self._requeue_expired(index, time.time())
+            self._save(index)
+        return requeued
+
+    @contextmanager
+    def hold(self, orders: list[dict], interval: float | None = None):
+        """
+        Heartbeat claimed orders while the block runs.
+
+        Orders still carrying _filepath on exit were not completed and are
+        released back to the queue.
+        """
+        claims = [wo for wo in orders if Path(wo.get("_filepath", "")).parent.name == CLAIMED_DIR]
+        if interval is None:
+            interval = min((wo["lease"]["lease_seconds"] for wo in claims), default=DEFAULT_LEASE_SECONDS) / 3
+        heartbeat = Heartbeat(self, claims, interval)
+        heartbeat.start()
+        try:
+            yield
+        finally:
+            heartbeat.stop()
+            for wo in claims:
+                if "_filepath" in wo:
+                    try:
+                        self.release(wo.pop("_filepath"), wo)
+                    except LeaseLost:
+                        pass  # Already requeued
+
+
+class Heartbeat(threading.Thread):
+    """Renews the leases of claimed orders until stopped or the lease is lost."""
+
+    def __init__(self, queue: WorkOrderQueue, orders: list[dict], interval: float):
+        super().__init__(daemon=True)
+        self.queue = queue
+        # Captured up front: the worker completing an order strips its
+        # _filepath and lease while this thread is running
+        self.claims = [(wo["_filepath"], wo["lease"]["token"]) for wo in orders]
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while self.claims and not self._stop_event.wait(self.interval):
+            for claim in [*self.claims]:
+                try:
+                    alive = self.queue.heartbeat(*claim)
+                except Exception:
+                    continue  # Try again next interval; other claims still need renewing
+                if not alive:
+                    # Completed, released or requeued; nothing left to renew
+                    self.claims.remove(claim)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
@@ -0,0 +1,166 @@
+"""Tests for the resident CLI daemon and its client shim."""
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from codemonkeys import client
+from codemonkeys.commands.daemon import daemon as daemon_cmd
+from codemonkeys.core.daemon import Daemon, forward, forwardable, request
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CODEMONKEYS_NO_DAEMON", raising=False)
+    monkeypatch.delenv("CODEMONKEYS_DAEMON_SOCKET", raising=False)
+    (tmp_path / "dash").mkdir()
+    (tmp_path / "dash/products.json").write_text(json.dumps({
+        "products": [{"product_id": "demo", "display_name": "Demo Product", "owner": "Nexus", "status": "active"}],
+    }))
+    return tmp_path
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def server(workdir):
+    server = Daemon()
+    server.warm()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    wait_for(lambda: request({"op": "status"}, server.path) is not None)
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+class TestForwardable:
+    """Tests for which calls are sent to the daemon."""
+
+    @pytest.mark.parametrize("argv", [
+        ["fleet", "list"],
+        ["oracle", "status", "--no-state"],
+        ["silverback", "--all"],
+        ["dossier", "validate", "--all", "--json"],
+    ])
+    def test_forwarded(self, argv):
+        assert forwardable(argv)
+
+    @pytest.mark.parametrize("argv", [
+        [],
+        ["--help"],
+        ["fleet", "schedule"],
+        ["ship"],
+        ["daemon", "stop"],
+        ["dossier", "validate", "-"],
+    ])
+    def test_not_forwarded(self, argv):
+        assert not forwardable(argv)
+
+
+class TestClientFallback:
+    """Tests for running in-process when no daemon serves the call."""
+
+    def test_no_socket(self, workdir):
+        assert forward(["fleet", "list"]) is None
+
+    def test_dead_socket(self, workdir):
+        Path(".codemonkeys").mkdir()
+        Path(".codemonkeys/daemon.sock").write_text("")
+        assert forward(["fleet", "list"]) is None
+
+    def test_opt_out(self, server, monkeypatch):
+        monkeypatch.setenv("CODEMONKEYS_NO_DAEMON", "1")
+        assert forward(["fleet", "list"]) is None
+        assert server.requests == 0
+
+    def test_client_runs_cli_without_daemon(self, workdir, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["codemonkeys", "fleet", "list"])
+        with patch("codemonkeys.cli.cli") as mock_cli:
+            client.main()
+        mock_cli.assert_called_once_with()
+
+    def test_client_exits_with_forwarded_code(self, workdir, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["codemonkeys", "fleet", "list"])
+        with patch("codemonkeys.client.forward", return_value=3):
+            with pytest.raises(SystemExit) as exc:
+                client.main()
+        assert exc.value.code == 3
+
+
+class TestDaemon:
+    """Tests for serving CLI calls."""
+
+    def test_forwards_command_output(self, server, capsys):
+        assert forward(["fleet", "list"]) == 0
+        assert "Demo Product" in capsys.readouterr().out
+        assert request({"op": "status"})["requests"] == 1
+
+    def test_exit_code_is_returned(self, server, capsys):
+        assert forward(["fleet", "history", "--since", "not-a-time"]) == 2
+        assert "Error" in capsys.readouterr().err
+
+    def test_stdout_and_stderr_stay_apart(self, server, capsys):
+        reply = request({"op": "run", "argv": ["fleet", "history", "--since", "x"], "cwd": str(Path.cwd())})
+        assert reply["stdout"] == ""
+        assert "Error" in reply["stderr"]
+
+    def test_declines_other_working_tree(self, server, tmp_path_factory):
+        other = tmp_path_factory.mktemp("other")
+        reply = request({"op": "run", "argv": ["fleet", "list"], "cwd": str(other)})
+        assert reply == {"fallback": "different working directory"}
+
+    def test_declines_unforwarded_command(self, server):
+        reply = request({"op": "run", "argv": ["ship"], "cwd": str(Path.cwd())})
+        assert "fallback" in reply
+
+    def test_stops_when_sources_change(self, server, tmp_path):
+        source = tmp_path / "module.py"
+        source.write_text("")
+        server._sources = {str(source): source.stat().st_mtime_ns - 1}
+
+        assert forward(["fleet", "list"]) is None
+        wait_for(lambda: not server.path.exists())
+
+    def test_refuses_second_daemon(self, server):
+        with pytest.raises(RuntimeError, match="already listening"):
+            Daemon().serve_forever()
+
+    def test_replaces_dead_socket(self, workdir):
+        Path(".codemonkeys").mkdir()
+        Path(".codemonkeys/daemon.sock").write_text("")
+        server = Daemon()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        wait_for(lambda: request({"op": "status"}) is not None)
+        server.shutdown()
+        thread.join(timeout=5)
+        assert not server.path.exists()
+
+
+class TestDaemonCommands:
+    """Tests for codemonkeys daemon status/stop."""
+
+    def test_status_without_daemon(self, workdir):
+        result = CliRunner().invoke(daemon_cmd, ["status"])
+        assert result.exit_code == 1
+        assert "not running" in result.output
+
+    def test_status_and_stop(self, server):
+        result = CliRunner().invoke(daemon_cmd, ["status"])
+        assert result.exit_code == 0
+        assert "pid" in result.output
+
+        result = CliRunner().invoke(daemon_cmd, ["stop"])
+        assert result.exit_code == 0
+        assert not server.path.exists()
@@ -0,0 +1,110 @@
+"""Tests for lazy command loading and the CLI startup benchmark."""
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from codemonkeys.cli import COMMANDS, LazyGroup, cli
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+import bench_cli_startup
+
+
+def loaded_modules(code: str) -> set[str]:
+    """Run code in a fresh interpreter and return the modules it imported."""
+    proc = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport json, sys; print(json.dumps(sorted(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+class TestLazyGroup:
+    """Tests for the lazily loaded codemonkeys group."""
+
+    def test_help_imports_no_command_modules(self):
+        code = (
+            "from codemonkeys.cli import cli\n"
+            "try:\n"
+            "    cli(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        modules = loaded_modules(code)
+        assert not {m for m in modules if m.startswith("codemonkeys.commands.")}
+        assert "rich" not in modules
+        assert "jsonschema" not in modules
+
+    def test_help_lists_every_command(self):
+        result = CliRunner().invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        for name, (_, short_help) in COMMANDS.items():
+            assert name in result.output
+            assert short_help in result.output
+
+    @pytest.mark.parametrize("name", sorted(COMMANDS))
+    def test_registered_help_matches_command(self, name):
+        module_name, attribute = COMMANDS[name][0].split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        assert command.get_short_help_str(limit=200) == COMMANDS[name][1]
+
+    def test_subcommand_is_loaded_on_use(self):
+        group = LazyGroup(name="test", lazy_subcommands={"dossier": ("codemonkeys.commands.dossier:dossier", "")})
+        assert "dossier" not in group.commands
+
+        result = CliRunner().invoke(group, ["dossier", "--help"])
+
+        assert result.exit_code == 0
+        assert "science-to-design" in result.output
+        assert "dossier" in group.commands
+
+    def test_unknown_command_is_a_usage_error(self):
+        result = CliRunner().invoke(cli, ["no-such-command"])
+        assert result.exit_code == 2
+        assert "No such command" in result.output
+
+    def test_dossier_defers_jsonschema(self):
+        modules = loaded_modules("import codemonkeys.commands.dossier")
+        assert "jsonschema" not in modules
+
+
+class TestStartupBenchmark:
+    """Tests for scripts/bench_cli_startup.py."""
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   _io\n"
+            "import time:       300 |        400 | click\n"
+            "import time:      1200 |      52000 |     rich.console\n"
+        )
+        assert bench_cli_startup.parse_importtime(stderr) == [
+            ("_io", 100, 100, 1),
+            ("click", 300, 400, 0),
+            ("rich.console", 1200, 52000, 2),
+        ]
+
+    def test_records_history_and_compares(self, tmp_path, capsys):
+        history = tmp_path / "bench.jsonl"
+        args = ["--runs", "1", "--scenario=--help", "--history", str(history)]
+
+        assert bench_cli_startup.main(args) == 0
+        assert bench_cli_startup.main([*args, "--compare"]) == 0
+
+        records = [json.loads(line) for line in history.read_text().splitlines()]
+        assert len(records) == 2
+        [scenario] = records[-1]["scenarios"]
+        assert scenario["argv"] == ["--help"]
+        assert scenario["wall_ms"] > 0
+        assert scenario["import_ms"] > 0
+        assert " ms since " in capsys.readouterr().out
+
+    def test_max_ms_fails_slow_scenarios(self, tmp_path):
+        args = ["--runs", "1", "--scenario=--help", "--no-record", "--max-ms", "0.001"]
+        assert bench_cli_startup.main(args) == 1
@@ -0,0 +1,119 @@
+"""Tests for in-process script dispatch used by CLI commands."""
+import sys
+import threading
+from unittest.mock import patch, MagicMock
+
+from click.testing import CliRunner
+
+from codemonkeys.core.scripts import call_captured, call_captured_streams, exit_code_of, run_script
+from codemonkeys.commands.silverback import silverback
+
+
+class TestExitCodeOf:
+    """Tests for exit code normalization."""
+
+    def test_none_is_success(self):
+        assert exit_code_of(None) == 0
+
+    def test_int_passthrough(self):
+        assert exit_code_of(3) == 3
+
+    def test_message_is_failure(self):
+        assert exit_code_of("fatal") == 1
+
+
+class TestRunScript:
+    """Tests for run_script dispatch."""
+
+    def test_in_process_does_not_spawn(self):
+        """Default dispatch should call main() without a subprocess."""
+        with patch("codemonkeys.core.scripts.subprocess.run") as mock_run:
+            code = run_script("oracle_planner", ["--budget", "1", "--stdout", "--deterministic", "--no-state"])
+
+        mock_run.assert_not_called()
+        assert code == 0
+
+    def test_argparse_exit_is_returned(self):
+        """argparse errors (SystemExit) should surface as an exit code."""
+        assert run_script("oracle_planner", ["--no-such-flag"]) == 2
+
+    def test_subprocess_fallback(self):
+        """use_subprocess should shell out to the script."""
+        with patch("codemonkeys.core.scripts.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            run_script("oracle_planner", ["--stdout"], use_subprocess=True)
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[1].endswith("oracle_planner.py")
+        assert cmd[2:] == ["--stdout"]
+
+
+class TestCallCaptured:
+    """Tests for per-thread output capture."""
+
+    def test_captures_output_and_code(self):
+        def entry():
+            print("hello")
+            return 4
+
+        code, output = call_captured(entry)
+        assert code == 4
+        assert output == "hello\n"
+
+    def test_streams_can_be_kept_apart(self):
+        def entry():
+            print("out")
+            print("err", file=sys.stderr)
+            raise ValueError("boom")
+
+        code, stdout, stderr = call_captured_streams(entry)
+        assert code == 2
+        assert stdout == "out\n"
+        assert stderr == "err\nValueError: boom\n"
+
+    def test_capture_is_per_thread(self):
+        """Concurrent captures should only see their own output."""
+        outputs = {}
+        barrier = threading.Barrier(2)
+
+        def entry(name):
+            barrier.wait()
+            for _ in range(50):
+                print(name)
+
+        def worker(name):
+            outputs[name] = call_captured(entry, name)[1]
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in ("a", "b")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert set(outputs["a"].split()) == {"a"}
+        assert set(outputs["b"].split()) == {"b"}
+
+    def test_stream_attributes_are_the_real_streams(self):
+        """The proxy must not shadow TextIOWrapper attributes such as buffer."""
+        real = sys.stdout
+        seen = {}
+
+        def entry():
+            seen["buffer"] = getattr(sys.stdout, "buffer", None)
+            seen["encoding"] = sys.stdout.encoding
+
+        call_captured(entry)
+        assert seen["buffer"] is getattr(real, "buffer", None)
+        assert seen["encoding"] == real.encoding
+
+
+class TestSilverbackDispatch:
+    """Tests for the silverback command's dispatch mode."""
+
+    def test_subprocess_flag(self):
+        with patch("codemonkeys.core.scripts.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            result = CliRunner().invoke(silverback, ["--all", "--subprocess"])
+
+        assert result.exit_code == 0
+        assert mock_run.call_args[0][0][-1] == "--all"
@@ -0,0 +1,201 @@
+"""Tests for live Dash updates: file watching and the /api/events stream."""
+import asyncio
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from codemonkeys.core import dash_server
+from codemonkeys.core.dash_server import DashServer, build_deltas
+from codemonkeys.core.watch import NativeWatcher, PollingWatcher, diff, snapshot
+
+
+def write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    write_json(tmp_path / "dash/products.json", {"products": [{"product_id": "alpha"}]})
+    write_json(tmp_path / "dash/runs/alpha/last_run.json", {"run_id": "run_1"})
+    write_json(tmp_path / "nexus/inbox/req_1.json", {"request_id": "req_1"})
+    (tmp_path / "nexus/outbox").mkdir(parents=True)
+    (tmp_path / "nexus/work_orders").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def server(repo, monkeypatch):
+    """Run a DashServer with a fast polling watcher; yields (port, DashServer, loop)."""
+    monkeypatch.setattr(dash_server, "HEARTBEAT_SECONDS", 0.1)
+    monkeypatch.setattr("codemonkeys.core.watch.HAS_WATCHDOG", False)
+    loop = asyncio.new_event_loop()
+    server = DashServer(repo, watch_interval=0.05)
+    aio_server = loop.run_until_complete(server.start("127.0.0.1", 0))
+    port = aio_server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield port, server, loop
+
+    async def shutdown():
+        aio_server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def open_stream(port: int) -> socket.socket:
+    sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+    sock.sendall(b"GET /api/events HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    return sock
+
+
+def read_event(sock: socket.socket, name: str, buffer: bytearray, timeout: float = 5) -> dict:
+    """Read from the stream until an event with the given name arrives."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        while b"\n\n" in buffer:
+            block, _, rest = bytes(buffer).partition(b"\n\n")
+            buffer[:] = rest
+            fields = dict(
+                line.split(": ", 1) for line in block.decode().split("\n") if ": " in line
+            )
+            if fields.get("event") == name:
+                return json.loads(fields["data"])
+        buffer.extend(sock.recv(65536))
+    raise AssertionError(f"no {name} event within {timeout}s")
+
+
+def wait_for(predicate, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestWatch:
+    """Tests for snapshot-based change detection."""
+
+    def test_diff_reports_added_modified_removed(self, repo):
+        before = snapshot(repo, ["dash/runs", "nexus"])
+        write_json(repo / "dash/runs/alpha/last_run.json", {"run_id": "run_2", "status": "failed"})
+        write_json(repo / "nexus/outbox/dec_1.json", {"decision_id": "dec_1"})
+        (repo / "nexus/inbox/req_1.json").unlink()
+        after = snapshot(repo, ["dash/runs", "nexus"])
+
+        assert diff(before, after) == {
+            "dash/runs/alpha/last_run.json",
+            "nexus/outbox/dec_1.json",
+            "nexus/inbox/req_1.json",
+        }
+
+    def test_missing_directories_are_ignored(self, tmp_path):
+        assert snapshot(tmp_path, ["does/not/exist"]) == {}
+
+    def test_polling_watcher_yields_batches(self, repo):
+        async def first_change():
+            changes = PollingWatcher(repo, ["nexus"], interval=0.05).changes()
+            task = asyncio.ensure_future(changes.__anext__())
+            await asyncio.sleep(0.1)
+            write_json(repo / "nexus/outbox/dec_1.json", {"decision_id": "dec_1"})
+            try:
+                return await asyncio.wait_for(task, 5)
+            finally:
+                await changes.aclose()
+
+        assert asyncio.run(first_change()) == {"nexus/outbox/dec_1.json"}
+
+    def test_native_watcher_sees_directories_created_later(self, tmp_path):
+        pytest.importorskip("watchdog")
+
+        async def first_change():
+            changes = NativeWatcher(tmp_path, ["nexus/work_orders"]).changes()
+            task = asyncio.ensure_future(changes.__anext__())
+            await asyncio.sleep(0.2)
+            write_json(tmp_path / "dash/products.json", {"products": []})  # Not watched
+            write_json(tmp_path / "nexus/work_orders/wo_1.json", {"job_id": "wo_1"})
+            try:
+                return await asyncio.wait_for(task, 5)
+            finally:
+                await changes.aclose()
+
+        assert asyncio.run(first_change()) == {"nexus/work_orders/wo_1.json"}
+
+
+class TestBuildDeltas:
+    """Tests for turning changed paths into events."""
+
+    def test_product_delta_carries_only_that_product(self, repo):
+        deltas = build_deltas(repo, {"dash/runs/alpha/last_run.json"})
+        assert deltas == [("product", {"product_id": "alpha", "last_run": {"run_id": "run_1"}, "history": []})]
+
+    def test_run_directory_files_are_ignored(self, repo):
+        assert build_deltas(repo, {"dash/runs/alpha/run_20250101_000000/pytest_output.log"}) == []
+
+    def test_work_order_delta(self, repo):
+        write_json(repo / "nexus/work_orders/wo_1.json", {
+            "job_id": "wo_1", "product_id": "alpha", "intent": "test", "status": "completed", "inputs": {},
+        })
+        deltas = build_deltas(repo, {"nexus/work_orders/wo_1.json", "nexus/work_orders/wo_gone.json"})
+        assert deltas == [
+            ("work_order", {"path": "nexus/work_orders/wo_1.json", "job_id": "wo_1",
+                            "product_id": "alpha", "intent": "test", "status": "completed"}),
+            ("work_order", {"path": "nexus/work_orders/wo_gone.json", "removed": True}),
+        ]
+
+    def test_nexus_changes_collapse_to_one_event(self, repo):
+        assert build_deltas(repo, {"nexus/inbox/a.json", "nexus/outbox/b.json"}) == [("nexus", {})]
+
+
+class TestEventStream:
+    """Tests for /api/events."""
+
+    def test_pushes_product_delta(self, server, repo):
+        port, _, _ = server
+        sock = open_stream(port)
+        buffer = bytearray()
+        try:
+            wait_for(lambda: server[1]._watch_task is not None)
+            time.sleep(0.1)  # Let the watcher take its first snapshot
+            write_json(repo / "dash/runs/alpha/last_run.json", {"run_id": "run_2"})
+            delta = read_event(sock, "product", buffer)
+        finally:
+            sock.close()
+
+        assert delta["product_id"] == "alpha"
+        assert delta["last_run"] == {"run_id": "run_2"}
+
+    def test_pushes_nexus_view(self, server, repo):
+        port, _, _ = server
+        sock = open_stream(port)
+        buffer = bytearray()
+        try:
+            wait_for(lambda: server[1]._watch_task is not None)
+            time.sleep(0.1)
+            write_json(repo / "nexus/outbox/dec_1.json", {"decision_id": "dec_1"})
+            view = read_event(sock, "nexus", buffer)
+        finally:
+            sock.close()
+
+        assert view["decisions"] == [{"decision_id": "dec_1"}]
+        assert view["requests"] == [{"request_id": "req_1"}]
+
+    def test_watcher_stops_without_subscribers(self, server):
+        port, dash, _ = server
+        sock = open_stream(port)
+        assert wait_for(lambda: dash._watch_task is not None)
+        sock.close()
+        # The closed stream is noticed on the next heartbeat write
+        assert wait_for(lambda: dash._watch_task is None)
@@ -0,0 +1,200 @@
+"""Tests for incremental dash refresh indexers."""
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from codemonkeys.commands.dash import dash
+from codemonkeys.core import dossiers
+from codemonkeys.core.indexer import Index, Manifest, refresh, watch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+import generate_science_index as science_script
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "notes").mkdir()
+    for name in ("a", "b", "c"):
+        (tmp_path / "notes" / f"{name}.txt").write_text(name)
+    return tmp_path
+
+
+def counting_index(calls: list, version: str = "1") -> Index:
+    def extract(group, path):
+        calls.append(path.name)
+        return path.read_text().upper()
+
+    return Index(
+        name="notes",
+        output=Path("out/notes.json"),
+        inputs={"notes": "notes/*.txt"},
+        extract=extract,
+        assemble=lambda entries: {"items": list(entries["notes"].values())},
+        version=version,
+    )
+
+
+def bump_mtime(path: Path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestRefresh:
+    """Tests for manifest-driven incremental refresh."""
+
+    def test_first_refresh_extracts_everything(self, workdir):
+        calls = []
+        [result] = refresh([counting_index(calls)], Manifest(Path("manifest.json")))
+
+        assert sorted(calls) == ["a.txt", "b.txt", "c.txt"]
+        assert result.written and result.changed == 3 and result.entries == 3
+        assert json.loads(Path("out/notes.json").read_text()) == {"items": ["A", "B", "C"]}
+
+    def test_unchanged_inputs_are_skipped(self, workdir):
+        refresh([counting_index([])], Manifest(Path("manifest.json")))
+        calls = []
+        [result] = refresh([counting_index(calls)], Manifest(Path("manifest.json")))
+
+        assert calls == []
+        assert not result.written
+
+    def test_only_changed_entry_is_rebuilt(self, workdir):
+        refresh([counting_index([])], Manifest(Path("manifest.json")))
+        (workdir / "notes/b.txt").write_text("bee")
+        bump_mtime(workdir / "notes/b.txt")
+        calls = []
+        [result] = refresh([counting_index(calls)], Manifest(Path("manifest.json")))
+
+        assert calls == ["b.txt"]
+        assert result.written
+        assert json.loads(Path("out/notes.json").read_text()) == {"items": ["A", "BEE", "C"]}
+
+    def test_touched_file_with_same_content_is_not_rebuilt(self, workdir):
+        refresh([counting_index([])], Manifest(Path("manifest.json")))
+        bump_mtime(workdir / "notes/a.txt")
+        calls = []
+        [result] = refresh([counting_index(calls)], Manifest(Path("manifest.json")))
+
+        assert calls == []
+        assert not result.written
+
+    def test_deleted_input_drops_entry(self, workdir):
+        refresh([counting_index([])], Manifest(Path("manifest.json")))
+        (workdir / "notes/c.txt").unlink()
+        [result] = refresh([counting_index([])], Manifest(Path("manifest.json")))
+
+        assert result.changed == 1
+        assert json.loads(Path("out/notes.json").read_text()) == {"items": ["A", "B"]}
+
+    def test_missing_output_is_rewritten_from_manifest(self, workdir):
+        refresh([counting_index([])], Manifest(Path("manifest.json")))
+        Path("out/notes.json").unlink()
+        calls = []
+        [result] = refresh([counting_index(calls)], Manifest(Path("manifest.json")))
+
+        assert calls == []
+        assert result.written
+        assert Path("out/notes.json").exists()
+
+    def test_extractor_version_change_rebuilds(self, workdir):
+        refresh([counting_index([], version="1")], Manifest(Path("manifest.json")))
+        calls = []
+        refresh([counting_index(calls, version="2")], Manifest(Path("manifest.json")))
+        assert len(calls) == 3
+
+    def test_force_rebuilds_everything(self, workdir):
+        refresh([counting_index([])], Manifest(Path("manifest.json")))
+        calls = []
+        refresh([counting_index(calls)], Manifest(Path("manifest.json")), force=True)
+        assert len(calls) == 3
+
+
+class TestScienceIndex:
+    """Tests for the science index as an incremental indexer."""
+
+    @pytest.fixture
+    def docs(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        science = tmp_path / "docs/science"
+        dossiers = tmp_path / "docs/dossiers"
+        science.mkdir(parents=True)
+        dossiers.mkdir(parents=True)
+        (science / "SCI-1.md").write_text("---\ndossier_id: SCI-1\ntopic: One\nstatus: validated\n---\nBody\n")
+        (science / "SCI-2.md").write_text("---\ndossier_id: SCI-2\ntopic: Two\n---\nBody\n")
+        (dossiers / "DOS-1.md").write_text("---\nevidence:\n  science_source: SCI-1\n---\nBody\n")
+        return tmp_path
+
+    def test_links_design_dossiers(self, docs):
+        refresh([science_script.index()], Manifest(Path("manifest.json")))
+        items = json.loads(Path("dash/science_index.json").read_text())["items"]
+
+        assert [(i["dossier_id"], i["design_dossier_path"]) for i in items] == [
+            ("SCI-1", "docs/dossiers/DOS-1.md"),
+            ("SCI-2", None),
+        ]
+
+    def test_new_design_dossier_only_parses_that_file(self, docs, monkeypatch):
+        refresh([science_script.index()], Manifest(Path("manifest.json")))
+
+        parsed = []
+        real_read = dossiers._read_frontmatter
+        monkeypatch.setattr(dossiers, "_read_frontmatter", lambda p: parsed.append(Path(p).name) or real_read(p))
+        (docs / "docs/dossiers/DOS-2.md").write_text("---\nevidence:\n  science_source: SCI-2\n---\n")
+        refresh([science_script.index()], Manifest(Path("manifest.json")))
+
+        assert parsed == ["DOS-2.md"]
+        items = json.loads(Path("dash/science_index.json").read_text())["items"]
+        assert items[1]["design_dossier_path"] == "docs/dossiers/DOS-2.md"
+
+
+class TestWatch:
+    """Tests for continuous refresh."""
+
+    def test_refreshes_on_change(self, workdir, monkeypatch):
+        monkeypatch.setattr("codemonkeys.core.watch.HAS_WATCHDOG", False)
+        manifest = Manifest(Path("manifest.json"))
+        index = counting_index([])
+        refresh([index], manifest)
+
+        refreshed = threading.Event()
+        seen = []
+
+        def on_refresh(results, changed):
+            seen.append((results, changed))
+            refreshed.set()
+
+        stop = threading.Event()
+        thread = threading.Thread(target=watch, args=([index], manifest, on_refresh, 0.05, stop))
+        thread.start()
+        try:
+            time.sleep(0.2)  # Let the watcher take its first snapshot
+            (workdir / "notes/d.txt").write_text("d")
+            assert refreshed.wait(5)
+        finally:
+            stop.set()
+            thread.join(5)
+
+        results, changed = seen[0]
+        assert changed == {"notes/d.txt"}
+        assert results[0].written and results[0].changed == 1
+
+    def test_watch_dirs_are_glob_prefixes(self):
+        index = counting_index([])
+        index.inputs = {"a": "docs/science/SCI-*.md", "b": "*.txt"}
+        assert index.watch_dirs() == ["docs/science", "."]
+
+
+class TestRefreshCli:
+    """Tests for dash refresh options."""
+
+    def test_watch_requires_in_process(self):
+        result = CliRunner().invoke(dash, ["refresh", "--watch", "--subprocess"])
+        assert result.exit_code != 0
+        assert "--watch" in result.output
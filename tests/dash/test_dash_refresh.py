@@ -41,15 +41,24 @@ class TestDashRefresh:
         assert "items" in data
         assert isinstance(data["items"], list)
 
+    def test_refresh_runs_in_process_by_default(self):
+        """Refresh should not spawn an interpreter unless --subprocess is given."""
+        with patch("codemonkeys.commands.dash.subprocess.run") as mock_run:
+            runner = CliRunner()
+            result = runner.invoke(dash, ['refresh'])
+
+            assert result.exit_code == 0
+            mock_run.assert_not_called()
+
     def test_refresh_uses_active_python(self):
-        """Refresh should use sys.executable."""
+        """Refresh --subprocess should use sys.executable."""
         import sys
 
         with patch("codemonkeys.commands.dash.subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(returncode=0, stdout="OK", stderr="")
 
             runner = CliRunner()
-            runner.invoke(dash, ['refresh'])
+            runner.invoke(dash, ['refresh', '--subprocess'])
 
             # Should have called with sys.executable
             call_args = mock_run.call_args[0][0]
@@ -65,7 +74,7 @@ class TestDashRefresh:
             )
 
             runner = CliRunner()
-            result = runner.invoke(dash, ['refresh'])
+            result = runner.invoke(dash, ['refresh', '--subprocess'])
 
             assert result.exit_code == 1
 
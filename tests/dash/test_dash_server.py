@@ -0,0 +1,162 @@
+"""Tests for the async Dash server and its aggregated API."""
+import asyncio
+import gzip
+import http.client
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from codemonkeys.core.dash_server import DashServer
+
+
+def write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A minimal repo tree with two products, Nexus files and a science index."""
+    write_json(tmp_path / "dash/products.json", {
+        "schema_version": "0.1",
+        "products": [
+            {"product_id": "alpha", "display_name": "Alpha"},
+            {"product_id": "beta", "display_name": "Beta"},
+        ],
+    })
+    write_json(tmp_path / "dash/runs/alpha/last_run.json", {"run_id": "run_a", "status": "success"})
+    (tmp_path / "dash/runs/alpha/history.jsonl").write_text(
+        "".join(json.dumps({"run_id": f"run_{i}", "status": "success"}) + "\n" for i in range(8))
+    )
+    write_json(tmp_path / "nexus/inbox/req_1.json", {"request_id": "req_1"})
+    write_json(tmp_path / "nexus/outbox/dec_1.json", {"decision_id": "dec_1"})
+    write_json(tmp_path / "dash/science_index.json", {"items": [{"dossier_id": "SCI-1"}]})
+    (tmp_path / "dash/index.html").write_text("<html>dash</html>")
+    return tmp_path
+
+
+@pytest.fixture
+def server(repo):
+    """Run a DashServer on an ephemeral port; yields (port, DashServer)."""
+    loop = asyncio.new_event_loop()
+    dash_server = DashServer(repo)
+    aio_server = loop.run_until_complete(dash_server.start("127.0.0.1", 0))
+    port = aio_server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield port, dash_server
+
+    async def shutdown():
+        aio_server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def get(port: int, path: str, headers: dict | None = None) -> tuple[int, dict, bytes]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+class TestApiEndpoints:
+    """Tests for the aggregated endpoints."""
+
+    def test_fleet_embeds_runs_and_history(self, server):
+        port, _ = server
+        status, _, body = get(port, "/api/fleet")
+        fleet = json.loads(body)
+
+        assert status == 200
+        alpha, beta = fleet["products"]
+        assert alpha["last_run"]["run_id"] == "run_a"
+        assert [h["run_id"] for h in alpha["history"]] == [f"run_{i}" for i in range(3, 8)]
+        assert beta["last_run"] is None
+        assert beta["history"] == []
+
+    def test_nexus_lists_all_files(self, server):
+        port, _ = server
+        nexus = json.loads(get(port, "/api/nexus")[2])
+        assert nexus == {"requests": [{"request_id": "req_1"}], "decisions": [{"decision_id": "dec_1"}]}
+
+    def test_science_index(self, server):
+        port, _ = server
+        assert json.loads(get(port, "/api/science")[2]) == {"items": [{"dossier_id": "SCI-1"}]}
+
+
+class TestCaching:
+    """Tests for ETags, gzip and invalidation."""
+
+    def test_etag_not_modified(self, server):
+        port, _ = server
+        _, headers, _ = get(port, "/api/fleet")
+        status, _, body = get(port, "/api/fleet", {"If-None-Match": headers["ETag"]})
+        assert status == 304
+        assert body == b""
+
+    def test_gzip_when_accepted(self, server, repo):
+        port, _ = server
+        write_json(repo / "dash/science_index.json", {"items": [{"dossier_id": f"SCI-{i}"} for i in range(200)]})
+        _, headers, body = get(port, "/api/science", {"Accept-Encoding": "gzip"})
+        assert headers["Content-Encoding"] == "gzip"
+        assert len(json.loads(gzip.decompress(body))["items"]) == 200
+
+    def test_rebuilds_only_on_change(self, server, repo, monkeypatch):
+        port, _ = server
+        calls = []
+        from codemonkeys.core import dash_server
+        real_build = dash_server.build_nexus
+        monkeypatch.setitem(
+            dash_server.API_ROUTES, "/api/nexus",
+            (dash_server.nexus_inputs, lambda root: calls.append(1) or real_build(root)),
+        )
+
+        _, first, _ = get(port, "/api/nexus")
+        get(port, "/api/nexus")
+        assert len(calls) == 1
+
+        write_json(repo / "nexus/inbox/req_2.json", {"request_id": "req_2"})
+        _, second, body = get(port, "/api/nexus")
+        assert len(calls) == 2
+        assert second["ETag"] != first["ETag"]
+        assert len(json.loads(body)["requests"]) == 2
+
+    def test_modified_run_invalidates_fleet(self, server, repo):
+        port, _ = server
+        get(port, "/api/fleet")
+        path = repo / "dash/runs/beta/last_run.json"
+        write_json(path, {"run_id": "run_b", "status": "failed"})
+        fleet = json.loads(get(port, "/api/fleet")[2])
+        assert fleet["products"][1]["last_run"]["run_id"] == "run_b"
+
+
+class TestStaticFiles:
+    """Tests for static file serving."""
+
+    def test_serves_files(self, server):
+        port, _ = server
+        status, headers, body = get(port, "/dash/index.html")
+        assert status == 200
+        assert headers["Content-Type"].startswith("text/html")
+        assert body == b"<html>dash</html>"
+
+    def test_rejects_paths_outside_root(self, server):
+        port, _ = server
+        assert get(port, "/../../etc/passwd")[0] == 404
+        assert get(port, "/%2e%2e/%2e%2e/etc/passwd")[0] == 404
+
+    def test_missing_file(self, server):
+        port, _ = server
+        assert get(port, "/nope.json")[0] == 404
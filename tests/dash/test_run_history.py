@@ -0,0 +1,110 @@
+"""Tests for the append-only run history index."""
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_planner import calculate_priority, last_success_time
+
+from codemonkeys.commands.fleet import fleet
+from codemonkeys.core.history import append_run, history_path, read_history, tail
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _report(i, status="success"):
+    return {
+        "run_id": f"run_{i:03d}",
+        "started_at": (T0 + timedelta(hours=i)).isoformat(),
+        "ended_at": (T0 + timedelta(hours=i, minutes=5)).isoformat(),
+        "status": status,
+        "banana_economy": {"spent_minutes": 5.0, "spent_tokens": 0, "budget_minutes": 90, "budget_tokens": 50000},
+        "tests": {"total": 3, "passed": 3, "failed": 0, "errors": 0, "skipped": 0,
+                  "duration_seconds": 1.0, "cases": [{"nodeid": "x", "outcome": "passed", "duration": 1.0}]},
+    }
+
+
+@pytest.fixture
+def product_dir(tmp_path):
+    path = tmp_path / "runs" / "demo"
+    for i in range(50):
+        append_run(path, _report(i, "failed" if i % 5 == 0 else "success"))
+    return path
+
+
+class TestRunHistory:
+    """Tests for appending and querying history records."""
+
+    def test_records_are_compact(self, product_dir):
+        record = json.loads(history_path(product_dir).read_text().splitlines()[0])
+
+        assert record["run_id"] == "run_000"
+        assert record["spent_minutes"] == 5.0
+        assert record["tests"]["passed"] == 3
+        assert "cases" not in record["tests"]
+
+    def test_time_window_query(self, product_dir):
+        records = read_history(
+            history_path(product_dir),
+            since=T0 + timedelta(hours=10),
+            until=(T0 + timedelta(hours=12, minutes=5)).isoformat(),
+        )
+
+        assert [r["run_id"] for r in records] == ["run_010", "run_011", "run_012"]
+
+    def test_tail_returns_latest_in_order(self, product_dir):
+        assert [r["run_id"] for r in tail(history_path(product_dir), 3)] == [
+            "run_047", "run_048", "run_049"
+        ]
+        assert tail(product_dir / "missing.jsonl", 3) == []
+
+    def test_torn_line_is_skipped(self, product_dir):
+        path = history_path(product_dir)
+        with open(path, "a") as f:
+            f.write('{"run_id": "run_torn"')
+
+        records = read_history(path)
+        assert len(records) == 50
+        assert records[-1]["run_id"] == "run_049"
+
+
+class TestHistoryConsumers:
+    """Tests for the planner and CLI reading the history."""
+
+    def test_planner_staleness_uses_last_success(self, product_dir):
+        last_success = last_success_time("demo", product_dir.parent)
+        assert last_success == T0 + timedelta(hours=49, minutes=5)
+
+        fresh, _ = calculate_priority({}, {"status": "failed"}, last_success, now=last_success + timedelta(hours=1))
+        stale, _ = calculate_priority({}, {"status": "failed"}, last_success, now=last_success + timedelta(days=2))
+        assert stale == fresh + 5
+
+    def test_planner_never_successful_is_stale(self):
+        recent = {"status": "failed", "ended_at": datetime.now(timezone.utc).isoformat()}
+        never, _ = calculate_priority({}, recent, None)
+        fresh, _ = calculate_priority({}, recent, datetime.now(timezone.utc))
+        assert never == fresh + 5
+
+        passing, _ = calculate_priority({}, {**recent, "status": "success"}, None)
+        assert passing == 10
+
+    def test_fleet_history_json(self, product_dir):
+        result = CliRunner().invoke(fleet, [
+            "history", "demo",
+            "--runs-dir", str(product_dir.parent),
+            "--since", (T0 + timedelta(hours=40)).isoformat(),
+            "--json",
+        ])
+
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert len(data["runs"]) == 10
+        assert data["trend"]["success_rate"] == 0.8
+
+    def test_fleet_history_rejects_bad_window(self, product_dir):
+        result = CliRunner().invoke(fleet, ["history", "--since", "yesterday"])
+        assert result.exit_code != 0
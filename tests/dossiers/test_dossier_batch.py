@@ -0,0 +1,168 @@
+"""Tests for batch dossier commands (validate, science-to-design --pending)."""
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from codemonkeys.cli import cli
+from codemonkeys.core.dossiers import load_metadata
+
+REPO_SCHEMAS = Path("docs/schemas").resolve()
+
+SCIENCE = """---
+schema_version: "0.1"
+dossier_type: "science"
+dossier_id: "{id}"
+topic: "{topic}"
+owner: "science-monkeys"
+status: "{status}"
+created_at: "2025-12-22"
+hypothesis:
+  statement: "If X then Y"
+acceptance_hooks:
+  code_proofs: ["Proof A"]
+evidence_plan:
+  final_artifacts: ["artifact.json"]
+constitution_refs:
+  - "constitution.md"
+---
+# {topic}
+"""
+
+
+@pytest.fixture
+def runner():
+    return CliRunner()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copytree(REPO_SCHEMAS, tmp_path / "docs/schemas")
+    (tmp_path / "docs/science").mkdir()
+    (tmp_path / "docs/dossiers").mkdir()
+    (tmp_path / "constitution.md").write_text("# Constitution\n")
+    return tmp_path
+
+
+def write_science(dossier_id, topic, status="validated"):
+    path = Path(f"docs/science/{dossier_id}.md")
+    path.write_text(SCIENCE.format(id=dossier_id, topic=topic, status=status))
+    return path
+
+
+class TestBatchValidate:
+    """Tests for codemonkeys dossier validate."""
+
+    def test_requires_paths_or_all(self, runner, workdir):
+        result = runner.invoke(cli, ["dossier", "validate"])
+        assert result.exit_code == 2
+
+    def test_all_reports_every_dossier(self, runner, workdir):
+        write_science("SCI-20251222-one", "Good Topic")
+        Path("docs/dossiers/DOS-bad.md").write_text("---\ndossier_id: DOS-bad\n---\n")
+
+        result = runner.invoke(cli, ["dossier", "validate", "--all", "--json"])
+
+        assert result.exit_code == 1
+        summary = json.loads(result.output)
+        assert (summary["total"], summary["valid"], summary["invalid"]) == (2, 1, 1)
+        by_path = {r["path"]: r for r in summary["results"]}
+        bad = by_path["docs/dossiers/DOS-bad.md"]
+        assert bad["type"] == "design"
+        assert any("required property" in e for e in bad["errors"])
+        assert by_path["docs/science/SCI-20251222-one.md"] == {
+            "path": "docs/science/SCI-20251222-one.md",
+            "type": "science",
+            "valid": True,
+            "errors": [],
+            "warnings": [],
+        }
+
+    def test_reads_paths_from_stdin(self, runner, workdir):
+        write_science("SCI-20251222-one", "One")
+        write_science("SCI-20251222-two", "Two")
+
+        result = runner.invoke(cli, ["dossier", "validate", "-", "--json"], input="docs/science/SCI-20251222-two.md\n\n")
+
+        assert result.exit_code == 0
+        assert [r["path"] for r in json.loads(result.output)["results"]] == ["docs/science/SCI-20251222-two.md"]
+
+    def test_globs_and_parse_errors(self, runner, workdir):
+        write_science("SCI-20251222-one", "One")
+        Path("docs/science/SCI-20251222-two.md").write_text("---\ntopic: [unclosed\n---\n")
+
+        result = runner.invoke(cli, ["dossier", "validate", "docs/science/SCI-*.md"])
+
+        assert result.exit_code == 1
+        assert "PASS docs/science/SCI-20251222-one.md" in result.output
+        assert "FAIL docs/science/SCI-20251222-two.md" in result.output
+        assert "Frontmatter parse error" in result.output
+        assert "Validated 2 dossier(s): 1 valid, 1 invalid" in result.output
+
+    def test_parallel_results_keep_input_order(self, runner, workdir):
+        for i in range(12):
+            write_science(f"SCI-20251222-topic-{i:02d}", f"Topic {i}")
+
+        sequential = runner.invoke(cli, ["dossier", "validate", "docs/science", "--json"])
+        parallel = runner.invoke(cli, ["dossier", "validate", "docs/science", "--json", "-j", "4"])
+
+        assert parallel.exit_code == 0
+        assert json.loads(parallel.output) == json.loads(sequential.output)
+
+
+class TestScienceToDesignPending:
+    """Tests for codemonkeys dossier science-to-design --pending."""
+
+    def test_converts_only_pending_dossiers(self, runner, workdir):
+        write_science("SCI-20251222-one", "Fast Search")
+        write_science("SCI-20251222-two", "Draft Idea", status="draft")
+        write_science("SCI-20251222-three", "Already Done")
+        Path("docs/dossiers/DOS-x.md").write_text("---\nevidence:\n  science_source: SCI-20251222-three\n---\n")
+
+        result = runner.invoke(cli, ["dossier", "science-to-design", "--pending", "--json"])
+
+        assert result.exit_code == 0
+        summary = json.loads(result.output)
+        assert (summary["total"], summary["created"], summary["failed"]) == (1, 1, 0)
+        [entry] = summary["results"]
+        assert entry["product_id"] == "fast-search"
+        meta = load_metadata(entry["design_path"])
+        assert meta["product_id"] == "fast-search"
+        assert meta["evidence"]["science_source"] == "SCI-20251222-one"
+
+        # Converted dossiers are no longer pending
+        again = runner.invoke(cli, ["dossier", "science-to-design", "--pending"])
+        assert again.exit_code == 0
+        assert "Converted 0 of 0" in again.output
+
+    def test_dry_run_writes_nothing(self, runner, workdir):
+        write_science("SCI-20251222-one", "Fast Search")
+
+        result = runner.invoke(cli, ["dossier", "science-to-design", "--pending", "--dry-run"])
+
+        assert result.exit_code == 0
+        assert "Would create docs/dossiers/DOS-" in result.output
+        assert not list(Path("docs/dossiers").iterdir())
+
+    def test_same_slug_is_created_once(self, runner, workdir):
+        write_science("SCI-20251222-one", "Fast Search")
+        write_science("SCI-20251222-two", "fast search")
+
+        result = runner.invoke(cli, ["dossier", "science-to-design", "--pending", "--json", "-j", "2"])
+
+        assert result.exit_code == 1
+        statuses = sorted(r["status"] for r in json.loads(result.output)["results"])
+        assert statuses == ["created", "failed"]
+        assert len(list(Path("docs/dossiers").glob("DOS-*-fast-search.md"))) == 1
+
+    def test_single_conversion_still_requires_product_id(self, runner, workdir):
+        path = write_science("SCI-20251222-one", "Fast Search")
+
+        result = runner.invoke(cli, ["dossier", "science-to-design", str(path)])
+        assert result.exit_code == 2
+
+        result = runner.invoke(cli, ["dossier", "science-to-design", str(path), "--pending"])
+        assert result.exit_code == 2
@@ -0,0 +1,77 @@
+"""Tests for the frontmatter-only dossier metadata loader."""
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import frontmatter
+import pytest
+import yaml
+
+from codemonkeys.core import dossiers
+from codemonkeys.core.dossiers import load_metadata
+
+REPO_DOSSIERS = sorted(
+    [*Path("docs/dossiers").glob("DOS-*.md"), *Path("docs/science").glob("SCI-*.md")]
+)
+
+
+class TestLoadMetadata:
+    """Tests for reading the leading YAML block."""
+
+    @pytest.mark.parametrize("path", REPO_DOSSIERS, ids=lambda p: p.name)
+    def test_matches_frontmatter_load(self, path):
+        assert load_metadata(path) == frontmatter.load(path).metadata
+
+    @pytest.mark.parametrize("text", [
+        "# Just markdown\n",
+        "",
+        "---\ntitle: never closed\n",
+        "---\n- a\n- b\n---\nbody\n",
+    ])
+    def test_no_mapping_frontmatter_is_empty(self, tmp_path, text):
+        path = tmp_path / "doc.md"
+        path.write_text(text)
+        assert load_metadata(path) == frontmatter.load(path).metadata == {}
+
+    def test_stops_at_closing_delimiter(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("\n---\ntitle: ok\n----\n: not yaml [\n---\nmore\n")
+        assert load_metadata(path) == {"title": "ok"}
+
+    def test_malformed_frontmatter_raises(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("---\ntitle: [unclosed\n---\n")
+        with pytest.raises(yaml.YAMLError):
+            load_metadata(path)
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            load_metadata(tmp_path / "missing.md")
+
+
+class TestMemoization:
+    """Tests for the (path, mtime, size) memo."""
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("---\nstatus: draft\n---\n")
+        with patch.object(dossiers, "_read_frontmatter", side_effect=dossiers._read_frontmatter) as mock_read:
+            load_metadata(path)
+            load_metadata(str(path))
+        assert mock_read.call_count == 1
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("---\nstatus: draft\n---\n")
+        assert load_metadata(path)["status"] == "draft"
+
+        path.write_text("---\nstatus: validated\n---\n")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert load_metadata(path)["status"] == "validated"
+
+    def test_returns_independent_copies(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("---\nconstitution_refs:\n  - constitution.md\n---\n")
+        load_metadata(path)["constitution_refs"].append("other.md")
+        assert load_metadata(path)["constitution_refs"] == ["constitution.md"]
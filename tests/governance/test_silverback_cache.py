@@ -0,0 +1,177 @@
+"""Tests for Silverback's content-hash validation cache."""
+import json
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+import silverback_validate
+from silverback_validate import (
+    ValidationResult,
+    ValidationTask,
+    _escalate_to_nexus_silverback,
+    validate_all,
+    validate_cached,
+    validator_digest,
+)
+
+from codemonkeys.core.cache import ContentHashCache, shared_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ContentHashCache(tmp_path / "cache.json")
+
+
+@pytest.fixture
+def target(tmp_path):
+    path = tmp_path / "artifact.json"
+    path.write_text(json.dumps({"schema_version": "0.1"}))
+    return path
+
+
+def _counting_check(calls, dep=None):
+    def check(result):
+        calls.append(1)
+        if dep is not None:
+            result.depends_on(dep, "exists")
+        result.warning("something to replay")
+    return check
+
+
+class TestValidateCached:
+    """Tests for cache hits, misses and replay."""
+
+    def test_unchanged_target_is_replayed(self, cache, target):
+        calls = []
+        first, second = ValidationResult(), ValidationResult()
+
+        validate_cached(target, first, cache, _counting_check(calls))
+        validate_cached(target, second, cache, _counting_check(calls))
+
+        assert len(calls) == 1
+        assert second.warnings == first.warnings == ["something to replay"]
+
+    def test_changed_content_revalidates(self, cache, target):
+        calls = []
+        validate_cached(target, ValidationResult(), cache, _counting_check(calls))
+        target.write_text(json.dumps({"schema_version": "0.2"}))
+        validate_cached(target, ValidationResult(), cache, _counting_check(calls))
+
+        assert len(calls) == 2
+
+    def test_changed_schema_revalidates(self, cache, target, tmp_path):
+        schema = tmp_path / "schema.json"
+        schema.write_text("{}")
+        calls = []
+        validate_cached(target, ValidationResult(), cache, _counting_check(calls), schema)
+        schema.write_text('{"type": "object"}')
+        validate_cached(target, ValidationResult(), cache, _counting_check(calls), schema)
+
+        assert len(calls) == 2
+
+    def test_registry_schema_change_changes_digest(self, tmp_path, monkeypatch):
+        """A schema other schemas $ref is part of every cache key."""
+        monkeypatch.setattr(silverback_validate.schemas, "SCHEMA_DIRS", (tmp_path,))
+        base = tmp_path / "base.schema.json"
+        base.write_text("{}")
+        before = validator_digest()
+        base.write_text('{"type": "object"}')
+
+        assert validator_digest() != before
+
+    def test_dependency_change_revalidates(self, cache, target, tmp_path):
+        evidence = tmp_path / "pytest_output.log"
+        calls = []
+        validate_cached(target, ValidationResult(), cache, _counting_check(calls, evidence))
+        evidence.write_text("log")
+        validate_cached(target, ValidationResult(), cache, _counting_check(calls, evidence))
+
+        assert len(calls) == 2
+
+    def test_escalating_target_is_not_cached(self, cache, target, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "nexus/inbox").mkdir(parents=True)
+        calls = []
+
+        def check(result):
+            calls.append(1)
+            _escalate_to_nexus_silverback(result, target, "Missing constitution_refs")
+
+        validate_cached(target, ValidationResult(), cache, check)
+        validate_cached(target, ValidationResult(), cache, check)
+
+        assert len(calls) == 2
+        # Both escalations written, even within the same second
+        requests = [json.loads(p.read_text()) for p in (tmp_path / "nexus/inbox").iterdir()]
+        assert len({r["request_id"] for r in requests}) == 2
+
+    def test_no_cache_always_runs(self, target):
+        calls = []
+        validate_cached(target, ValidationResult(), None, _counting_check(calls))
+        validate_cached(target, ValidationResult(), None, _counting_check(calls))
+
+        assert len(calls) == 2
+
+
+class TestValidateAll:
+    """Tests for the order of a full validation run."""
+
+    def test_escalation_is_validated_in_the_same_run(self, target, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "nexus/inbox").mkdir(parents=True)
+        (tmp_path / "nexus/outbox").mkdir(parents=True)
+        escalate = ValidationTask(
+            None, None, lambda r: _escalate_to_nexus_silverback(r, target, "Missing constitution_refs")
+        )
+        monkeypatch.setattr(silverback_validate, "artifact_tasks", lambda: [escalate])
+        result = ValidationResult(echo=False)
+
+        validate_all(result)
+
+        (request,) = (tmp_path / "nexus/inbox").iterdir()
+        assert ("ok", f"JSON parsed: {Path('nexus/inbox') / request.name}") in result.messages
+
+
+class TestContentHashCache:
+    """Tests for cache persistence."""
+
+    def test_save_and_reload(self, tmp_path):
+        path = tmp_path / "cache.json"
+        cache = ContentHashCache(path)
+        cache.put("t", "k", [["ok", "fine"]])
+        cache.save()
+
+        assert ContentHashCache(path).get("t", "k") == [["ok", "fine"]]
+        assert ContentHashCache(path).get("t", "other-key") is None
+
+    def test_glob_dependency(self, tmp_path):
+        cache = ContentHashCache(tmp_path / "cache.json")
+        pattern = str(tmp_path / "DOS-*.md")
+        cache.put("t", "k", "value", {pattern: "glob"})
+        assert cache.get("t", "k") == "value"
+
+        (tmp_path / "DOS-new.md").write_text("---\n---\n")
+        assert cache.get("t", "k") is None
+
+    def test_shared_cache_is_reused(self, tmp_path):
+        path = tmp_path / "cache.json"
+        cache = shared_cache(path)
+        cache.put("t", "k", "value")
+        cache.save()
+
+        assert shared_cache(path) is cache
+        assert shared_cache(str(path)).get("t", "k") == "value"
+
+    def test_shared_cache_reloads_after_external_write(self, tmp_path):
+        path = tmp_path / "cache.json"
+        cache = shared_cache(path)
+
+        other = ContentHashCache(path)
+        other.put("t", "k", "from another process")
+        other.save()
+
+        reloaded = shared_cache(path)
+        assert reloaded is not cache
+        assert reloaded.get("t", "k") == "from another process"
@@ -0,0 +1,45 @@
+"""Tests for running Silverback validation on a worker pool."""
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from silverback_validate import ValidationResult, ValidationTask, run_tasks
+
+
+def _tasks(count):
+    def check(result, i):
+        if i % 3 == 0:
+            result.error(f"error {i}")
+        elif i % 3 == 1:
+            result.warning(f"warning {i}")
+        else:
+            result.ok(f"ok {i}")
+
+    return [
+        ValidationTask(f"--- task {i} ---" if i % 4 == 0 else None, None, lambda r, i=i: check(r, i))
+        for i in range(count)
+    ]
+
+
+class TestRunTasks:
+    """Parallel runs must be indistinguishable from sequential ones."""
+
+    def test_parallel_matches_sequential(self, capsys):
+        sequential, parallel = ValidationResult(), ValidationResult()
+
+        run_tasks(_tasks(20), sequential, jobs=1)
+        sequential_out = capsys.readouterr().out
+        run_tasks(_tasks(20), parallel, jobs=8)
+        parallel_out = capsys.readouterr().out
+
+        assert parallel.messages == sequential.messages
+        assert parallel.errors == sequential.errors
+        assert parallel.warnings == sequential.warnings
+        assert parallel_out == sequential_out
+
+    def test_silent_result_does_not_print(self, capsys):
+        result = ValidationResult(echo=False)
+        result.error("quiet")
+
+        assert capsys.readouterr().out == ""
+        assert result.errors == ["quiet"]
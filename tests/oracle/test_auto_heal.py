@@ -19,20 +19,13 @@ class TestAutoHealValidate:
 
         call_count = [0]
 
-        def mock_subprocess_run(*args, **kwargs):
+        def mock_run_command(*args, **kwargs):
             call_count[0] += 1
-            result = MagicMock()
             if call_count[0] == 1:
-                result.returncode = 1
-                result.stdout = "First call fails"
-                result.stderr = ""
-            else:
-                result.returncode = 0
-                result.stdout = "Second call succeeds"
-                result.stderr = ""
-            return result
-
-        with patch("oracle_executor.subprocess.run", side_effect=mock_subprocess_run):
+                return (1, "First call fails")
+            return (0, "Second call succeeds")
+
+        with patch("oracle_executor.run_command", side_effect=mock_run_command):
             # First call fails
             exit_code1, _ = execute_validate(dry_run=False)
             assert exit_code1 == 1
@@ -48,15 +41,11 @@ class TestAutoHealValidate:
 
         call_count = [0]
 
-        def mock_subprocess_run(*args, **kwargs):
+        def mock_run_command(*args, **kwargs):
             call_count[0] += 1
-            result = MagicMock()
-            result.returncode = 1
-            result.stdout = "Always fails"
-            result.stderr = ""
-            return result
+            return (1, "Always fails")
 
-        with patch("oracle_executor.subprocess.run", side_effect=mock_subprocess_run):
+        with patch("oracle_executor.run_command", side_effect=mock_run_command):
             exit_code1, _ = execute_validate(dry_run=False)
             assert exit_code1 == 1
 
@@ -73,8 +62,8 @@ class TestAutoHealTest:
         """Test intent can retry on failure."""
         from oracle_executor import execute_test
 
-        with patch("oracle_executor.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stdout="fail", stderr="")
+        with patch("oracle_executor.run_command") as mock_run:
+            mock_run.return_value = (1, "fail")
             exit_code, _ = execute_test(dry_run=False)
             assert exit_code == 1
 
@@ -0,0 +1,89 @@
+"""Tests for the science -> design dossier reverse index."""
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+import generate_science_index
+from codemonkeys.core import dossiers
+from codemonkeys.core.dossiers import design_links, link_map
+from oracle_planner import find_pending_science_dossiers
+
+
+@pytest.fixture
+def docs(tmp_path):
+    science = tmp_path / "science"
+    designs = tmp_path / "dossiers"
+    science.mkdir()
+    designs.mkdir()
+    for i in range(1, 5):
+        (science / f"SCI-{i}.md").write_text(
+            f"---\ndossier_id: SCI-{i}\ntopic: Topic {i}\nstatus: validated\n---\n"
+        )
+    (designs / "DOS-a.md").write_text("---\nevidence:\n  science_source: SCI-1\n---\n")
+    (designs / "DOS-b.md").write_text("---\nevidence:\n  science_source: SCI-1\n---\n")
+    (designs / "DOS-c.md").write_text("---\nevidence:\n  science_source: SCI-2\n---\n")
+    (designs / "DOS-20250101-topic-3.md").write_text("---\ntitle: legacy conversion\n---\n")
+    (designs / "DOS-d.md").write_text("---\nevidence: not-a-mapping\n---\n")
+    return science, designs
+
+
+class TestDesignLinks:
+    """Tests for building the reverse index."""
+
+    def test_maps_science_ids_to_first_design(self, docs):
+        _, designs = docs
+        assert design_links(designs) == {
+            "SCI-1": str(designs / "DOS-a.md"),
+            "SCI-2": str(designs / "DOS-c.md"),
+        }
+
+    def test_parses_each_design_once(self, docs):
+        _, designs = docs
+        real_read = dossiers._read_frontmatter
+        with patch.object(dossiers, "_read_frontmatter", side_effect=real_read) as mock_load:
+            design_links(designs)
+        assert mock_load.call_count == 5
+
+    def test_link_map_skips_missing_sources(self):
+        assert link_map([("a", None), ("b", "SCI-1")]) == {"SCI-1": "b"}
+
+
+class TestScienceIndexLinks:
+    """Tests for linear science index generation."""
+
+    def test_full_generation_parses_each_dossier_once(self, docs, tmp_path):
+        science, designs = docs
+        real_read = dossiers._read_frontmatter
+        with patch.object(dossiers, "_read_frontmatter", side_effect=real_read) as mock_load:
+            index = generate_science_index.generate_science_index(science, designs, tmp_path / "out.json")
+
+        # 4 science + 5 design dossiers, not 4 x 5
+        assert mock_load.call_count == 9
+        links = {item["dossier_id"]: item["design_dossier_path"] for item in index["items"]}
+        assert links["SCI-1"] == str(designs / "DOS-a.md")
+        assert links["SCI-4"] is None
+
+    def test_find_linked_design_dossier_accepts_links(self, docs):
+        _, designs = docs
+        links = design_links(designs)
+        assert generate_science_index.find_linked_design_dossier("SCI-2", designs, links) == str(designs / "DOS-c.md")
+        assert generate_science_index.find_linked_design_dossier("SCI-9", designs) is None
+
+
+class TestPendingScience:
+    """Tests for planner reuse of the reverse index."""
+
+    def test_pending_excludes_linked_and_legacy_conversions(self, docs):
+        science, designs = docs
+        pending = find_pending_science_dossiers(science, designs)
+        assert [p["dossier_id"] for p in pending] == ["SCI-4"]
+
+    def test_reuses_given_links(self, docs):
+        science, designs = docs
+        with patch("codemonkeys.core.dossiers.design_links") as mock_links:
+            pending = find_pending_science_dossiers(science, designs, links={"SCI-4": "x"})
+        mock_links.assert_not_called()
+        assert {p["dossier_id"] for p in pending} == {"SCI-1", "SCI-2"}
@@ -0,0 +1,148 @@
+"""Tests for per-order max_seconds budgets and the job runner."""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codemonkeys.core.jobs import JobTimeout, TIMEOUT_EXIT_CODE, run_command
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_executor import (
+    execute_science_to_design,
+    execute_validate,
+    execute_work_order,
+    should_stop,
+    run as executor_run,
+)
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def make_order(job_id: str, intent: str, max_seconds: int | None = 1, **extra) -> dict:
+    budget = {"max_actions": 1}
+    if max_seconds is not None:
+        budget["max_seconds"] = max_seconds
+    return {
+        "job_id": job_id,
+        "product_id": "test-product",
+        "intent": intent,
+        "inputs": {},
+        "budget": budget,
+        "stop_conditions": ["on_test_fail", "on_silverback_fail"],
+        "priority": 50,
+        "created_at": "2025-12-22T12:00:00Z",
+        "constitution_refs": ["constitution.md"],
+        "evidence_expectations": [],
+        "status": "pending",
+        **extra,
+    }
+
+
+class TestRunCommand:
+    """Tests for the subprocess job runner."""
+
+    def test_returns_exit_code_and_combined_output(self):
+        code, output = run_command([
+            sys.executable, "-c",
+            "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+        ])
+        assert code == 3
+        assert "out" in output and "err" in output
+
+    @pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+    def test_timeout_kills_process_group_and_keeps_output(self):
+        """The child and its descendants die; output before the deadline survives."""
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            "print('grandchild', child.pid, flush=True)\n"
+            "time.sleep(60)\n"
+        )
+        start = time.monotonic()
+        with pytest.raises(JobTimeout) as exc:
+            run_command([sys.executable, "-c", script], timeout=1, grace=1)
+
+        assert time.monotonic() - start < 10
+        assert exc.value.seconds == 1
+        line = next(l for l in exc.value.output.splitlines() if l.startswith("grandchild"))
+        grandchild = int(line.split()[1])
+        for _ in range(50):
+            if not pid_alive(grandchild):
+                break
+            time.sleep(0.1)
+        assert not pid_alive(grandchild)
+
+
+class TestExecutorTimeouts:
+    """Tests for timed_out work orders."""
+
+    def test_budget_is_passed_to_intent(self):
+        with patch("oracle_executor.execute_validate", return_value=(0, "OK")) as mock_validate:
+            execute_work_order(make_order("wo_1", "validate", max_seconds=42))
+        assert mock_validate.call_args[0][2] == 42
+
+    def test_budgeted_in_process_intents_run_killable(self, tmp_path):
+        """A budget forces a child process group, which the deadline can kill."""
+        science = tmp_path / "SCI.md"
+        science.write_text("---\n---\n")
+        with patch("oracle_executor.run_command", return_value=(0, "OK")) as mock_run, \
+             patch("oracle_executor.call_captured") as mock_call:
+            execute_validate(in_process=True, timeout=30)
+            execute_science_to_design(str(science), "p", in_process=True, timeout=30)
+
+        assert mock_call.call_count == 0
+        assert [c.args[1] for c in mock_run.call_args_list] == [30, 30]
+
+    def test_unbudgeted_intents_stay_in_process(self):
+        with patch("oracle_executor.run_command") as mock_run, \
+             patch("oracle_executor.call_captured", return_value=(0, "OK")) as mock_call:
+            execute_validate(in_process=True)
+
+        assert mock_run.call_count == 0
+        assert mock_call.call_count == 1
+
+    def test_timeout_marks_order_timed_out(self):
+        with patch("oracle_executor.execute_test", side_effect=JobTimeout(1, "collected 12 items")):
+            result = execute_work_order(make_order("wo_1", "test"))
+
+        assert result["status"] == "timed_out"
+        assert result["result"]["exit_code"] == TIMEOUT_EXIT_CODE
+        assert "collected 12 items" in result["result"]["error_message"]
+        assert "Timed out after 1s" in result["result"]["error_message"]
+        assert result["result"]["evidence_produced"] == []
+
+    def test_timeout_does_not_trigger_stop_conditions(self):
+        wo = make_order("wo_1", "test")
+        stop, _ = should_stop(wo, {"status": "timed_out", "result": {"exit_code": TIMEOUT_EXIT_CODE}})
+        assert stop is False
+
+    def test_queue_continues_after_timeout(self, tmp_path):
+        """Orders after a timed-out order still run and the run reports failure."""
+        orders = [
+            make_order("wo_1_test", "test", priority=100),
+            make_order("wo_2_validate", "validate", priority=10),
+        ]
+        orders[0]["retry"] = {"base_delay_seconds": 0}  # Timeouts are retried
+        for wo in orders:
+            (tmp_path / f"{wo['job_id']}.json").write_text(json.dumps(wo))
+
+        with patch("oracle_executor.execute_test", side_effect=JobTimeout(1, "")), \
+             patch("oracle_executor.execute_validate", return_value=(0, "OK")) as mock_validate:
+            exit_code = executor_run(tmp_path, budget=2)
+
+        assert exit_code == 1
+        assert mock_validate.call_count == 1
+        statuses = {
+            p.stem: json.loads(p.read_text())["status"] for p in tmp_path.glob("*.json")
+        }
+        assert statuses == {"wo_1_test": "timed_out", "wo_2_validate": "completed"}
@@ -44,7 +44,7 @@ def temp_dash_dir():
         # Product C: passed -> low priority
         (runs_dir / "product-c").mkdir()
         with open(runs_dir / "product-c" / "last_run.json", "w") as f:
-            json.dump({"status": "passed", "created_at": "2025-12-22T10:00:00Z"}, f)
+            json.dump({"status": "success", "created_at": "2025-12-22T10:00:00Z"}, f)
         
         # Product D: governance failed -> very high priority
         (runs_dir / "product-d").mkdir()
@@ -131,6 +131,6 @@ class TestCalculatePriority:
 
     def test_passed_low_priority(self):
         """Passed status should be low priority."""
-        priority, intent = calculate_priority({}, {"status": "passed"})
+        priority, intent = calculate_priority({}, {"status": "success"})
         assert priority <= 20
         assert intent == "validate"
@@ -207,8 +207,8 @@ class TestRealExecution:
 
     def test_execute_validate_updates_status(self, temp_work_orders_dir):
         """Real execution should update work order status."""
-        with patch("oracle_executor.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="OK", stderr="")
+        with patch("oracle_executor.run_command") as mock_run:
+            mock_run.return_value = (0, "OK")
             
             executor_run(
                 work_orders_dir=temp_work_orders_dir,
@@ -222,3 +222,74 @@ class TestRealExecution:
                 wo = json.load(f)
             
             assert wo["status"] in ["completed", "failed"]
+
+
+class TestParallelExecution:
+    """Tests for the concurrent (--workers) executor mode."""
+
+    def test_group_by_product_preserves_order(self):
+        """Per-product queues should keep the incoming priority order."""
+        from oracle_executor import group_by_product
+
+        work_orders = [
+            {"job_id": "a1", "product_id": "a"},
+            {"job_id": "b1", "product_id": "b"},
+            {"job_id": "a2", "product_id": "a"},
+        ]
+        queues = group_by_product(work_orders)
+
+        assert [[wo["job_id"] for wo in q] for q in queues] == [["a1", "a2"], ["b1"]]
+
+    def test_parallel_executes_all_orders(self, temp_work_orders_dir):
+        """All pending orders across products should run with workers > 1."""
+        with patch("oracle_executor.execute_validate") as mock_validate, \
+                patch("oracle_executor.execute_test") as mock_test:
+            mock_validate.return_value = (0, "OK")
+            mock_test.return_value = (0, "OK")
+
+            exit_code = executor_run(
+                work_orders_dir=temp_work_orders_dir,
+                budget=3,
+                dry_run=False,
+                workers=2
+            )
+
+        assert exit_code == 0
+        for f in temp_work_orders_dir.glob("*.json"):
+            assert json.loads(f.read_text())["status"] == "completed"
+
+    def test_stop_condition_only_halts_own_product(self, temp_work_orders_dir):
+        """A failed test should halt its product's queue but not others."""
+        # Queue a validate for test-product behind the failing test
+        extra = {
+            "job_id": "wo_test_validate_004",
+            "product_id": "test-product",
+            "intent": "validate",
+            "inputs": {},
+            "budget": {"max_actions": 1},
+            "stop_conditions": [],
+            "priority": 20,
+            "status": "pending"
+        }
+        (temp_work_orders_dir / "wo_test_validate_004.json").write_text(json.dumps(extra))
+
+        with patch("oracle_executor.execute_validate") as mock_validate, \
+                patch("oracle_executor.execute_test") as mock_test:
+            mock_validate.return_value = (0, "OK")
+            mock_test.return_value = (1, "1 failed")
+
+            exit_code = executor_run(
+                work_orders_dir=temp_work_orders_dir,
+                budget=4,
+                dry_run=False,
+                workers=2
+            )
+
+        assert exit_code == 1
+
+        def status(job_id):
+            return json.loads((temp_work_orders_dir / f"{job_id}.json").read_text())["status"]
+
+        assert status("wo_test_test_002") == "failed"
+        assert status("wo_test_validate_004") == "pending"
+        assert status("wo_test_validate_003") == "completed"
@@ -106,8 +106,8 @@ def test_always_passes():
 
     def test_subprocess_called_with_correct_args(self):
         """Verify subprocess is called with correct positional arg."""
-        with patch("oracle_executor.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="OK", stderr="")
+        with patch("oracle_executor.run_command") as mock_run:
+            mock_run.return_value = (0, "OK")
             
             with patch("oracle_executor.Path") as mock_path:
                 mock_path.return_value.exists.return_value = True
@@ -170,8 +170,8 @@ class TestWorkOrderStatusUpdate:
             wo = json.load(f)
         wo["_filepath"] = str(temp_work_order)
         
-        with patch("oracle_executor.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="OK", stderr="")
+        with patch("oracle_executor.run_command") as mock_run:
+            mock_run.return_value = (0, "OK")
             
             with patch("oracle_executor.Path") as mock_path:
                 mock_path.return_value.exists.return_value = True
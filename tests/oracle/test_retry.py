@@ -0,0 +1,187 @@
+"""Tests for failure classification and retries in the executor."""
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codemonkeys.core.jobs import TIMEOUT_EXIT_CODE
+from codemonkeys.core.retry import (
+    FAILURE,
+    INFRA_ERROR,
+    TIMEOUT,
+    RetryPolicy,
+    classify_failure,
+    retry_policy,
+)
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_executor import QueueRunner, run as executor_run
+
+
+def make_order(job_id: str, product_id: str = "p", intent: str = "test", **extra) -> dict:
+    return {
+        "job_id": job_id,
+        "product_id": product_id,
+        "intent": intent,
+        "inputs": {},
+        "budget": {"max_actions": 1},
+        "stop_conditions": ["on_test_fail"],
+        "priority": 50,
+        "created_at": "2025-12-22T12:00:00Z",
+        "constitution_refs": ["constitution.md"],
+        "evidence_expectations": [],
+        "status": "pending",
+        "retry": {"base_delay_seconds": 0},
+        **extra,
+    }
+
+
+def write_orders(directory: Path, *orders: dict):
+    for wo in orders:
+        (directory / f"{wo['job_id']}.json").write_text(json.dumps(wo))
+
+
+class TestClassifyFailure:
+    """Tests for telling timeouts, infra errors and genuine failures apart."""
+
+    @pytest.mark.parametrize("intent, exit_code, output, timed_out, expected", [
+        ("test", 0, "", False, None),
+        ("test", TIMEOUT_EXIT_CODE, "", True, TIMEOUT),
+        ("test", 1, "+++++++++ Timeout +++++++++", False, TIMEOUT),
+        ("test", 2, "Interrupted: 1 error during collection", False, INFRA_ERROR),
+        ("test", 3, "INTERNALERROR>", False, INFRA_ERROR),
+        ("validate", 1, "sqlite3.OperationalError: database is locked", False, INFRA_ERROR),
+        ("drift_check", 128, "fatal: Unable to create '/repo/.git/index.lock': File exists.", False, INFRA_ERROR),
+        ("test", 1, "1 failed, 20 passed", False, FAILURE),
+        ("validate", 2, "Silverback: 3 dossiers invalid", False, FAILURE),
+    ])
+    def test_classify(self, intent, exit_code, output, timed_out, expected):
+        assert classify_failure(intent, exit_code, output, timed_out) == expected
+
+
+class TestRetryPolicy:
+    """Tests for per-intent policies and backoff."""
+
+    def test_per_intent_policies(self):
+        assert retry_policy({"intent": "test"}).max_attempts == 3
+        assert retry_policy({"intent": "science_to_design"}).max_attempts == 1
+        assert retry_policy({"intent": "unknown"}) == RetryPolicy()
+
+    def test_order_overrides(self):
+        policy = retry_policy({"intent": "test", "retry": {"max_attempts": 5, "retry_on": ["timeout"], "bogus": 1}})
+        assert policy.max_attempts == 5
+        assert policy.retry_on == ("timeout",)
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=2)
+        assert policy.should_retry(INFRA_ERROR, 1)
+        assert not policy.should_retry(INFRA_ERROR, 2)
+        assert not policy.should_retry(FAILURE, 1)
+        assert not policy.should_retry(None, 1)
+
+    def test_exponential_backoff_with_jitter(self):
+        policy = RetryPolicy(base_delay_seconds=2, max_delay_seconds=10)
+        rng = random.Random(0)
+        for attempts, ceiling in [(1, 2), (2, 4), (3, 8), (4, 10), (8, 10)]:
+            delays = {policy.delay(attempts, rng) for _ in range(20)}
+            assert all(ceiling / 2 <= d <= ceiling for d in delays)
+            assert len(delays) > 1
+
+
+class TestRetries:
+    """Tests for retrying orders through the executor's worker pool."""
+
+    def test_flaky_order_is_retried(self, tmp_path):
+        write_orders(tmp_path, make_order("wo_flaky"))
+        outcomes = iter([(2, "Interrupted"), (0, "passed")])
+
+        with patch("oracle_executor.execute_test", side_effect=lambda *a: next(outcomes)):
+            assert executor_run(tmp_path, budget=1) == 0
+
+        wo = json.loads((tmp_path / "wo_flaky.json").read_text())
+        assert wo["status"] == "completed"
+        attempts = wo["result"]["attempts"]
+        assert [(a["attempt"], a["failure_class"]) for a in attempts] == [(1, INFRA_ERROR), (2, None)]
+        assert attempts[0]["retry_after_seconds"] == 0
+        assert "failure_class" not in wo["result"]
+
+    def test_genuine_failure_is_not_retried(self, tmp_path):
+        write_orders(tmp_path, make_order("wo_red"))
+
+        with patch("oracle_executor.execute_test", return_value=(1, "1 failed")) as mock_test:
+            assert executor_run(tmp_path, budget=1) == 1
+
+        assert mock_test.call_count == 1
+        result = json.loads((tmp_path / "wo_red.json").read_text())["result"]
+        assert result["failure_class"] == FAILURE
+        assert len(result["attempts"]) == 1
+
+    def test_exhausted_infra_error_does_not_stop_queue(self, tmp_path):
+        write_orders(
+            tmp_path,
+            make_order("wo_broken", priority=90),
+            make_order("wo_next", intent="validate", priority=10),
+        )
+        with patch("oracle_executor.execute_test", return_value=(3, "INTERNALERROR>")) as mock_test, \
+             patch("oracle_executor.execute_validate", return_value=(0, "OK")):
+            assert executor_run(tmp_path, budget=2) == 1
+
+        assert mock_test.call_count == 3
+        broken = json.loads((tmp_path / "wo_broken.json").read_text())
+        assert broken["status"] == "failed"
+        assert broken["result"]["failure_class"] == INFRA_ERROR
+        assert json.loads((tmp_path / "wo_next.json").read_text())["status"] == "completed"
+
+    def test_waiting_retry_frees_the_worker(self):
+        flaky = make_order("wo_a", product_id="a", retry={"base_delay_seconds": 0.4})
+        other = make_order("wo_b", product_id="b")
+        calls = []
+
+        def execute_test(dry_run, product_id, *args):
+            calls.append(product_id)
+            return (2, "Interrupted") if calls == ["a"] else (0, "passed")
+
+        start = time.monotonic()
+        with patch("oracle_executor.execute_test", side_effect=execute_test):
+            runner = QueueRunner([[flaky], [other]], workers=1, dry_run=False)
+            results = runner.run()
+
+        # b ran while a waited out its backoff on the only worker
+        assert calls == ["a", "b", "a"]
+        assert [r["status"] for r in results] == ["completed", "completed"]
+        assert [wo["job_id"] for wo, _ in runner.finished] == ["wo_b", "wo_a"]
+        assert time.monotonic() - start < 2
+
+    def test_retry_keeps_its_place_in_the_queue(self):
+        flaky = make_order("wo_a", priority=90, retry={"base_delay_seconds": 0.1})
+        slow = make_order("wo_b", priority=50)
+        low = make_order("wo_c", priority=10)
+        calls = []
+
+        def execute_work_order(wo, *args):
+            calls.append(wo["job_id"])
+            if wo is slow:
+                time.sleep(0.3)  # wo_a's backoff elapses meanwhile
+            exit_code = 2 if calls == ["wo_a"] else 0
+            return {"status": "completed" if exit_code == 0 else "failed", "result": {
+                "exit_code": exit_code, "completed_at": "", "duration_seconds": 0.0,
+                "evidence_produced": [], "error_message": "" if exit_code == 0 else "Interrupted",
+            }}
+
+        with patch("oracle_executor.execute_work_order", side_effect=execute_work_order):
+            QueueRunner([[flaky, slow, low]], dry_run=False).run()
+
+        assert calls == ["wo_a", "wo_b", "wo_a", "wo_c"]
+
+    def test_dry_run_never_retries(self):
+        wo = make_order("wo_dry")
+        with patch("oracle_executor.execute_work_order", return_value={"status": "failed", "result": {
+            "exit_code": 2, "completed_at": "", "duration_seconds": 0.0,
+            "evidence_produced": [], "error_message": "Interrupted",
+        }}) as mock_execute:
+            QueueRunner([[wo]], dry_run=True).run()
+        assert mock_execute.call_count == 1
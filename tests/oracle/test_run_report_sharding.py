@@ -0,0 +1,116 @@
+"""Tests for sharded test execution in generate_run_report."""
+import json
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+from codemonkeys.core.jobs import TIMEOUT_EXIT_CODE
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+import generate_run_report
+from generate_run_report import (
+    collect_test_files,
+    historical_durations,
+    merge_results,
+    partition_by_duration,
+    run_sharded,
+)
+
+
+class TestPartitioning:
+    """Tests for splitting test files by historical duration."""
+
+    def test_balances_by_duration(self):
+        durations = {"a.py": 10.0, "b.py": 6.0, "c.py": 4.0, "d.py": 1.0}
+        shards = partition_by_duration(list(durations), durations, 2)
+
+        loads = sorted(sum(durations[f] for f in shard) for shard in shards)
+        assert loads == [10.0, 11.0]
+        assert sorted(f for shard in shards for f in shard) == sorted(durations)
+
+    def test_unknown_files_use_average_and_no_empty_shards(self):
+        shards = partition_by_duration(["x.py", "y.py"], {}, 4)
+
+        assert len(shards) == 2
+        assert all(shards)
+
+    def test_historical_durations_sum_per_file(self, tmp_path):
+        report = tmp_path / "last_run.json"
+        report.write_text(json.dumps({"tests": {"cases": [
+            {"nodeid": "tests/test_a.py::test_1", "outcome": "passed", "duration": 1.5},
+            {"nodeid": "tests/test_a.py::TestX::test_2", "outcome": "passed", "duration": 0.5},
+            {"nodeid": "tests/test_b.py::test_3", "outcome": "failed", "duration": 2.0},
+        ]}}))
+
+        assert historical_durations(report) == {"tests/test_a.py": 2.0, "tests/test_b.py": 2.0}
+        assert historical_durations(tmp_path / "missing.json") == {}
+
+    def test_collect_test_files(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        for name in ("test_a.py", "sub/test_b.py", "b_test.py", "helper.py"):
+            (tmp_path / name).write_text("")
+
+        files = collect_test_files(str(tmp_path))
+
+        assert [Path(f).name for f in files] == ["b_test.py", "test_b.py", "test_a.py"]
+
+
+class TestRunSharded:
+    """Tests for concurrent shard execution and aggregation."""
+
+    def test_merge_results(self):
+        a = {"total": 2, "passed": 2, "failed": 0, "errors": 0, "skipped": 0,
+             "duration_seconds": 1.0, "cases": [{"nodeid": "a"}, {"nodeid": "b"}]}
+        b = {"total": 1, "passed": 0, "failed": 1, "errors": 0, "skipped": 0,
+             "duration_seconds": 0.5, "cases": [{"nodeid": "c"}]}
+
+        merged = merge_results([a, None, b])
+
+        assert (merged["total"], merged["passed"], merged["failed"]) == (3, 2, 1)
+        assert merged["duration_seconds"] == 1.5
+        assert [c["nodeid"] for c in merged["cases"]] == ["a", "b", "c"]
+        assert merge_results([None]) is None
+
+    def test_shard_logs_merged_and_worst_exit_code(self, tmp_path):
+        real_popen = subprocess.Popen
+
+        def popen(cmd, **kwargs):
+            # Shard containing bad.py fails; each shard echoes its files
+            files = [arg for arg in cmd if arg.endswith(".py")]
+            code = 1 if "bad.py" in files else 0
+            script = f"print('ran', {files!r}); raise SystemExit({code})"
+            return real_popen([sys.executable, "-c", script], **kwargs)
+
+        log = tmp_path / "pytest_output.log"
+        with patch.object(generate_run_report.subprocess, "Popen", side_effect=popen):
+            code, summary, results, junit_paths = run_sharded(
+                [["good.py"], ["bad.py"]], tmp_path, log, ci_mode=True
+            )
+
+        assert code == 1
+        assert results is None
+        assert junit_paths == []
+        content = log.read_text()
+        assert content.index("shard 0") < content.index("good.py") < content.index("shard 1")
+        assert "bad.py" in content
+        assert not list(tmp_path.glob("pytest_output.shard*.log"))
+
+    def test_timed_out_shard_is_flagged_by_exit_code(self, tmp_path):
+        outcomes = {
+            "slow.py": (TIMEOUT_EXIT_CODE, "Test run timed out (300s)", None),
+            # A failing test whose name happens to mention a timeout
+            "net.py": (1, "test_reconnect_after_timed_out_peer failed", None),
+        }
+
+        def run_pytest(files, log_path, **kwargs):
+            log_path.write_text("")
+            return outcomes[files[0]]
+
+        log = tmp_path / "pytest_output.log"
+        with patch.object(generate_run_report, "run_pytest", side_effect=run_pytest):
+            code, summary, _, _ = run_sharded([["net.py"]], tmp_path, log, ci_mode=True)
+            assert (code, summary) == (1, "test_reconnect_after_timed_out_peer failed")
+
+            code, summary, _, _ = run_sharded([["net.py"], ["slow.py"]], tmp_path, log, ci_mode=True)
+            assert (code, summary) == (TIMEOUT_EXIT_CODE, "Test run timed out (300s)")
@@ -0,0 +1,122 @@
+"""Tests for streaming pytest capture and JUnit parsing in generate_run_report."""
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from codemonkeys.core.jobs import TIMEOUT_EXIT_CODE
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+import generate_run_report
+from generate_run_report import parse_junit_xml, run_pytest
+
+JUNIT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" errors="1" failures="1" skipped="1" tests="5" time="1.5">
+<testcase classname="tests.dash.test_a.TestA" name="test_ok" file="tests/dash/test_a.py" line="3" time="0.25"/>
+<testcase classname="tests.dash.test_a.TestA" name="test_bad" file="tests/dash/test_a.py" line="5" time="0.5"><failure message="assert 0">boom</failure></testcase>
+<testcase classname="tests.dash.test_a" name="test_skip" file="tests/dash/test_a.py" line="8" time="0.0"><skipped message="skip"/></testcase>
+<testcase classname="tests.dash.test_a" name="test_err[x]" file="tests/dash/test_a.py" line="9" time="0.1"><error message="fixture">err</error></testcase>
+<testcase classname="tests.dash.test_a" name="test_plain" file="tests/dash/test_a.py" line="12" time="0.05"/>
+</testsuite></testsuites>
+"""
+
+
+def _fake_pytest(script):
+    """Patch Popen so run_pytest runs `python -c script` instead of pytest."""
+    real_popen = subprocess.Popen
+
+    def popen(cmd, **kwargs):
+        return real_popen([sys.executable, "-c", script], **kwargs)
+
+    return patch.object(generate_run_report.subprocess, "Popen", side_effect=popen)
+
+
+class TestParseJunitXml:
+    """Tests for structured results from the JUnit report."""
+
+    def test_counts_and_cases(self, tmp_path):
+        junit = tmp_path / "junit.xml"
+        junit.write_text(JUNIT_XML)
+
+        results = parse_junit_xml(junit)
+
+        assert (results["total"], results["passed"], results["failed"]) == (5, 2, 1)
+        assert (results["errors"], results["skipped"]) == (1, 1)
+        assert results["duration_seconds"] == 1.5
+        assert results["cases"][0] == {
+            "nodeid": "tests/dash/test_a.py::TestA::test_ok",
+            "outcome": "passed",
+            "duration": 0.25,
+        }
+        assert results["cases"][3]["nodeid"] == "tests/dash/test_a.py::test_err[x]"
+
+    def test_missing_or_corrupt_report(self, tmp_path):
+        junit = tmp_path / "junit.xml"
+        assert parse_junit_xml(junit) is None
+        junit.write_text("<testsuites><testsuite")
+        assert parse_junit_xml(junit) is None
+
+
+class TestRunPytestStreaming:
+    """Tests for tee'ing output to the log and summarizing from JUnit."""
+
+    def test_output_streamed_to_log_and_summary_exact(self, tmp_path):
+        log = tmp_path / "run" / "pytest_output.log"
+        junit = tmp_path / "run" / "junit.xml"
+        script = (
+            "import sys, pathlib\n"
+            f"pathlib.Path({str(junit)!r}).write_text({JUNIT_XML!r})\n"
+            "print('collected 5 items')\n"
+            "print('oops', file=sys.stderr)\n"
+            "sys.exit(1)\n"
+        )
+        with _fake_pytest(script):
+            code, summary, results = run_pytest("tests/", log, ci_mode=True, junit_path=junit)
+
+        assert code == 1
+        assert summary == "2 passed, 1 failed, 1 error, 1 skipped in 1.5s"
+        assert results["total"] == 5
+        content = log.read_text()
+        assert "collected 5 items" in content
+        assert "oops" in content
+
+    def test_falls_back_to_output_scan_without_junit(self, tmp_path):
+        log = tmp_path / "pytest_output.log"
+        script = "print('ERROR collecting tests/x.py'); raise SystemExit(2)"
+        with _fake_pytest(script):
+            code, summary, results = run_pytest("tests/", log, ci_mode=True)
+
+        assert code == 2
+        assert summary == "ERROR collecting tests/x.py"
+        assert results is None
+
+    def test_timeout_keeps_partial_output(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(generate_run_report, "PYTEST_TIMEOUT_SECONDS", 0.5)
+        log = tmp_path / "pytest_output.log"
+        script = "import time; print('started', flush=True); time.sleep(30)"
+        with _fake_pytest(script):
+            code, summary, _ = run_pytest("tests/", log, ci_mode=True)
+
+        assert code == TIMEOUT_EXIT_CODE
+        assert "timed out" in summary
+        content = log.read_text()
+        assert "started" in content
+        assert "[TIMEOUT after 0.5s]" in content
+
+    def test_timeout_kills_grandchildren(self, tmp_path, monkeypatch):
+        """A worker still holding the output pipe must not outlive the timeout."""
+        monkeypatch.setattr(generate_run_report, "PYTEST_TIMEOUT_SECONDS", 0.5)
+        log = tmp_path / "pytest_output.log"
+        script = (
+            "import subprocess, sys, time\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+            "print('started', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        start = time.monotonic()
+        with _fake_pytest(script):
+            code, _, _ = run_pytest("tests/", log, ci_mode=True)
+
+        assert code == TIMEOUT_EXIT_CODE
+        assert time.monotonic() - start < 10
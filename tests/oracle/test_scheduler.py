@@ -0,0 +1,133 @@
+"""Tests for the cadence-aware fleet scheduler."""
+import json
+import os
+
+import pytest
+
+from codemonkeys.core.scheduler import FAILURE_RETRY_SECONDS, Scheduler, run_loop
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+def _write_schedule(directory, product_id, cadence, intents, enabled=True):
+    schedule = {
+        "schema_version": "0.1",
+        "product_id": product_id,
+        "cadence": cadence,
+        "jobs": [{"intent": i, "budget": {"max_actions": 1}, "priority": 50} for i in intents],
+        "enabled": enabled,
+    }
+    path = directory / f"{product_id}.json"
+    path.write_text(json.dumps(schedule))
+    return path
+
+
+@pytest.fixture
+def schedules(tmp_path):
+    directory = tmp_path / "schedules"
+    directory.mkdir()
+    _write_schedule(directory, "alpha", "daily", ["validate", "test"])
+    _write_schedule(directory, "beta", "hourly", ["validate"])
+    _write_schedule(directory, "gamma", "manual", ["validate"])
+    _write_schedule(directory, "delta", "daily", ["validate"], enabled=False)
+    return directory
+
+
+@pytest.fixture
+def scheduler(schedules, tmp_path):
+    sched = Scheduler(schedules, tmp_path / "state.json")
+    sched.reload()
+    return sched
+
+
+class TestScheduler:
+    """Tests for due-time bookkeeping."""
+
+    def test_only_enabled_timed_cadences_are_scheduled(self, scheduler):
+        assert sorted(scheduler.jobs) == ["alpha:test", "alpha:validate", "beta:validate"]
+
+    def test_never_run_jobs_are_due_immediately(self, scheduler):
+        assert sorted(scheduler.pop_due(1000.0)) == ["alpha:test", "alpha:validate", "beta:validate"]
+        assert scheduler.pop_due(1000.0) == []
+
+    def test_completion_schedules_next_by_cadence(self, scheduler):
+        scheduler.pop_due(0.0)
+        scheduler.complete("alpha:validate", 100.0)
+        scheduler.complete("beta:validate", 100.0)
+
+        assert scheduler.next_due() == 100.0 + HOUR
+        assert scheduler.pop_due(100.0 + HOUR) == ["beta:validate"]
+        assert scheduler.pop_due(100.0 + DAY) == ["alpha:validate"]
+
+    def test_completion_state_survives_restart(self, scheduler, schedules, tmp_path):
+        scheduler.pop_due(0.0)
+        scheduler.complete("beta:validate", 500.0)
+
+        restarted = Scheduler(schedules, tmp_path / "state.json")
+        restarted.reload()
+
+        assert restarted.next_due() == 0.0  # alpha jobs never completed
+        assert "beta:validate" not in restarted.pop_due(500.0 + HOUR - 1)
+        assert restarted.next_due() == 500.0 + HOUR
+
+    def test_schedule_changes_are_picked_up(self, scheduler, schedules):
+        assert scheduler.reload() is False
+
+        path = _write_schedule(schedules, "beta", "hourly", ["validate"], enabled=False)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert scheduler.reload() is True
+        assert "beta:validate" not in scheduler.jobs
+
+
+class TestRunLoop:
+    """Tests for the dispatch loop."""
+
+    def test_once_dispatches_due_jobs_and_records_status(self, scheduler):
+        dispatched = []
+
+        def dispatch(keys):
+            dispatched.extend(keys)
+            return {key: "failed" for key in keys if key == "alpha:test"}
+
+        run_loop(scheduler, dispatch, once=True, clock=lambda: 1000.0)
+
+        assert sorted(dispatched) == ["alpha:test", "alpha:validate", "beta:validate"]
+        assert scheduler.state["alpha:test"]["status"] == "failed"
+        assert scheduler.state["beta:validate"]["status"] == "completed"
+        # The failed daily job is retried early; beta's hourly cadence is sooner still
+        assert scheduler.next_due() == 1000.0 + min(HOUR, FAILURE_RETRY_SECONDS)
+        assert scheduler._due["alpha:test"] == 1000.0 + FAILURE_RETRY_SECONDS
+        assert scheduler._due["alpha:validate"] == 1000.0 + DAY
+
+    def test_dispatch_error_reschedules_keys(self, scheduler):
+        errors = []
+
+        def dispatch(keys):
+            raise OSError("disk full")
+
+        run_loop(scheduler, dispatch, once=True, clock=lambda: 1000.0,
+                 on_error=lambda keys, e: errors.append((sorted(keys), str(e))))
+
+        assert errors == [(["alpha:test", "alpha:validate", "beta:validate"], "disk full")]
+        assert scheduler.state["alpha:validate"]["status"] == "error"
+        assert scheduler.pop_due(1000.0 + FAILURE_RETRY_SECONDS) == \
+            ["alpha:test", "alpha:validate", "beta:validate"]
+
+    def test_failed_status_survives_restart(self, scheduler, schedules, tmp_path):
+        scheduler.pop_due(0.0)
+        scheduler.complete("alpha:test", 500.0, "failed")
+
+        restarted = Scheduler(schedules, tmp_path / "state.json")
+        restarted.reload()
+
+        assert restarted._due["alpha:test"] == 500.0 + FAILURE_RETRY_SECONDS
+
+    def test_nothing_due_dispatches_nothing(self, scheduler):
+        run_loop(scheduler, lambda keys: {}, once=True, clock=lambda: 0.0)
+        calls = []
+        run_loop(scheduler, lambda keys: calls.append(keys) or {}, once=True, clock=lambda: 10.0)
+
+        assert calls == []
@@ -0,0 +1,162 @@
+"""Tests for sharing results of product-independent work orders."""
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_executor import (
+    SharedResults,
+    execute_work_order,
+    shared_key,
+    run as executor_run,
+)
+
+
+def make_order(job_id: str, product_id: str, intent: str = "validate", **inputs) -> dict:
+    return {
+        "job_id": job_id,
+        "product_id": product_id,
+        "intent": intent,
+        "inputs": inputs,
+        "budget": {"max_actions": 1},
+        "stop_conditions": [],
+        "priority": 50,
+        "created_at": "2025-12-22T12:00:00Z",
+        "constitution_refs": ["constitution.md"],
+        "evidence_expectations": [f"evidence/{product_id}.log"],
+        "status": "pending",
+    }
+
+
+@pytest.fixture
+def work_orders_dir():
+    """Three validate orders for different products."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wo_dir = Path(tmpdir)
+        for i, product in enumerate(["alpha", "beta", "gamma"]):
+            wo = make_order(f"wo_validate_{i}", product)
+            (wo_dir / f"{wo['job_id']}.json").write_text(json.dumps(wo))
+        yield wo_dir
+
+
+class TestSharedKey:
+    """Tests for which orders may share results."""
+
+    def test_validate_is_shared(self):
+        assert shared_key(make_order("a", "p")) == ("validate",)
+
+    def test_full_test_is_shared(self):
+        assert shared_key(make_order("a", "p", intent="test")) == ("test",)
+
+    def test_impacted_test_is_not_shared(self):
+        """Impacted selection depends on the product's last green run."""
+        wo = make_order("a", "p", intent="test", test_selection="impacted")
+        assert shared_key(wo) is None
+
+    def test_product_specific_intents_are_not_shared(self):
+        assert shared_key(make_order("a", "p", intent="gc_runs")) is None
+        assert shared_key(make_order("a", "p", intent="regenerate_report")) is None
+
+
+class TestSharedResults:
+    """Tests for the per-run result memo."""
+
+    def test_same_tree_runs_once(self):
+        """A second order on the same tree reuses the first result."""
+        shared = SharedResults()
+        calls = []
+        with patch("oracle_executor.repo_tree_hash", return_value="t1"):
+            first = shared.get_or_run(("validate",), "a", lambda: calls.append(1) or (0, "OK"))
+            second = shared.get_or_run(("validate",), "b", lambda: calls.append(1) or (0, "OK"))
+
+        assert calls == [1]
+        assert first == ((0, "OK"), "a", "t1")
+        assert second == ((0, "OK"), "a", "t1")
+
+    def test_changed_tree_reruns(self):
+        """A different tree hash invalidates the memo."""
+        shared = SharedResults()
+        calls = []
+        with patch("oracle_executor.repo_tree_hash", side_effect=["t1", "t2"]):
+            shared.get_or_run(("validate",), "a", lambda: calls.append(1) or (0, "OK"))
+            _, source, tree = shared.get_or_run(("validate",), "b", lambda: calls.append(1) or (0, "OK"))
+
+        assert len(calls) == 2
+        assert (source, tree) == ("b", "t2")
+
+    def test_no_sharing_outside_git(self):
+        """Without a tree hash every order runs itself."""
+        shared = SharedResults()
+        calls = []
+        with patch("oracle_executor.repo_tree_hash", return_value=None):
+            for job_id in ("a", "b"):
+                shared.get_or_run(("validate",), job_id, lambda: calls.append(1) or (0, "OK"))
+        assert len(calls) == 2
+
+    def test_concurrent_callers_wait_for_leader(self):
+        """Concurrent orders for the same key run the intent once."""
+        shared = SharedResults()
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return (0, "OK")
+
+        results = []
+        with patch("oracle_executor.repo_tree_hash", return_value="t1"):
+            threads = [
+                threading.Thread(target=lambda j=j: results.append(shared.get_or_run(("validate",), j, slow)))
+                for j in ("a", "b", "c")
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert calls == [1]
+        assert {r[0] for r in results} == {(0, "OK")}
+
+
+class TestExecutorSharing:
+    """Tests for shared results through the executor."""
+
+    def test_orders_record_shared_from(self):
+        """Reusing orders keep their own result record and name the source."""
+        shared = SharedResults()
+        with patch("oracle_executor.repo_tree_hash", return_value="abc123"), \
+             patch("oracle_executor.execute_validate", return_value=(0, "OK")) as mock_validate:
+            first = execute_work_order(make_order("a", "alpha"), shared=shared)
+            second = execute_work_order(make_order("b", "beta"), shared=shared)
+
+        assert mock_validate.call_count == 1
+        assert "shared_from" not in first["result"]
+        assert second["result"]["shared_from"] == {"job_id": "a", "tree_hash": "abc123"}
+        assert second["result"]["evidence_produced"] == ["evidence/beta.log"]
+
+    def test_dry_run_does_not_share(self):
+        shared = SharedResults()
+        with patch("oracle_executor.repo_tree_hash", return_value="abc123"):
+            result = execute_work_order(make_order("b", "beta"), dry_run=True, shared=shared)
+        assert "shared_from" not in result["result"]
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_run_validates_once(self, work_orders_dir, workers):
+        """A batch of validate orders runs silverback once per tree."""
+        with patch("oracle_executor.repo_tree_hash", return_value="abc123"), \
+             patch("oracle_executor.execute_validate", return_value=(0, "OK")) as mock_validate:
+            exit_code = executor_run(work_orders_dir, budget=3, workers=workers)
+
+        assert exit_code == 0
+        assert mock_validate.call_count == 1
+        orders = [json.loads(p.read_text()) for p in work_orders_dir.glob("*.json")]
+        assert all(wo["status"] == "completed" for wo in orders)
+        assert sum("shared_from" in wo["result"] for wo in orders) == 2
@@ -0,0 +1,186 @@
+"""Tests for change-aware test selection (codemonkeys.core.impact)."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codemonkeys.core.impact import (
+    ImportGraph,
+    affected_tests,
+    plan_selection,
+    record_outcome,
+)
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_executor import SharedResults, execute_test, execute_work_order
+from oracle_planner import generate_work_order, schedule_work_order
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A tiny repo: two modules, a schema and three test files."""
+    files = {
+        "src/pkg/__init__.py": "",
+        "src/pkg/core.py": "from pkg import util\n",
+        "src/pkg/util.py": "X = 1\n",
+        "scripts/tool.py": "import json\n",
+        "data/schema.json": "{}",
+        "tests/a/test_core.py": "from pkg.core import util\n",
+        "tests/a/test_tool.py": "import tool\n",
+        "tests/b/test_schema.py": "SCHEMA = 'data/schema.json'\n",
+    }
+    for rel, content in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "-c", "user.email=t@t", "-c", "user.name=t", "add", ".")
+    _git(tmp_path, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "init")
+    return tmp_path
+
+
+TESTS = ["tests/a/test_core.py", "tests/a/test_tool.py", "tests/b/test_schema.py"]
+
+
+class TestAffectedTests:
+    """Tests for mapping changed files to tests."""
+
+    def test_transitive_import(self, repo):
+        graph = ImportGraph(repo)
+        assert affected_tests(TESTS, ["src/pkg/util.py"], graph) == ["tests/a/test_core.py"]
+
+    def test_script_import_and_path_literal(self, repo):
+        graph = ImportGraph(repo)
+        assert affected_tests(TESTS, ["scripts/tool.py"], graph) == ["tests/a/test_tool.py"]
+        assert affected_tests(TESTS, ["data/schema.json"], graph) == ["tests/b/test_schema.py"]
+
+    def test_unrelated_change_selects_nothing(self, repo):
+        assert affected_tests(TESTS, ["README.md"], ImportGraph(repo)) == []
+
+    def test_config_change_forces_full_run(self, repo):
+        assert affected_tests(TESTS, ["tests/conftest.py"], ImportGraph(repo)) is None
+
+    def test_deleted_module_forces_full_run(self, repo):
+        (repo / "src/pkg/util.py").unlink()
+        assert affected_tests(TESTS, ["src/pkg/util.py"], ImportGraph(repo)) is None
+
+    def test_renamed_module_forces_full_run(self, repo):
+        (repo / "src/pkg/util.py").rename(repo / "src/pkg/helpers.py")
+        changed = ["src/pkg/helpers.py", "src/pkg/util.py"]
+        assert affected_tests(TESTS, changed, ImportGraph(repo)) is None
+
+
+class TestPlanSelection:
+    """Tests for the green-commit bookkeeping and full-run fallbacks."""
+
+    def _green_run(self, repo):
+        impact = {"mode": "full", "base_commit": None, "runs_since_full": 0, "reason": "x"}
+        return {"test_impact": record_outcome(impact, None, 0, repo)}
+
+    def test_no_history_runs_everything(self, repo):
+        selected, info = plan_selection(TESTS, None, root=repo)
+        assert selected is None
+        assert info["mode"] == "full"
+
+    def test_diff_since_green_commit(self, repo):
+        last_run = self._green_run(repo)
+        (repo / "src/pkg/util.py").write_text("X = 2\n")
+        (repo / "tests/b/test_new.py").write_text("")
+
+        selected, info = plan_selection(TESTS + ["tests/b/test_new.py"], last_run, root=repo)
+
+        assert selected == ["tests/a/test_core.py", "tests/b/test_new.py"]
+        assert info["mode"] == "impacted"
+        assert info["runs_since_full"] == 1
+        assert info["selected"] == 2
+
+    def test_periodic_full_run(self, repo):
+        last_run = self._green_run(repo)
+        last_run["test_impact"]["runs_since_full"] = 2
+
+        selected, info = plan_selection(TESTS, last_run, full_every=3, root=repo)
+
+        assert selected is None
+        assert "periodic" in info["reason"]
+
+    def test_failed_run_keeps_previous_green_commit(self, repo):
+        last_run = self._green_run(repo)
+        green = last_run["test_impact"]["green_commit"]
+        (repo / "src/pkg/util.py").write_text("X = 3\n")
+        _git(repo, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qam", "change")
+
+        outcome = record_outcome({"mode": "impacted"}, last_run, 1, repo)
+
+        assert outcome["green_commit"] == green
+        assert outcome["commit"] != green
+        assert json.dumps(outcome)
+
+
+class TestExecutorOutcome:
+    """Tests for test orders recording their outcome in last_run.json."""
+
+    @pytest.fixture
+    def product(self, repo, monkeypatch):
+        monkeypatch.chdir(repo)
+        path = repo / "dash/runs/p/last_run.json"
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps({"product_id": "p", "status": "passed"}))
+        return path
+
+    def _test_impact(self, path):
+        return json.loads(path.read_text())["test_impact"]
+
+    def test_runs_advance_green_commit_and_run_count(self, product):
+        with patch("oracle_executor.run_command", return_value=(0, "passed")) as run:
+            execute_test(product_id="p")
+            green = self._test_impact(product)["green_commit"]
+            assert green
+
+            (product.parents[3] / "src/pkg/util.py").write_text("X = 2\n")
+            execute_test(product_id="p", test_selection="impacted")
+
+        assert run.call_args[0][0][3:5] == ["tests/a/test_core.py", "-q"]
+        info = self._test_impact(product)
+        assert info["mode"] == "impacted"
+        assert info["runs_since_full"] == 1
+        assert json.loads(product.read_text())["status"] == "passed"
+
+    def test_failed_run_keeps_green_commit(self, product):
+        with patch("oracle_executor.run_command", return_value=(1, "1 failed")):
+            execute_test(product_id="p")
+
+        info = self._test_impact(product)
+        assert info["green_commit"] is None
+        assert info["commit"]
+
+    def test_shared_full_run_is_recorded_for_every_product(self, product):
+        other = product.parents[1] / "q/last_run.json"
+        other.parent.mkdir()
+        other.write_text(json.dumps({"product_id": "q", "status": "passed"}))
+        shared = SharedResults()
+
+        with patch("oracle_executor.run_command", return_value=(0, "passed")) as run, \
+                patch("oracle_executor.repo_tree_hash", return_value="t1"):
+            for job_id, product_id in [("wo_1", "p"), ("wo_2", "q")]:
+                wo = {"job_id": job_id, "product_id": product_id, "intent": "test", "inputs": {}}
+                execute_work_order(wo, shared=shared)
+
+        assert run.call_count == 1
+        assert self._test_impact(product)["green_commit"]
+        assert self._test_impact(other) == self._test_impact(product)
+
+    def test_planner_emits_full_runs(self):
+        wo = generate_work_order("p", "test", 50, 1, deterministic=True)
+        assert wo["inputs"].get("test_selection", "full") == "full"
+
+    def test_schedule_opts_into_impacted_runs(self):
+        job = {"intent": "test", "priority": 80, "inputs": {"test_selection": "impacted"}}
+        wo = schedule_work_order("p", job, 1, deterministic=True)
+        assert wo["inputs"] == {"test_selection": "impacted", "product_id": "p"}
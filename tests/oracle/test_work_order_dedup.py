@@ -0,0 +1,106 @@
+"""Tests for work-order deduplication and coalescing in the planner."""
+import json
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_planner import COALESCE_MAX_BUMP, coalesce_work_orders, generate_work_order, main as planner_main
+
+
+def _wo(product_id, intent, priority=50, rank=1):
+    return generate_work_order(product_id, intent, priority, rank, deterministic=True)
+
+
+class TestCoalesceWorkOrders:
+    """Tests for folding duplicate orders together."""
+
+    def test_repo_wide_intent_runs_once_per_sweep(self):
+        orders = [_wo("a", "validate", 50, 1), _wo("b", "validate", 60, 2), _wo("a", "test", 80, 3)]
+
+        created, updated = coalesce_work_orders(orders)
+
+        assert [wo["intent"] for wo in created] == ["validate", "test"]
+        validate = created[0]
+        assert validate["scope"] == "repo"
+        assert validate["products"] == ["a", "b"]
+        assert validate["priority"] == 61
+        assert validate["coalesced_count"] == 1
+        assert updated == []
+
+    def test_product_intents_stay_separate_per_product(self):
+        created, _ = coalesce_work_orders([_wo("a", "test"), _wo("b", "test")])
+        assert len(created) == 2
+
+    def test_duplicate_of_pending_bumps_instead_of_creating(self):
+        pending = [("wo/a_test.json", _wo("a", "test", 80))]
+
+        created, updated = coalesce_work_orders([_wo("a", "test", 70, 2)], pending)
+
+        assert created == []
+        assert updated[0][0] == "wo/a_test.json"
+        assert updated[0][1]["priority"] == 81
+
+    def test_repeated_sweeps_cap_the_bump(self):
+        pending = [("wo/v.json", _wo("a", "validate", 50))]
+
+        for rank in range(2, 20):
+            _, updated = coalesce_work_orders([_wo("a", "validate", 50, rank)], pending)
+            pending = updated
+
+        assert pending[0][1]["priority"] == 50 + COALESCE_MAX_BUMP
+        assert pending[0][1]["priority"] < 80
+
+    def test_pending_duplicates_are_marked_coalesced(self):
+        keep = _wo("a", "test", 80, 1)
+        dup = _wo("a", "test", 40, 2)
+        pending = [("wo/dup.json", dup), ("wo/keep.json", keep)]
+
+        created, updated = coalesce_work_orders([], pending)
+
+        changed = dict(updated)
+        assert created == []
+        assert changed["wo/dup.json"]["status"] == "coalesced"
+        assert changed["wo/dup.json"]["coalesced_into"] == keep["job_id"]
+        assert changed["wo/keep.json"]["status"] == "pending"
+
+    def test_different_inputs_are_not_duplicates(self):
+        first = _wo("a", "gc_runs")
+        second = _wo("a", "gc_runs", rank=2)
+        second["inputs"] = {"keep_count": 3}
+
+        created, _ = coalesce_work_orders([first, second])
+        assert len(created) == 2
+
+
+class TestPlannerMainDedup:
+    """Re-planning must not grow the queue with identical orders."""
+
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        products = {"products": [{"product_id": p} for p in ("a", "b", "c")]}
+        (tmp_path / "products.json").write_text(json.dumps(products))
+        runs = tmp_path / "runs"
+        for p in ("a", "b", "c"):
+            (runs / p).mkdir(parents=True)
+            (runs / p / "last_run.json").write_text(json.dumps({"status": "success"}))
+        return tmp_path
+
+    def test_replanning_bumps_existing_orders(self, workspace):
+        out = workspace / "work_orders"
+        argv = [
+            "--budget", "3", "--no-state",
+            "--products", str(workspace / "products.json"),
+            "--runs-dir", str(workspace / "runs"),
+            "--output-dir", str(out),
+        ]
+
+        assert planner_main(argv) == 0
+        first = [json.loads(p.read_text()) for p in out.glob("*.json")]
+        assert planner_main(argv) == 0
+        second = [json.loads(p.read_text()) for p in out.glob("*.json")]
+
+        assert len(first) == len(second) == 1
+        assert first[0]["products"] == ["a", "b", "c"]
+        assert second[0]["priority"] > first[0]["priority"]
@@ -0,0 +1,300 @@
+"""Tests for the indexed work order queue."""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from codemonkeys.commands.oracle import status as status_cmd
+from codemonkeys.core import work_orders
+from codemonkeys.core.work_orders import LeaseLost, WorkOrderQueue
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_executor import load_work_orders, run as executor_run, update_work_order
+
+
+def write_order(directory, job_id, priority=50, status="pending"):
+    path = directory / f"{job_id}.json"
+    path.write_text(json.dumps({"job_id": job_id, "priority": priority, "status": status}))
+    return path
+
+
+def settle(directory):
+    """Create the index directory and backdate the queue so a scan of it is not racy."""
+    (directory / work_orders.INDEX_DIR).mkdir(exist_ok=True)
+    old = time.time_ns() - 10 * work_orders.RACY_NS
+    os.utime(directory, ns=(old, old))
+
+
+@pytest.fixture
+def orders_dir(tmp_path):
+    directory = tmp_path / "work_orders"
+    directory.mkdir()
+    for i in range(20):
+        write_order(directory, f"wo_done_{i:02d}", status="completed")
+    write_order(directory, "wo_low", priority=10)
+    write_order(directory, "wo_high", priority=90)
+    write_order(directory, "wo_mid", priority=50)
+    write_order(directory, "wo_failed", status="failed")
+    (directory / "_meta.json").write_text("{}")
+    settle(directory)
+    return directory
+
+
+class TestQueueIndex:
+    """Tests for counts and the pending heap."""
+
+    def test_counts(self, orders_dir):
+        assert WorkOrderQueue(orders_dir).counts() == {"completed": 20, "pending": 3, "failed": 1}
+
+    def test_missing_status_counts_as_pending(self, tmp_path):
+        (tmp_path / "wo_a.json").write_text(json.dumps({"job_id": "wo_a"}))
+        assert WorkOrderQueue(tmp_path).counts() == {"pending": 1}
+
+    def test_pending_by_priority(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        assert [wo["job_id"] for _, wo in queue.pending()] == ["wo_high", "wo_mid", "wo_low"]
+        assert [wo["job_id"] for _, wo in queue.pending(limit=2)] == ["wo_high", "wo_mid"]
+
+    def test_missing_directory(self, tmp_path):
+        queue = WorkOrderQueue(tmp_path / "missing")
+        assert queue.counts() == {}
+        assert queue.pending() == []
+
+    def test_index_is_reused(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        queue.counts()
+        with patch.object(work_orders, "_read", wraps=work_orders._read) as read:
+            assert queue.counts()["completed"] == 20
+            assert read.call_count == 1  # The index only
+            read.reset_mock()
+            queue.pending(limit=1)
+            assert read.call_count == 2  # The index and the one order
+        assert queue.rebuilds == 1
+
+    def test_added_file_triggers_rescan(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        queue.counts()
+        write_order(orders_dir, "wo_new", priority=99)
+
+        assert queue.pending(limit=1)[0][1]["job_id"] == "wo_new"
+        assert queue.rebuilds == 2
+
+    def test_racy_scan_is_redone(self, tmp_path):
+        queue = WorkOrderQueue(tmp_path)
+        write_order(tmp_path, "wo_a")
+        queue.counts()
+        queue.counts()
+        assert queue.rebuilds == 2
+
+    def test_order_changed_in_place_is_skipped(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        queue.counts()
+        path = orders_dir / "wo_high.json"
+        path.write_text(json.dumps({"job_id": "wo_high", "priority": 90, "status": "completed"}))
+
+        assert [wo["job_id"] for _, wo in queue.pending(limit=1)] == ["wo_mid"]
+        assert queue.counts()["pending"] == 2
+        assert queue.rebuilds == 1
+
+    def test_rebuild(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        queue.counts()
+        assert queue.rebuild()["pending"] == 3
+        assert queue.rebuilds == 2
+
+
+class TestQueueWrites:
+    """Tests for writing orders through the queue."""
+
+    def test_write_updates_index(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        path, wo = queue.pending(limit=1)[0]
+        queue.write(path, {**wo, "status": "completed"})
+
+        assert queue.counts() == {"completed": 21, "pending": 2, "failed": 1}
+        assert [wo["job_id"] for _, wo in queue.pending()] == ["wo_mid", "wo_low"]
+        assert queue.rebuilds == 1
+        assert json.loads(Path(path).read_text())["status"] == "completed"
+        assert not [p for p in orders_dir.iterdir() if p.name.endswith(".tmp")]
+
+    def test_write_new_order(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        queue.counts()
+        queue.write(orders_dir / "wo_new.json", {"job_id": "wo_new", "priority": 70, "status": "pending"})
+
+        assert [wo["job_id"] for _, wo in queue.pending(limit=2)] == ["wo_high", "wo_new"]
+        assert queue.counts()["pending"] == 4
+        assert queue.rebuilds == 1
+
+    def test_executor_updates_index(self, orders_dir):
+        [wo] = load_work_orders(orders_dir, budget=1)
+        update_work_order(wo, {"status": "failed"})
+
+        assert WorkOrderQueue(orders_dir).counts()["failed"] == 2
+        assert load_work_orders(orders_dir, budget=1)[0]["job_id"] == "wo_mid"
+
+
+def expire(wo):
+    """Backdate a claim's heartbeat past its lease."""
+    old = time.time() - 2 * wo["lease"]["lease_seconds"]
+    os.utime(wo["_filepath"], (old, old))
+
+
+class TestClaims:
+    """Tests for leasing orders to executors."""
+
+    def test_claim_moves_orders(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        claimed = queue.claim(2, owner="host:1")
+
+        assert [wo["job_id"] for wo in claimed] == ["wo_high", "wo_mid"]
+        for wo in claimed:
+            assert Path(wo["_filepath"]).parent == orders_dir / "claimed"
+            assert wo["status"] == "running"
+            assert wo["lease"]["owner"] == "host:1"
+            assert json.loads(Path(wo["_filepath"]).read_text())["lease"] == wo["lease"]
+        assert not (orders_dir / "wo_high.json").exists()
+        assert queue.counts()["running"] == 2
+        assert [wo["job_id"] for _, wo in queue.pending()] == ["wo_low"]
+
+    def test_claims_do_not_overlap(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        first = queue.claim(2)
+        second = queue.claim(2)
+        assert [wo["job_id"] for wo in first + second] == ["wo_high", "wo_mid", "wo_low"]
+
+    def test_concurrent_processes(self, tmp_path):
+        for i in range(30):
+            write_order(tmp_path, f"wo_{i:02d}", priority=i)
+        code = (
+            "import sys\n"
+            "from codemonkeys.core.work_orders import WorkOrderQueue\n"
+            "for wo in WorkOrderQueue(sys.argv[1]).claim(10):\n"
+            "    print(wo['job_id'])"
+        )
+        procs = [
+            subprocess.Popen([sys.executable, "-c", code, str(tmp_path)], stdout=subprocess.PIPE, text=True)
+            for _ in range(4)
+        ]
+        claimed = [line for proc in procs for line in proc.communicate()[0].split()]
+
+        assert sorted(claimed) == [f"wo_{i:02d}" for i in range(30)]
+        assert WorkOrderQueue(tmp_path).rebuild() == {"running": 30}
+
+    def test_complete_returns_order(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        [wo] = queue.claim(1)
+        path = queue.complete(wo["_filepath"], {**wo, "status": "completed"})
+
+        assert path == str(orders_dir / "wo_high.json")
+        saved = json.loads(Path(path).read_text())
+        assert saved["status"] == "completed"
+        assert "lease" not in saved and "_filepath" not in saved
+        assert queue.counts() == {"completed": 21, "pending": 2, "failed": 1}
+
+    def test_expired_claim_is_requeued(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        [wo] = queue.claim(1)
+        expire(wo)
+
+        [again] = queue.claim(1)
+        assert again["job_id"] == "wo_high"
+        assert again["lease_expiries"] == 1
+        assert again["lease"]["token"] != wo["lease"]["token"]
+        with pytest.raises(LeaseLost):
+            queue.complete(wo["_filepath"], {**wo, "status": "completed"})
+        assert not queue.heartbeat(wo["_filepath"], wo["lease"]["token"])
+
+    def test_heartbeat_keeps_claim(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        [wo] = queue.claim(1)
+        expire(wo)
+        assert queue.heartbeat(wo["_filepath"], wo["lease"]["token"])
+
+        assert queue.requeue_expired() == []
+        assert queue.counts()["running"] == 1
+
+    def test_repeatedly_orphaned_order_fails(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        for _ in range(work_orders.MAX_LEASE_EXPIRIES):
+            [wo] = queue.claim(1)
+            assert wo["job_id"] == "wo_high"
+            expire(wo)
+            queue.requeue_expired()
+
+        failed = json.loads((orders_dir / "wo_high.json").read_text())
+        assert failed["status"] == "failed"
+        assert "Lease expired 3 times" in failed["result"]["error_message"]
+
+    def test_hold_heartbeats_and_releases(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        orders = queue.claim(2, lease_seconds=0.3)
+        with queue.hold(orders, interval=0.05):
+            time.sleep(0.5)
+            assert queue.requeue_expired() == []
+            update_work_order(orders[0], {"status": "completed", "result": {"exit_code": 0}})
+
+        assert json.loads((orders_dir / "wo_high.json").read_text())["status"] == "completed"
+        released = json.loads((orders_dir / "wo_mid.json").read_text())
+        assert released["status"] == "pending" and "lease" not in released
+        assert not [*(orders_dir / "claimed").iterdir()]
+
+    def test_heartbeat_survives_orders_changing_under_it(self, orders_dir):
+        queue = WorkOrderQueue(orders_dir)
+        orders = queue.claim(2, lease_seconds=0.3)
+        with queue.hold(orders, interval=0.05):
+            # What update_work_order does to the dict once an order is done
+            del orders[0]["_filepath"]
+            orders[0].pop("lease")
+            time.sleep(0.5)
+            assert queue.requeue_expired() == []
+
+    def test_executor_releases_orders_after_stop(self, orders_dir):
+        def fail(wo, *args):
+            return {"status": "failed", "result": {
+                "exit_code": 1, "completed_at": "2026-01-01T00:00:00Z", "duration_seconds": 0.1,
+                "evidence_produced": [], "error_message": "1 failed",
+            }}
+
+        with patch("oracle_executor.execute_work_order", side_effect=fail), \
+                patch("oracle_executor.should_stop", return_value=(True, "stop")):
+            assert executor_run(orders_dir, budget=3) == 1
+
+        counts = WorkOrderQueue(orders_dir).counts()
+        assert counts == {"completed": 20, "pending": 2, "failed": 2}
+
+
+class TestOracleStatus:
+    """Tests for codemonkeys oracle status."""
+
+    @pytest.fixture
+    def repo(self, orders_dir, tmp_path, monkeypatch):
+        (tmp_path / "nexus").mkdir()
+        orders_dir.rename(tmp_path / "nexus/work_orders")
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    @pytest.mark.parametrize("args", [[], ["--rebuild"], ["--no-state"]])
+    def test_counts(self, repo, args):
+        result = CliRunner().invoke(status_cmd, args)
+        assert result.exit_code == 0
+        assert "Pending:   3" in result.output
+        assert "Running:   0" in result.output
+        assert "Completed: 20" in result.output
+        assert "Failed:    1" in result.output
+        assert "Total:     24" in result.output
+
+    @pytest.mark.parametrize("args", [[], ["--no-state"]])
+    def test_other_statuses_are_listed_and_totalled(self, repo, args):
+        (repo / "nexus/work_orders/wo_extra.json").write_text(
+            json.dumps({"job_id": "wo_extra", "status": "coalesced"})
+        )
+        result = CliRunner().invoke(status_cmd, args)
+        assert "Coalesced: 1" in result.output
+        assert "Total:     25" in result.output
@@ -0,0 +1,88 @@
+"""Tests for the shared compiled-schema registry."""
+import json
+from pathlib import Path
+
+import pytest
+from jsonschema import ValidationError
+
+from codemonkeys.core import schemas
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "thing.schema.json"
+    path.write_text(json.dumps({
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "required": ["name"],
+        "properties": {"name": {"type": "string"}},
+    }))
+    return path
+
+
+class TestSchemaLookup:
+    """Tests for resolving schema ids to files."""
+
+    @pytest.mark.parametrize("schema_id", [
+        "last_run", "products", "schedule", "request", "decision",
+        "work_order", "design_dossier", "science_dossier", "run_report_v1",
+    ])
+    def test_known_ids_resolve(self, schema_id):
+        assert schemas.schema_path(schema_id).exists()
+
+    def test_unknown_id_raises(self):
+        with pytest.raises(FileNotFoundError):
+            schemas.schema_path("no_such_schema")
+
+    def test_all_repo_schemas_compile(self):
+        for directory in schemas.SCHEMA_DIRS:
+            for path in directory.glob("*.schema.json"):
+                assert schemas.get_validator(path) is not None
+
+
+class TestValidatorCache:
+    """Tests for compile-once behaviour."""
+
+    def test_validator_is_reused(self, schema_file):
+        assert schemas.get_validator(schema_file) is schemas.get_validator(schema_file)
+
+    def test_validator_rebuilt_when_schema_changes(self, schema_file):
+        first = schemas.get_validator(schema_file)
+        schema = json.loads(schema_file.read_text())
+        schema["required"] = ["name", "id"]
+        schema_file.write_text(json.dumps(schema, indent=2))
+
+        assert schemas.get_validator(schema_file) is not first
+        with pytest.raises(ValidationError):
+            schemas.validate({"name": "x"}, schema_file)
+
+    def test_validator_rebuilt_when_referenced_schema_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(schemas, "SCHEMA_DIRS", (tmp_path,))
+        base = tmp_path / "base.schema.json"
+        base.write_text(json.dumps({"type": "object"}))
+        (tmp_path / "main.schema.json").write_text(json.dumps({
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "properties": {"item": {"$ref": "base.schema.json"}},
+        }))
+        schemas.validate({"item": {}}, "main")
+
+        base.write_text(json.dumps({"type": "object", "required": ["name"]}))
+
+        with pytest.raises(ValidationError):
+            schemas.validate({"item": {}}, "main")
+
+
+class TestValidate:
+    """Tests for validating documents."""
+
+    def test_validate_passes(self, schema_file):
+        schemas.validate({"name": "ok"}, schema_file)
+
+    def test_validate_raises_best_match(self, schema_file):
+        with pytest.raises(ValidationError) as exc:
+            schemas.validate({"name": 3}, schema_file)
+        assert "is not of type 'string'" in exc.value.message
+
+    def test_nexus_inbox_validates_by_id(self):
+        for path in Path("nexus/inbox").glob("*.json"):
+            schemas.validate(json.loads(path.read_text()), "request")
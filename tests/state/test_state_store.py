@@ -0,0 +1,163 @@
+"""Tests for the SQLite fleet state index."""
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codemonkeys.core.state import StateStore
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from oracle_planner import plan
+
+
+@pytest.fixture
+def store(tmp_path):
+    with StateStore(tmp_path / "state.db") as s:
+        yield s
+
+
+def write_request(directory, request_id, priority, status):
+    path = directory / f"{request_id}.json"
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps({
+        "request_id": request_id,
+        "product_id": "p",
+        "priority": priority,
+        "status": status,
+    }))
+    os.replace(tmp_path, path)
+    return path
+
+
+SETTLED_NS = 1_700_000_000 * 10**9
+
+
+def settle(directory):
+    """Backdate a directory (always to the same time) so syncing it is not racy."""
+    os.utime(directory, ns=(SETTLED_NS, SETTLED_NS))
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    directory = tmp_path / "inbox"
+    directory.mkdir()
+    for request_id, priority, status in [
+        ("req_a", 10, "pending"),
+        ("req_b", 90, "pending"),
+        ("req_c", 50, "resolved"),
+    ]:
+        write_request(directory, request_id, priority, status)
+    return directory
+
+
+class TestSync:
+    """Tests for incremental sync."""
+
+    def test_sync_indexes_all_files(self, store, inbox):
+        assert store.sync("requests", inbox) == 3
+        assert store.status_counts("requests") == {"pending": 2, "resolved": 1}
+
+    def test_unchanged_files_are_not_reparsed(self, store, inbox):
+        store.sync("requests", inbox)
+        assert store.sync("requests", inbox) == 0
+
+    def test_unchanged_directory_is_not_listed(self, store, inbox):
+        settle(inbox)
+        store.sync("requests", inbox)
+
+        with patch.object(Path, "glob", wraps=Path.glob, autospec=True) as glob:
+            assert store.sync("requests", inbox) == 0
+        assert glob.call_count == 0
+        assert store.status_counts("requests") == {"pending": 2, "resolved": 1}
+
+    def test_changed_file_is_reindexed(self, store, inbox):
+        settle(inbox)
+        store.sync("requests", inbox)
+        write_request(inbox, "req_a", 10, "resolved")
+
+        assert store.sync("requests", inbox) == 1
+        assert store.get("requests", "req_a")["status"] == "resolved"
+
+    def test_full_sync_finds_in_place_edits(self, store, inbox):
+        settle(inbox)
+        store.sync("requests", inbox)
+        path = inbox / "req_a.json"
+        path.write_text(json.dumps({"request_id": "req_a", "status": "resolved"}))
+        settle(inbox)
+
+        assert store.sync("requests", inbox) == 0
+        assert store.sync("requests", inbox, full=True) == 1
+        assert store.get("requests", "req_a")["status"] == "resolved"
+
+    def test_deleted_file_is_dropped(self, store, inbox):
+        settle(inbox)
+        store.sync("requests", inbox)
+        os.remove(inbox / "req_c.json")
+        store.sync("requests", inbox)
+
+        assert store.get("requests", "req_c") is None
+
+    def test_nested_pattern(self, store, tmp_path):
+        runs = tmp_path / "runs"
+        for product_id in ("a", "b"):
+            (runs / product_id).mkdir(parents=True)
+            (runs / product_id / "last_run.json").write_text(json.dumps({"status": "passed"}))
+            settle(runs / product_id)
+
+        assert store.sync("runs", runs) == 2
+        (runs / "b" / "last_run.json").unlink()
+        store.sync("runs", runs)
+
+        assert store.last_run("a", runs) == {"status": "passed"}
+        assert store.last_run("b", runs) is None
+
+    def test_uses_wal_journal(self, store):
+        mode = store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+
+class TestQueries:
+    """Tests for indexed queries used by the planner and Nexus executor."""
+
+    def test_find_pending_by_priority(self, store, inbox):
+        store.sync("requests", inbox)
+        found = store.find("requests", status="pending")
+        assert [r["request_id"] for _, r in found] == ["req_b", "req_a"]
+
+    def test_directory_filter_excludes_prefixed_siblings(self, store, inbox, tmp_path):
+        archive = tmp_path / "inbox_archive"
+        archive.mkdir()
+        write_request(archive, "req_old", 99, "pending")
+        store.sync("requests", inbox)
+        store.sync("requests", archive)
+
+        found = store.find("requests", status="pending", directory=inbox)
+        assert [r["request_id"] for _, r in found] == ["req_b", "req_a"]
+        assert store.status_counts("requests", inbox) == {"pending": 2, "resolved": 1}
+
+        # Resyncing one directory must not drop the other's documents
+        store.sync("requests", inbox)
+        assert store.get("requests", "req_old", archive)["priority"] == 99
+
+    def test_planner_uses_indexed_last_run(self, store, tmp_path):
+        products = tmp_path / "products.json"
+        products.write_text(json.dumps({"products": [{"product_id": "a"}, {"product_id": "b"}]}))
+        runs = tmp_path / "runs"
+        (runs / "b").mkdir(parents=True)
+        (runs / "b" / "last_run.json").write_text(json.dumps({"product_id": "b", "status": "failed"}))
+
+        with_store = plan(products, runs, budget=2, deterministic=True, store=store)
+        without = plan(products, runs, budget=2, deterministic=True)
+
+        assert [(wo["product_id"], wo["intent"]) for wo in with_store] == \
+            [(wo["product_id"], wo["intent"]) for wo in without]
+
+    def test_export_roundtrip(self, store, inbox, tmp_path):
+        store.sync("requests", inbox)
+        out = tmp_path / "export"
+
+        assert store.export("requests", out) == 3
+        assert json.loads((out / "req_b.json").read_text())["priority"] == 90